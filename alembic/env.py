@@ -5,7 +5,14 @@ from dotenv import load_dotenv
 from sqlalchemy import engine_from_config, pool
 
 from alembic import context
-from src.database.models import BaseModel, Schedules, Users
+from src.database.models import (
+    BaseModel,
+    ReminderOutbox,
+    Schedules,
+    SchedulesArchive,
+    UpcomingTakings,
+    Users,
+)
 
 load_dotenv()
 
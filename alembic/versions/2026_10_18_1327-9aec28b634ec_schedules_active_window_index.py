@@ -0,0 +1,42 @@
+"""schedules active window index
+
+Revision ID: 9aec28b634ec
+Revises: 908b0ee4e4a7
+Create Date: 2026-10-18 13:27:38.035948
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9aec28b634ec"
+down_revision: Union[str, None] = "908b0ee4e4a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_schedules_user_id_start_date_end_date",
+            "schedules",
+            ["user_id", "start_date", "end_date"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_schedules_user_id_start_date_end_date",
+            table_name="schedules",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
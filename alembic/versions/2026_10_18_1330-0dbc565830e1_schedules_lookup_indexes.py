@@ -0,0 +1,78 @@
+"""schedules lookup indexes
+
+Revision ID: 0dbc565830e1
+Revises: 9aec28b634ec
+Create Date: 2026-10-18 13:30:11.796684
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0dbc565830e1"
+down_revision: Union[str, None] = "9aec28b634ec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # UNIQUE(id) duplicated the primary key index on databases where it was created separately
+    op.execute("ALTER TABLE schedules DROP CONSTRAINT IF EXISTS schedules_id_key")
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS users_id_key")
+
+    # CREATE INDEX CONCURRENTLY can not run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reminder_outbox_user_id",
+            "reminder_outbox",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_schedules_end_date",
+            "schedules",
+            ["end_date"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_schedules_start_date_open_ended",
+            "schedules",
+            ["start_date"],
+            unique=False,
+            postgresql_where=sa.text("end_date IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_schedules_start_date_open_ended",
+            table_name="schedules",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_schedules_end_date",
+            table_name="schedules",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_reminder_outbox_user_id",
+            table_name="reminder_outbox",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    # The duplicate UNIQUE(id) constraints are not restored
@@ -0,0 +1,43 @@
+"""schedules user id id index
+
+Revision ID: bed7ea581297
+Revises: 0dbc565830e1
+Create Date: 2026-10-18 13:34:01.369394
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "bed7ea581297"
+down_revision: Union[str, None] = "0dbc565830e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_schedules_user_id_id",
+            "schedules",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_schedules_user_id_id",
+            table_name="schedules",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,52 @@
+"""schedules notify created
+
+Revision ID: 3c9e41d7a2b8
+Revises: bed7ea581297
+Create Date: 2026-10-18 14:02:47.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9e41d7a2b8"
+down_revision: Union[str, None] = "bed7ea581297"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The payload stays small, NOTIFY rejects payloads of 8000 bytes and more
+    op.execute(
+        """
+        CREATE FUNCTION notify_schedule_created() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'schedule_created',
+                json_build_object(
+                    'id', NEW.id,
+                    'medicine_policy', (SELECT medicine_policy FROM users WHERE id = NEW.user_id)
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER schedules_notify_created
+        AFTER INSERT ON schedules
+        FOR EACH ROW EXECUTE FUNCTION notify_schedule_created()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS schedules_notify_created ON schedules")
+    op.execute("DROP FUNCTION IF EXISTS notify_schedule_created()")
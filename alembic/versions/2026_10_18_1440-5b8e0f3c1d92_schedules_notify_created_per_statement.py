@@ -0,0 +1,86 @@
+"""schedules notify created per statement
+
+Revision ID: 5b8e0f3c1d92
+Revises: 6f2d8b07c4e1
+Create Date: 2026-10-18 14:40:12.731904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e0f3c1d92"
+down_revision: Union[str, None] = "6f2d8b07c4e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROW_TRIGGER_FUNCTION = """
+    CREATE OR REPLACE FUNCTION notify_schedule_created() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify(
+            'schedule_created',
+            json_build_object(
+                'id', NEW.id,
+                'medicine_policy', (SELECT medicine_policy FROM users WHERE id = NEW.user_id)
+            )::text
+        );
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS schedules_notify_created ON schedules")
+    # One notification per user and up to 100 ids of a statement, NOTIFY rejects payloads
+    # of 8000 bytes and more
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_schedule_created() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'schedule_created',
+                json_build_object('medicine_policy', batch.medicine_policy, 'ids', batch.ids)::text
+            )
+            FROM (
+                SELECT users.medicine_policy, json_agg(created.id ORDER BY created.id) AS ids
+                FROM (
+                    SELECT
+                        id,
+                        user_id,
+                        (row_number() OVER (PARTITION BY user_id ORDER BY id) - 1) / 100 AS chunk
+                    FROM created_schedules
+                ) AS created
+                JOIN users ON users.id = created.user_id
+                GROUP BY users.medicine_policy, created.chunk
+            ) AS batch;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER schedules_notify_created
+        AFTER INSERT ON schedules
+        REFERENCING NEW TABLE AS created_schedules
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_schedule_created()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS schedules_notify_created ON schedules")
+    op.execute(ROW_TRIGGER_FUNCTION)
+    op.execute(
+        """
+        CREATE TRIGGER schedules_notify_created
+        AFTER INSERT ON schedules
+        FOR EACH ROW EXECUTE FUNCTION notify_schedule_created()
+        """
+    )
@@ -0,0 +1,120 @@
+from collections.abc import Callable, Generator
+import json
+import os
+from pathlib import Path
+import platform
+import tracemalloc
+from typing import Any
+
+import pytest
+
+# The engine does not touch the database, but settings require connection parameters
+for name, value in {
+    "DB_USER": "benchmark",
+    "DB_PASS": "benchmark",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "benchmark",
+}.items():
+    os.environ.setdefault(name, value)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("baseline")
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help=f"Write the measured results to {BASELINE_PATH.name} instead of comparing with it",
+    )
+    group.addoption(
+        "--baseline-tolerance",
+        type=float,
+        default=2.0,
+        help="Fail when ops/sec drop more than this many times below the baseline",
+    )
+    group.addoption(
+        "--benchmark-database-url",
+        default=os.environ.get("BENCHMARK_DATABASE_URL"),
+        help="Migrated database the read path benchmarks seed and clean up, they are skipped "
+        "without it (default: BENCHMARK_DATABASE_URL)",
+    )
+    group.addoption(
+        "--baseline-memory-tolerance",
+        type=float,
+        default=1.25,
+        help="Fail when peak memory grows more than this many times above the baseline",
+    )
+
+
+@pytest.fixture(scope="session")
+def baseline_results(
+    request: pytest.FixtureRequest,
+) -> Generator[tuple[dict, dict], None, None]:
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    results: dict[str, dict[str, float]] = {}
+    yield baseline.get("benchmarks", {}), results
+
+    if request.config.getoption("--update-baseline") and results:
+        BASELINE_PATH.write_text(
+            json.dumps(
+                {
+                    "machine": {
+                        "python": platform.python_version(),
+                        "processor": platform.processor() or platform.machine(),
+                        "system": platform.system(),
+                    },
+                    "benchmarks": dict(
+                        sorted({**baseline.get("benchmarks", {}), **results}.items())
+                    ),
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+
+
+@pytest.fixture
+def measure(
+    benchmark: Any, baseline_results: tuple[dict, dict], request: pytest.FixtureRequest
+) -> Callable[..., Any]:
+    """
+    Benchmark the function, measure its peak memory with tracemalloc
+    and compare both with the stored baseline.
+    """
+    baseline, results = baseline_results
+    name = request.node.name
+
+    def run(func: Callable[..., Any], *args: Any) -> Any:
+        result = benchmark(func, *args)
+
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_memory_kib = round(peak / 1024, 1)
+        benchmark.extra_info["peak_memory_kib"] = peak_memory_kib
+
+        if benchmark.stats is None:
+            # --benchmark-disable
+            return result
+
+        ops = round(benchmark.stats.stats.ops, 2)
+        results[name] = {"ops": ops, "peak_memory_kib": peak_memory_kib}
+        if request.config.getoption("--update-baseline") or name not in baseline:
+            return result
+
+        expected = baseline[name]
+        tolerance = request.config.getoption("--baseline-tolerance")
+        memory_tolerance = request.config.getoption("--baseline-memory-tolerance")
+        assert (
+            ops * tolerance >= expected["ops"]
+        ), f"{name}: {ops} ops/sec, baseline is {expected['ops']} ops/sec"
+        assert peak_memory_kib <= expected["peak_memory_kib"] * memory_tolerance, (
+            f"{name}: {peak_memory_kib} KiB peak memory, "
+            f"baseline is {expected['peak_memory_kib']} KiB"
+        )
+        return result
+
+    return run
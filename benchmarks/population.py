@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime, time, timedelta
+import random
+from uuid import UUID, uuid4
+
+from src.core.config import Settings
+
+CURRENT_TIME = datetime(2025, 1, 1, 9, 7, tzinfo=UTC)
+FREQUENCIES = range(15, 1441, 15)
+
+
+@dataclass(slots=True)
+class SyntheticSchedule:
+    """Schedules-like object, the engine reads only these attributes"""
+
+    id: UUID
+    user_id: UUID
+    medicine_name: str
+    frequency: int
+    start_date: datetime
+    end_date: datetime | None
+
+
+def make_population(size: int, users: int, seed: int = 0) -> list[SyntheticSchedule]:
+    """Schedules on the 15-minute grid started around CURRENT_TIME, a third of them open-ended"""
+    rng = random.Random(seed)
+    user_ids = [uuid4() for _ in range(users)]
+    schedules = []
+    for _ in range(size):
+        start_date = CURRENT_TIME.replace(minute=0) + timedelta(minutes=15 * rng.randint(-960, 96))
+        end_date = None
+        if rng.random() < 2 / 3:
+            end_date = start_date + timedelta(minutes=15 * rng.randint(96, 60 * 96))
+        schedules.append(
+            SyntheticSchedule(
+                id=uuid4(),
+                user_id=rng.choice(user_ids),
+                medicine_name="Benchmark Medicine",
+                frequency=rng.choice(FREQUENCIES),
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
+    return schedules
+
+
+def make_config(morning: time, evening: time) -> Settings:
+    return Settings(MORNING_TIME=morning, EVENING_TIME=evening)
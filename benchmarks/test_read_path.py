@@ -0,0 +1,211 @@
+"""
+ORM and raw asyncpg read paths of a user's schedules, and the ORM loader strategies.
+These benchmarks seed users into the dedicated database of --benchmark-database-url
+and are skipped without it or when it is not reachable. The seeded users are removed.
+"""
+
+import asyncio
+from collections.abc import Callable, Generator
+from datetime import timedelta
+from typing import Any
+
+from asyncpg import PostgresError
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from benchmarks.population import CURRENT_TIME, make_config
+from src.api.v1.schedule.utils import find_next_takings, get_taking_end_time
+from src.core.config import settings
+from src.database.connection import create_engine
+from src.repositories import (
+    LoadStrategy,
+    Relation,
+    ScheduleReadRepository,
+    ScheduleRepository,
+    ScheduleRow,
+    UserRepository,
+)
+
+# Below the users seeded by src.tools.index_usage
+POLICY_OFFSET = 800_000_000
+SCHEDULES_PER_USER = {"10-schedules": 10, "100-schedules": 100, "1k-schedules": 1_000}
+WINDOW = timedelta(days=1)
+
+SEED_USERS = text(
+    """
+    INSERT INTO users (id, medicine_policy, name, created_at)
+    SELECT gen_random_uuid(), :offset + n, 'Read Path User', timezone('UTC', now())
+    FROM unnest(CAST(:counts AS integer[])) AS n
+    """
+)
+SEED_SCHEDULES = text(
+    """
+    INSERT INTO schedules (id, user_id, medicine_name, frequency, start_date, end_date, created_at)
+    SELECT
+        gen_random_uuid(),
+        users.id,
+        'Read Path Medicine',
+        15 * (1 + floor(random() * 96)::int),
+        CAST(:current_time AS timestamptz) - random() * interval '10 days',
+        CASE
+            WHEN random() < 0.3 THEN NULL
+            ELSE CAST(:current_time AS timestamptz) + random() * interval '10 days'
+        END,
+        timezone('UTC', now())
+    FROM users
+    CROSS JOIN LATERAL generate_series(1, users.medicine_policy - :offset)
+    WHERE users.medicine_policy - :offset = ANY(CAST(:counts AS integer[]))
+    """
+)
+DELETE_SCHEDULES = text(
+    """
+    DELETE FROM schedules USING users
+    WHERE schedules.user_id = users.id AND users.medicine_policy - :offset = ANY(:counts)
+    """
+)
+DELETE_USERS = text("DELETE FROM users WHERE medicine_policy - :offset = ANY(:counts)")
+
+
+@pytest.fixture(scope="module")
+def loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def session_maker(
+    loop: asyncio.AbstractEventLoop, request: pytest.FixtureRequest
+) -> Generator[async_sessionmaker, None, None]:
+    database_url = request.config.getoption("--benchmark-database-url")
+    if not database_url:
+        pytest.skip("Pass --benchmark-database-url to run the read path benchmarks")
+
+    engine: AsyncEngine = create_engine(database_url)
+    params = {"offset": POLICY_OFFSET, "counts": list(SCHEDULES_PER_USER.values())}
+
+    async def execute(*statements: Any) -> None:
+        async with engine.begin() as connection:
+            for statement in statements:
+                await connection.execute(statement, {**params, "current_time": CURRENT_TIME})
+
+    try:
+        loop.run_until_complete(execute(DELETE_SCHEDULES, DELETE_USERS))
+    except (OSError, PostgresError, SQLAlchemyError) as e:
+        loop.run_until_complete(engine.dispose())
+        pytest.skip(f"Database is not available: {e}")
+
+    loop.run_until_complete(execute(SEED_USERS, SEED_SCHEDULES, text("ANALYZE users, schedules")))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    loop.run_until_complete(execute(DELETE_SCHEDULES, DELETE_USERS))
+    loop.run_until_complete(engine.dispose())
+
+
+@pytest.fixture(params=list(SCHEDULES_PER_USER))
+def medicine_policy(request: pytest.FixtureRequest) -> int:
+    return POLICY_OFFSET + SCHEDULES_PER_USER[request.param]
+
+
+async def read_all_orm(session_maker: async_sessionmaker, medicine_policy: int) -> list:
+    async with session_maker() as session:
+        users = await UserRepository(session).get_all_with_relations(
+            ["schedules"], medicine_policy=medicine_policy
+        )
+        return users[0].schedules
+
+
+async def read_all_raw(session_maker: async_sessionmaker, medicine_policy: int) -> list:
+    async with session_maker() as session:
+        return await ScheduleReadRepository(session).get_by_medicine_policy(medicine_policy)
+
+
+async def read_all_with_strategy(
+    session_maker: async_sessionmaker, medicine_policy: int, relation: Relation
+) -> list:
+    async with session_maker() as session:
+        users = await UserRepository(session).get_all_with_relations(
+            [relation], medicine_policy=medicine_policy
+        )
+        return users[0].schedules
+
+
+async def next_takings(
+    session_maker: async_sessionmaker, medicine_policy: int, repository: type
+) -> list:
+    config = make_config(settings.MORNING_TIME, settings.EVENING_TIME)
+    async with session_maker() as session:
+        schedules = await repository(session).get_active_by_medicine_policy(
+            medicine_policy, CURRENT_TIME, get_taking_end_time(CURRENT_TIME, WINDOW, config)
+        )
+    return find_next_takings(schedules, WINDOW, config, CURRENT_TIME)
+
+
+@pytest.mark.parametrize("path", ["orm", "raw"])
+def test_read_all_schedules(
+    measure: Callable[..., Any],
+    loop: asyncio.AbstractEventLoop,
+    session_maker: async_sessionmaker,
+    medicine_policy: int,
+    path: str,
+) -> None:
+    read = read_all_orm if path == "orm" else read_all_raw
+    schedules = measure(lambda: loop.run_until_complete(read(session_maker, medicine_policy)))
+    assert len(schedules) == medicine_policy - POLICY_OFFSET
+
+
+@pytest.mark.parametrize(
+    "repository", [ScheduleRepository, ScheduleReadRepository], ids=["orm", "raw"]
+)
+def test_next_takings(
+    measure: Callable[..., Any],
+    loop: asyncio.AbstractEventLoop,
+    session_maker: async_sessionmaker,
+    medicine_policy: int,
+    repository: type,
+) -> None:
+    measure(
+        lambda: loop.run_until_complete(next_takings(session_maker, medicine_policy, repository))
+    )
+
+
+@pytest.mark.parametrize(
+    "relation",
+    [
+        Relation("schedules", LoadStrategy.JOINED),
+        Relation("schedules", LoadStrategy.SELECTIN),
+        Relation("schedules", LoadStrategy.SUBQUERY),
+        Relation("schedules", LoadStrategy.SELECTIN, ScheduleRow._fields),
+    ],
+    ids=["joined", "selectin", "subquery", "selectin-load-only"],
+)
+def test_relation_loading(
+    measure: Callable[..., Any],
+    benchmark: Any,
+    loop: asyncio.AbstractEventLoop,
+    session_maker: async_sessionmaker,
+    medicine_policy: int,
+    relation: Relation,
+) -> None:
+    """Rows and statements of one read are stored in the extra info of the benchmark"""
+    statements: list[int] = []
+
+    def count_rows(_connection: Any, cursor: Any, *_: Any) -> None:
+        statements.append(cursor.rowcount)
+
+    sync_engine = session_maker.kw["bind"].sync_engine
+    event.listen(sync_engine, "after_cursor_execute", count_rows)
+    try:
+        loop.run_until_complete(read_all_with_strategy(session_maker, medicine_policy, relation))
+    finally:
+        event.remove(sync_engine, "after_cursor_execute", count_rows)
+    benchmark.extra_info["statements"] = len(statements)
+    benchmark.extra_info["rows"] = sum(statements)
+
+    schedules = measure(
+        lambda: loop.run_until_complete(
+            read_all_with_strategy(session_maker, medicine_policy, relation)
+        )
+    )
+    assert len(schedules) == medicine_policy - POLICY_OFFSET
@@ -0,0 +1,69 @@
+from collections.abc import Callable
+from datetime import time, timedelta
+from itertools import islice
+from typing import Any, NamedTuple
+
+import pytest
+
+from benchmarks.population import CURRENT_TIME, make_config, make_population
+from src.api.v1.schedule.batch import build_schedule_columns, find_batch_takings
+from src.api.v1.schedule.calendar import find_calendar_takings
+from src.api.v1.schedule.utils import find_next_takings, get_taking_pattern, iter_next_takings
+
+DAY = (time(8, 0), time(22, 0))
+OVERNIGHT = (time(22, 0), time(6, 0))
+PAGE_SIZE = 50
+
+
+class Scenario(NamedTuple):
+    schedules: int
+    window: timedelta
+    allowed_hours: tuple[time, time]
+
+
+SCENARIOS = {
+    "1-schedule-1h": Scenario(1, timedelta(hours=1), DAY),
+    "100-schedules-1d": Scenario(100, timedelta(days=1), DAY),
+    "100-schedules-30d": Scenario(100, timedelta(days=30), DAY),
+    "1k-schedules-1d-overnight": Scenario(1_000, timedelta(days=1), OVERNIGHT),
+    "10k-schedules-1h": Scenario(10_000, timedelta(hours=1), DAY),
+    "10k-schedules-1h-overnight": Scenario(10_000, timedelta(hours=1), OVERNIGHT),
+    "10k-schedules-1d": Scenario(10_000, timedelta(days=1), DAY),
+}
+
+
+@pytest.fixture(params=list(SCENARIOS))
+def scenario(request: pytest.FixtureRequest) -> tuple[Scenario, list, Any]:
+    scenario = SCENARIOS[request.param]
+    schedules = make_population(scenario.schedules, users=max(1, scenario.schedules // 10))
+    get_taking_pattern.cache_clear()
+    return scenario, schedules, make_config(*scenario.allowed_hours)
+
+
+def test_find_next_takings(measure: Callable[..., Any], scenario: tuple) -> None:
+    scenario, schedules, config = scenario
+    measure(find_next_takings, schedules, scenario.window, config, CURRENT_TIME)
+
+
+def test_iter_next_takings_page(measure: Callable[..., Any], scenario: tuple) -> None:
+    scenario, schedules, config = scenario
+
+    def first_page() -> list:
+        return list(
+            islice(iter_next_takings(schedules, scenario.window, config, CURRENT_TIME), PAGE_SIZE)
+        )
+
+    measure(first_page)
+
+
+def test_find_batch_takings(measure: Callable[..., Any], scenario: tuple) -> None:
+    scenario, schedules, config = scenario
+    columns, _ = build_schedule_columns(schedules)
+    measure(find_batch_takings, columns, scenario.window, config, CURRENT_TIME)
+
+
+def test_find_calendar_takings(measure: Callable[..., Any], scenario: tuple) -> None:
+    scenario, schedules, config = scenario
+    start_date = CURRENT_TIME.date()
+    end_date = (CURRENT_TIME + scenario.window).date()
+    measure(find_calendar_takings, schedules, start_date, end_date, config)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.core.metrics import PROMETHEUS_MEDIA_TYPE, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_MEDIA_TYPE)
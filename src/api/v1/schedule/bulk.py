@@ -0,0 +1,189 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import TYPE_CHECKING
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.api.v1.schedule.schemas import (
+    SScheduleBulkCreateResult,
+    SScheduleCreateRequest,
+    SScheduleExport,
+)
+from src.core.logger import get_logger
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from src.api.v1.schedule.service import ScheduleService
+    from src.database.models.schedules import Schedules
+
+logger = get_logger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body iterator is still reading the request body.
+    Unlike StreamingResponse it does not listen for the client disconnect in parallel,
+    since that would swallow the request body messages.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:  # noqa: ARG002
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect from None
+
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_size: int
+) -> AsyncIterator[bytes | None]:
+    """
+    Split a byte stream into lines holding at most one line in memory.
+    Lines longer than max_line_size are dropped and yielded as None.
+    """
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if oversized:
+                oversized = False
+                yield None
+            else:
+                buffer += chunk[start:end]
+                yield None if len(buffer) > max_line_size else bytes(buffer)
+                buffer.clear()
+            start = end + 1
+
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_size:
+                oversized = True
+                buffer.clear()
+
+    if oversized:
+        yield None
+    elif buffer:
+        yield bytes(buffer)
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        (
+            f"{'.'.join(map(str, details['loc']))}: {details['msg']}"
+            if details["loc"]
+            else details["msg"]
+        )
+        for details in error.errors()
+    )
+
+
+async def create_one(
+    service: "ScheduleService", create_schedule_dto: SScheduleCreateRequest
+) -> "UUID | ValueError":
+    try:
+        return (await service.create_schedules([create_schedule_dto]))[0]
+    except DBAPIError:
+        logger.exception("Error saving a bulk schedule line")
+        return ValueError("Schedule could not be saved")
+
+
+async def create_batch(
+    service: "ScheduleService", batch: list[tuple[int, SScheduleCreateRequest | str]]
+) -> bytes:
+    """
+    Create the schedules of the parsed lines and render NDJSON results of all the lines.
+    When the database rejects the batch it is rolled back and its lines are retried
+    one by one, so a failing line does not drop its neighbours.
+    """
+    create_schedule_dtos = [item for _, item in batch if isinstance(item, SScheduleCreateRequest)]
+    try:
+        created: list[UUID | ValueError] = await service.create_schedules(create_schedule_dtos)
+    except DBAPIError:
+        logger.warning("Bulk schedule batch failed, creating its lines one by one")
+        created = [
+            await create_one(service, create_schedule_dto)
+            for create_schedule_dto in create_schedule_dtos
+        ]
+    created_iter = iter(created)
+
+    results = bytearray()
+    for line, item in batch:
+        outcome = item if isinstance(item, str) else next(created_iter)
+        if isinstance(outcome, str | ValueError):
+            result = SScheduleBulkCreateResult(line=line, error=str(outcome))
+        else:
+            result = SScheduleBulkCreateResult(line=line, schedule_id=outcome)
+        results += result.model_dump_json(exclude_none=True).encode()
+        results += b"\n"
+    return bytes(results)
+
+
+async def create_schedules_from_ndjson(
+    service: "ScheduleService",
+    chunks: AsyncIterable[bytes],
+    batch_size: int,
+    max_line_size: int,
+) -> AsyncIterator[bytes]:
+    """
+    Create schedules from NDJSON lines of SScheduleCreateRequest in batches of batch_size
+    and yield NDJSON results of every batch. The next batch is read only when the results
+    of the previous one are consumed, so memory does not grow with the upload.
+    """
+    batch: list[tuple[int, SScheduleCreateRequest | str]] = []
+    line_number = 0
+    async for line in iter_lines(chunks, max_line_size):
+        line_number += 1
+        if line is None:
+            batch.append((line_number, f"Line is longer than {max_line_size} bytes"))
+        elif not line.strip():
+            continue
+        else:
+            try:
+                batch.append((line_number, SScheduleCreateRequest.model_validate_json(line)))
+            except ValidationError as e:
+                batch.append((line_number, format_validation_error(e)))
+
+        if len(batch) >= batch_size:
+            yield await create_batch(service, batch)
+            batch = []
+
+    if batch:
+        yield await create_batch(service, batch)
+
+
+async def export_schedules_to_ndjson(
+    schedules: AsyncIterable["Schedules"], batch_size: int
+) -> AsyncIterator[bytes]:
+    """Render schedules with their user loaded as NDJSON SScheduleExport lines in chunks"""
+    lines = bytearray()
+    count = 0
+    async for schedule in schedules:
+        export = SScheduleExport(
+            user_id=schedule.user.medicine_policy,
+            schedule_id=schedule.id,
+            medicine_name=schedule.medicine_name,
+            frequency=schedule.frequency,
+            start_date=schedule.start_date,
+            end_date=schedule.end_date,
+        )
+        lines += export.model_dump_json().encode()
+        lines += b"\n"
+        count += 1
+        if count >= batch_size:
+            yield bytes(lines)
+            lines.clear()
+            count = 0
+
+    if lines:
+        yield bytes(lines)
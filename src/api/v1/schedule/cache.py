@@ -0,0 +1,251 @@
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from datetime import UTC, datetime, timedelta
+import json
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from src.core.cache import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from src.core.config import Settings, settings
+from src.core.metrics import format_header, format_sample, register_collector
+from src.repositories.schedule_read_repo import ScheduleRow
+
+if TYPE_CHECKING:
+    from src.database.models.schedules import Schedules
+
+QUARTER_HOUR = timedelta(minutes=15)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def get_quarter_hour_tick(current_time: datetime) -> int | None:
+    """
+    Number of the quarter hour (Q, Q + 15 minutes) holding current_time,
+    None exactly on a boundary, where the window includes both ends
+    """
+    tick, remainder = divmod(current_time - EPOCH, QUARTER_HOUR)
+    return tick if remainder else None
+
+
+def widen_to_quarter_hours(since: datetime, until: datetime) -> tuple[datetime, datetime]:
+    """Smallest period of whole quarter hours holding [since, until]"""
+    return (
+        EPOCH + (since - EPOCH) // QUARTER_HOUR * QUARTER_HOUR,
+        EPOCH - (EPOCH - until) // QUARTER_HOUR * QUARTER_HOUR,
+    )
+
+
+class NextTakingsCache:
+    """
+    Per-process LRU cache of next takings of users.
+
+    Schedule starts and frequencies are snapped to the 15-minute grid, so for an interval
+    that is a multiple of 15 minutes the takings only change at quarter-hour boundaries
+    or when the schedules of the user change. Every entry holds the tick it was computed in
+    and expires at the next boundary. The memory is capped by the weight of the entries,
+    the number of their takings plus one.
+    """
+
+    def __init__(self, max_weight: int) -> None:
+        self.max_weight = max_weight
+        self._entries: OrderedDict[tuple, tuple[int, list[dict[str, Any]]]] = OrderedDict()
+        self._keys_by_policy: dict[int, set[tuple]] = {}
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_cacheable(next_takings_interval: timedelta) -> bool:
+        return next_takings_interval % QUARTER_HOUR == timedelta(0)
+
+    def get(self, medicine_policy: int, params: Hashable, tick: int) -> list[dict[str, Any]] | None:
+        key = (medicine_policy, params)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != tick:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(
+        self, medicine_policy: int, params: Hashable, tick: int, takings: list[dict[str, Any]]
+    ) -> None:
+        if len(takings) + 1 > self.max_weight:
+            return
+
+        key = (medicine_policy, params)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (tick, takings)
+        self._keys_by_policy.setdefault(medicine_policy, set()).add(key)
+        self.weight += len(takings) + 1
+
+        while self.weight > self.max_weight:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, medicine_policy: int) -> None:
+        """Drop the entries of a user whose schedules changed"""
+        for key in self._keys_by_policy.get(medicine_policy, set()).copy():
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_policy.clear()
+        self.weight = 0
+
+    def _remove(self, key: tuple) -> None:
+        _, takings = self._entries.pop(key)
+        self.weight -= len(takings) + 1
+        policy_keys = self._keys_by_policy[key[0]]
+        policy_keys.discard(key)
+        if not policy_keys:
+            del self._keys_by_policy[key[0]]
+
+
+def encode_schedule_results(results: list[ScheduleRow | UUID]) -> bytes:
+    """Encode a cached query result, schedules as lists of their fields and ids as strings"""
+    return json.dumps(
+        [
+            (
+                str(result)
+                if isinstance(result, UUID)
+                else [
+                    str(result.id),
+                    str(result.user_id),
+                    result.medicine_name,
+                    result.frequency,
+                    result.start_date.isoformat(),
+                    result.end_date.isoformat() if result.end_date else None,
+                ]
+            )
+            for result in results
+        ]
+    ).encode()
+
+
+def decode_schedule_results(value: bytes) -> list[ScheduleRow | UUID]:
+    return [
+        (
+            UUID(result)
+            if isinstance(result, str)
+            else ScheduleRow(
+                UUID(result[0]),
+                UUID(result[1]),
+                result[2],
+                result[3],
+                datetime.fromisoformat(result[4]),
+                datetime.fromisoformat(result[5]) if result[5] else None,
+            )
+        )
+        for result in json.loads(value)
+    ]
+
+
+class ScheduleCache:
+    """
+    Results of the schedule queries of users on a pluggable backend, under the medicine policy
+    of the user and a key of the query with its parameters. A miss runs the query itself,
+    and all results of a user are dropped when schedules of the user are created or archived.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(medicine_policy: int) -> str:
+        return f"schedules:{medicine_policy}"
+
+    async def get(self, medicine_policy: int, query: str) -> list[ScheduleRow | UUID] | None:
+        results = await self.backend.get(self.get_key(medicine_policy), query)
+        if results is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return results
+
+    async def set(
+        self, medicine_policy: int, query: str, results: list["Schedules | ScheduleRow | UUID"]
+    ) -> list[ScheduleRow | UUID]:
+        """Store the results of a query, schedules as rows detached from the session"""
+        values = [
+            result if isinstance(result, UUID) else ScheduleRow.from_schedule(result)
+            for result in results
+        ]
+        await self.backend.set(self.get_key(medicine_policy), query, values)
+        return values
+
+    async def invalidate(self, medicine_policy: int) -> None:
+        await self.backend.delete(self.get_key(medicine_policy))
+
+
+def make_schedule_cache(config: Settings) -> ScheduleCache | None:
+    if config.SCHEDULE_CACHE_BACKEND == "memory":
+        return ScheduleCache(
+            MemoryCacheBackend(config.SCHEDULE_CACHE_MAX_ENTRIES, config.SCHEDULE_CACHE_TTL)
+        )
+    if config.SCHEDULE_CACHE_BACKEND == "redis":
+        return ScheduleCache(
+            RedisCacheBackend(
+                config.SCHEDULE_CACHE_REDIS_URL,
+                config.SCHEDULE_CACHE_TTL,
+                encode_schedule_results,
+                decode_schedule_results,
+            )
+        )
+    return None
+
+
+next_takings_cache = NextTakingsCache(settings.NEXT_TAKINGS_CACHE_MAX_WEIGHT)
+schedule_cache = make_schedule_cache(settings)
+
+
+@register_collector
+def collect_next_takings_cache_metrics() -> Iterator[str]:
+    for name, metric_type, description, value in (
+        (
+            "next_takings_cache_hits_total",
+            "counter",
+            "Next takings served from the cache",
+            next_takings_cache.hits,
+        ),
+        (
+            "next_takings_cache_misses_total",
+            "counter",
+            "Next takings computed",
+            next_takings_cache.misses,
+        ),
+        (
+            "next_takings_cache_weight",
+            "gauge",
+            "Weight of the cache entries",
+            next_takings_cache.weight,
+        ),
+    ):
+        yield from format_header(name, metric_type, description)
+        yield format_sample(name, {}, value)
+
+
+@register_collector
+def collect_schedule_cache_metrics() -> Iterator[str]:
+    if schedule_cache is None:
+        return
+
+    for name, description, value in (
+        (
+            "schedule_cache_hits_total",
+            "Schedule queries of users answered from the cache",
+            schedule_cache.hits,
+        ),
+        (
+            "schedule_cache_misses_total",
+            "Schedule queries of users run on the database",
+            schedule_cache.misses,
+        ),
+    ):
+        yield from format_header(name, "counter", description)
+        yield format_sample(name, {}, value)
@@ -0,0 +1,142 @@
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Any
+
+from src.api.v1.schedule.utils import (
+    MICROSECOND,
+    is_allowed_time,
+    iter_schedule_takings,
+    time_to_microseconds,
+)
+from src.core.config import Settings
+
+if TYPE_CHECKING:
+    from src.database.models.schedules import Schedules
+    from src.repositories.schedule_read_repo import ScheduleRow
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+SLOT = timedelta(minutes=15)
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 96
+
+
+@lru_cache
+def get_allowed_slots(morning: time, evening: time) -> int:
+    """Bitmap of the 15-minute slots of a UTC day allowed by utils.is_allowed_time"""
+    morning_microseconds = time_to_microseconds(morning)
+    evening_microseconds = time_to_microseconds(evening)
+    slot_microseconds = SLOT // MICROSECOND
+    mask = 0
+    for slot in range(SLOTS_PER_DAY):
+        if is_allowed_time(slot * slot_microseconds, morning_microseconds, evening_microseconds):
+            mask |= 1 << slot
+    return mask
+
+
+@cache
+def get_slot_pattern(step: int, first: int) -> int:
+    """
+    Bitmap of the slots first, first + step, ... within a day.
+    Bounded by SLOTS_PER_DAY ** 2 entries since only steps shorter than a day are cached.
+    """
+    mask = 0
+    for slot in range(first, SLOTS_PER_DAY, step):
+        mask |= 1 << slot
+    return mask
+
+
+def get_slot_range(lowest: int, highest: int) -> int:
+    """Bitmap of the slots lowest..highest"""
+    return ((1 << (highest + 1)) - 1) >> lowest << lowest
+
+
+def iter_slots(mask: int) -> Iterator[int]:
+    """Yield set bits of the bitmap from the lowest one"""
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def is_on_slot_grid(schedule: "Schedules | ScheduleRow") -> bool:
+    """Schedules created by the service start on the UTC 15-minute grid and repeat on it"""
+    return (
+        schedule.start_date.utcoffset() == timedelta(0)
+        and (schedule.start_date - EPOCH) % SLOT == timedelta(0)
+        and schedule.frequency % SLOT_MINUTES == 0
+    )
+
+
+def iter_calendar_slots(
+    schedule: "Schedules | ScheduleRow", first_day: int, last_day: int, config: Settings
+) -> Iterator[int]:
+    """
+    Yield slots (counted from the Unix epoch) of takings of an on-grid schedule within
+    the days first_day..last_day (counted from the Unix epoch) in time order.
+    Every day is the schedule's slot pattern ANDed with the allowed slots and the active range.
+    """
+    start_slot = (schedule.start_date - EPOCH) // SLOT
+    end_slot = (schedule.end_date - EPOCH) // SLOT if schedule.end_date else None
+    step = schedule.frequency // SLOT_MINUTES
+    allowed = get_allowed_slots(config.MORNING_TIME, config.EVENING_TIME)
+
+    start_day = start_slot // SLOTS_PER_DAY
+    # The schedule start itself is checked against the plain MORNING_TIME..EVENING_TIME window
+    if first_day <= start_day <= last_day and (
+        config.MORNING_TIME <= schedule.start_date.time() <= config.EVENING_TIME
+    ):
+        yield start_slot
+
+    last_active_day = last_day if end_slot is None else min(last_day, end_slot // SLOTS_PER_DAY)
+    for day in range(max(first_day, start_day), last_active_day + 1):
+        day_slot = day * SLOTS_PER_DAY
+        lowest = max(0, start_slot + 1 - day_slot)
+        highest = (
+            SLOTS_PER_DAY - 1 if end_slot is None else min(SLOTS_PER_DAY - 1, end_slot - day_slot)
+        )
+        if lowest > highest:
+            continue
+
+        first = (start_slot - day_slot) % step
+        if step < SLOTS_PER_DAY:
+            pattern = get_slot_pattern(step, first)
+        else:
+            pattern = 1 << first if first < SLOTS_PER_DAY else 0
+
+        for slot in iter_slots(pattern & allowed & get_slot_range(lowest, highest)):
+            yield day_slot + slot
+
+
+def find_calendar_takings(
+    schedules: list["Schedules | ScheduleRow"], start_date: date, end_date: date, config: Settings
+) -> list[dict[str, Any]]:
+    """
+    Find all takings of the schedules on the UTC days start_date..end_date,
+    ordered by time and schedule id.
+    """
+    first_day = (start_date - EPOCH.date()).days
+    last_day = (end_date - EPOCH.date()).days
+    since = datetime.combine(start_date, time(), tzinfo=UTC)
+    until = datetime.combine(end_date + timedelta(days=1), time(), tzinfo=UTC) - MICROSECOND
+
+    takings: list[tuple[datetime, Schedules | ScheduleRow]] = []
+    for schedule in schedules:
+        if schedule.end_date and schedule.end_date < since:
+            continue
+        if schedule.start_date > until:
+            continue
+
+        if is_on_slot_grid(schedule):
+            takings.extend(
+                (EPOCH + slot * SLOT, schedule)
+                for slot in iter_calendar_slots(schedule, first_day, last_day, config)
+            )
+        else:
+            takings.extend(
+                (taking_time, schedule)
+                for taking_time in iter_schedule_takings(schedule, since, until, config)
+            )
+
+    takings.sort(key=lambda taking: (taking[0], taking[1].id))
+    return [{"schedule": schedule, "taking_time": taking_time} for taking_time, schedule in takings]
@@ -1,16 +1,68 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.api.v1.schedule.cache import next_takings_cache, schedule_cache
 from src.api.v1.schedule.service import ScheduleService
-from src.database.connection import DB_DEPENDENCY
-from src.repositories import ScheduleRepository, UserRepository
+from src.database import connection
+from src.database.connection import DB_DEPENDENCY, AsyncSessionMaker
+from src.repositories import (
+    ScheduleArchiveRepository,
+    ScheduleReadRepository,
+    ScheduleRepository,
+    UnitOfWork,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+from src.workers import reminder_dispatcher
 
+USER_ID_QUERY = Annotated[int, Query(..., gt=0, description="medicine policy number of user")]
+OPTIONAL_USER_ID_QUERY = Annotated[
+    int | None, Query(gt=0, description="medicine policy number of user")
+]
 
-async def get_schedule_service(session: DB_DEPENDENCY) -> ScheduleService:
+
+def make_schedule_service(session: AsyncSession) -> ScheduleService:
     user_repo: UserRepository = UserRepository(session)
     schedule_repo: ScheduleRepository = ScheduleRepository(session)
-    return ScheduleService(user_repo=user_repo, schedule_repo=schedule_repo)
+    upcoming_takings_repo: UpcomingTakingsRepository = UpcomingTakingsRepository(session)
+    return ScheduleService(
+        user_repo=user_repo,
+        schedule_repo=schedule_repo,
+        upcoming_takings_repo=upcoming_takings_repo,
+        reminder_dispatcher=reminder_dispatcher,
+        session_router=connection.session_router,
+        schedule_read_repo=ScheduleReadRepository(session),
+        next_takings_cache=next_takings_cache,
+        schedule_cache=schedule_cache,
+        schedule_archive_repo=ScheduleArchiveRepository(session),
+        unit_of_work=UnitOfWork(session),
+    )
+
+
+async def get_schedule_service(session: DB_DEPENDENCY) -> ScheduleService:
+    return make_schedule_service(session)
+
+
+async def get_read_schedule_service(
+    user_id: USER_ID_QUERY,
+) -> AsyncGenerator[ScheduleService, None]:
+    """Service for read-only requests of a user, on the replica unless the user wrote recently"""
+    async with connection.session_router.get_reader(user_id)() as session:
+        yield make_schedule_service(session)
+
+
+@asynccontextmanager
+async def schedule_service_session(
+    session_maker: async_sessionmaker[AsyncSession] = AsyncSessionMaker,
+) -> AsyncGenerator[ScheduleService, None]:
+    """Service with its own session, for streaming responses outliving the dependencies"""
+    async with session_maker() as session:
+        yield make_schedule_service(session)
 
 
 SCHEDULE_SERVICE_DEPENDENCY = Annotated[ScheduleService, Depends(get_schedule_service)]
+READ_SCHEDULE_SERVICE_DEPENDENCY = Annotated[ScheduleService, Depends(get_read_schedule_service)]
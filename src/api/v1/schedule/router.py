@@ -1,28 +1,62 @@
-from datetime import timedelta
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime, timedelta
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from src.api.v1.schedule.dependencies import SCHEDULE_SERVICE_DEPENDENCY
+from src.api.v1.schedule.bulk import (
+    NDJSON_MEDIA_TYPE,
+    NDJSONStreamingResponse,
+    create_schedules_from_ndjson,
+    export_schedules_to_ndjson,
+)
+from src.api.v1.schedule.dependencies import (
+    OPTIONAL_USER_ID_QUERY,
+    READ_SCHEDULE_SERVICE_DEPENDENCY,
+    SCHEDULE_SERVICE_DEPENDENCY,
+    USER_ID_QUERY,
+    schedule_service_session,
+)
 from src.api.v1.schedule.schemas import (
+    SGetCalendarTakingResponse,
     SGetNextTakingsResponse,
     SGetScheduleResponse,
     SScheduleCreateRequest,
     SScheduleCreateResponse,
+    SuccessResponseListSGetCalendarTakingResponse,
     SuccessResponseListSGetNextTakingsResponse,
     SuccessResponseListUUID,
     SuccessResponseSGetScheduleResponse,
     SuccessResponseSScheduleCreateResponse,
 )
+from src.api.v1.schedule.utils import TakingsCursor
+from src.core.config import settings
+from src.database import connection
 
 router = APIRouter(tags=["schedule"])
 
-USER_ID_QUERY = Annotated[int, Query(..., gt=0, description="medicine policy number of user")]
 SCHEDULE_ID_QUERY = Annotated[UUID, Query(..., description="schedule unique UUID")]
 NEXT_TAKINGS_QUERY = Annotated[
     timedelta, Query(..., description="Optional manual next_taking interval")
 ]
+LIMIT_QUERY = Annotated[int, Query(..., gt=0, description="Maximum number of takings to return")]
+AFTER_TIME_QUERY = Annotated[
+    datetime, Query(..., description="Resume after the taking at this time (timezone is UTC)")
+]
+AFTER_SCHEDULE_ID_QUERY = Annotated[
+    UUID, Query(..., description="Resume after the taking of this schedule")
+]
+AFTER_ID_QUERY = Annotated[UUID, Query(..., description="Resume after this schedule id")]
+SCHEDULES_LIMIT_QUERY = Annotated[
+    int, Query(..., gt=0, description="Maximum number of schedule ids to return")
+]
+INCLUDE_ARCHIVED_QUERY = Annotated[
+    bool, Query(description="Include schedules archived long after they ended")
+]
+START_DATE_QUERY = Annotated[date, Query(..., description="First day of the calendar (UTC)")]
+END_DATE_QUERY = Annotated[date, Query(..., description="Last day of the calendar (UTC)")]
 
 
 @router.post("/schedule")
@@ -42,28 +76,83 @@ async def create_schedule(
     )
 
 
+@router.post("/schedules:bulk", response_class=NDJSONStreamingResponse)
+async def create_schedules_bulk(request: Request) -> NDJSONStreamingResponse:
+    """
+    Create many schedules from an NDJSON stream with one SScheduleCreateRequest per line.
+    Users are registered like in POST /schedule.
+    Results are streamed back as NDJSON in the order of the request lines,
+    with either schedule_id or error for every non-empty line.
+    """
+
+    async def stream_results() -> AsyncIterator[bytes]:
+        async with schedule_service_session() as service:
+            async for results in create_schedules_from_ndjson(
+                service, request.stream(), settings.BULK_BATCH_SIZE, settings.BULK_MAX_LINE_SIZE
+            ):
+                yield results
+
+    return NDJSONStreamingResponse(stream_results())
+
+
+@router.get("/schedules:export", response_class=StreamingResponse)
+async def export_schedules(
+    schedule_service: SCHEDULE_SERVICE_DEPENDENCY,
+    user_id: OPTIONAL_USER_ID_QUERY = None,
+) -> StreamingResponse:
+    """
+    Export schedules of a user, or of all users without user_id, as an NDJSON stream
+    with one SScheduleExport per line. Schedules are read with a server-side cursor,
+    archived schedules are not exported.
+    """
+    if user_id is None:
+        user_uuid = None
+        session_maker = connection.session_router.replica
+    else:
+        user_uuid = await schedule_service.get_user_id_by_policy(user_id)
+        session_maker = connection.session_router.get_reader(user_id)
+
+    async def stream_schedules() -> AsyncIterator[bytes]:
+        async with schedule_service_session(session_maker) as service:
+            async for lines in export_schedules_to_ndjson(
+                service.stream_schedules(settings.EXPORT_BATCH_SIZE, user_uuid),
+                settings.EXPORT_BATCH_SIZE,
+            ):
+                yield lines
+
+    return StreamingResponse(stream_schedules(), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/schedules")
 async def get_schedules_ids(
-    schedule_service: SCHEDULE_SERVICE_DEPENDENCY,
+    schedule_service: READ_SCHEDULE_SERVICE_DEPENDENCY,
     user_id: USER_ID_QUERY,
+    after_id: AFTER_ID_QUERY | None = None,
+    limit: SCHEDULES_LIMIT_QUERY | None = None,
+    include_archived: INCLUDE_ARCHIVED_QUERY = False,
 ) -> SuccessResponseListUUID:
     """
-    Get all schedules ids for a user.
+    Get schedules ids for a user ordered by id.
+    If limit is provided, only the first ids are returned.
+    To get the next page, pass the last received id as after_id.
     """
-    schedule_ids = await schedule_service.get_schedules_ids_by_policy(user_id)
+    schedule_ids = await schedule_service.get_schedules_ids_by_policy(
+        user_id, after_id, limit, include_archived
+    )
     return SuccessResponseListUUID(data=schedule_ids)
 
 
 @router.get("/schedule")
 async def get_schedule(
-    schedule_service: SCHEDULE_SERVICE_DEPENDENCY,
+    schedule_service: READ_SCHEDULE_SERVICE_DEPENDENCY,
     user_id: USER_ID_QUERY,
     schedule_id: SCHEDULE_ID_QUERY,
+    include_archived: INCLUDE_ARCHIVED_QUERY = False,
 ) -> SuccessResponseSGetScheduleResponse:
     """
     Get a schedule by id.
     """
-    schedule = await schedule_service.get_schedule_by_id(user_id, schedule_id)
+    schedule = await schedule_service.get_schedule_by_id(user_id, schedule_id, include_archived)
     return SuccessResponseSGetScheduleResponse(
         data=SGetScheduleResponse(
             medicine_name=schedule.medicine_name,
@@ -77,15 +166,44 @@ async def get_schedule(
 
 @router.get("/next_takings")
 async def get_next_takings(
-    schedule_service: SCHEDULE_SERVICE_DEPENDENCY,
+    schedule_service: READ_SCHEDULE_SERVICE_DEPENDENCY,
     user_id: USER_ID_QUERY,
     next_takings: NEXT_TAKINGS_QUERY | None = None,
+    limit: LIMIT_QUERY | None = None,
+    after_time: AFTER_TIME_QUERY | None = None,
+    after_schedule_id: AFTER_SCHEDULE_ID_QUERY | None = None,
 ) -> SuccessResponseListSGetNextTakingsResponse:
     """
     Get next takings for a user.
     If next_takings is provided, it will use it instead of the default value from the config.
+    If limit is provided, only the first takings are returned. To get the next page,
+    pass the time and schedule_id of the last received taking as after_time and after_schedule_id.
     """
+    after = None
+    if after_time or after_schedule_id:
+        if not (after_time and after_schedule_id):
+            raise HTTPException(422, "after_time and after_schedule_id must be provided together")
+        after = TakingsCursor(
+            after_time.replace(tzinfo=after_time.tzinfo or UTC), after_schedule_id
+        )
+
     takings: list[SGetNextTakingsResponse] = await schedule_service.get_next_takings_with_model(
-        user_id, next_takings
+        user_id, next_takings, limit, after
     )
     return SuccessResponseListSGetNextTakingsResponse(data=takings)
+
+
+@router.get("/calendar")
+async def get_calendar(
+    schedule_service: READ_SCHEDULE_SERVICE_DEPENDENCY,
+    user_id: USER_ID_QUERY,
+    start_date: START_DATE_QUERY,
+    end_date: END_DATE_QUERY,
+) -> SuccessResponseListSGetCalendarTakingResponse:
+    """
+    Get all takings for a user on the days from start_date to end_date inclusive (UTC days).
+    """
+    takings: list[SGetCalendarTakingResponse] = await schedule_service.get_calendar_with_model(
+        user_id, start_date, end_date
+    )
+    return SuccessResponseListSGetCalendarTakingResponse(data=takings)
@@ -4,10 +4,14 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 from src.api.v1.schedule.schemas.generated_schemas import (
+    SGetCalendarTakingResponse,
     SGetNextTakingsResponse,
     SGetScheduleResponse,
+    SScheduleBulkCreateResult,
     SScheduleCreateRequest,
     SScheduleCreateResponse,
+    SScheduleExport,
+    SuccessResponseListSGetCalendarTakingResponse,
     SuccessResponseListSGetNextTakingsResponse,
     SuccessResponseListUUID,
     SuccessResponseSGetScheduleResponse,
@@ -29,12 +33,16 @@ class SUserCreate(BaseModel):
 
 
 __all__ = [
+    "SGetCalendarTakingResponse",
     "SGetNextTakingsResponse",
     "SGetScheduleResponse",
+    "SScheduleBulkCreateResult",
     "SScheduleCreate",
     "SScheduleCreateRequest",
     "SScheduleCreateResponse",
+    "SScheduleExport",
     "SUserCreate",
+    "SuccessResponseListSGetCalendarTakingResponse",
     "SuccessResponseListSGetNextTakingsResponse",
     "SuccessResponseListUUID",
     "SuccessResponseSGetScheduleResponse",
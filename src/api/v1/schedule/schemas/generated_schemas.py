@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, PositiveInt
+from pydantic import BaseModel, Field, PositiveInt, conint
 
 
 class ResponseSchema(BaseModel):
@@ -31,6 +31,19 @@ class ValidationError(BaseModel):
     type: str = Field(..., title='Error Type')
 
 
+class SGetCalendarTakingResponse(BaseModel):
+    schedule_id: UUID = Field(..., title='Schedule UUID')
+    end_date: Optional[datetime] = Field(
+        None, description='timezone is always UTC', title='End Date'
+    )
+    frequency: PositiveInt = Field(..., title='Frequency')
+    medicine_name: str = Field(..., title='Medicine Name')
+    taking_time: datetime = Field(..., title='Taking Time')
+    start_date: Optional[datetime] = Field(
+        None, description='timezone is always UTC', title='Start Date'
+    )
+
+
 class SGetNextTakingsResponse(BaseModel):
     schedule_id: UUID = Field(..., title='Schedule UUID')
     end_date: Optional[datetime] = Field(
@@ -61,15 +74,32 @@ class SScheduleCreateRequest(BaseModel):
     end_date: Optional[datetime] = Field(
         None, description='timezone is always UTC', title='End Date'
     )
-    frequency: PositiveInt = Field(..., title='Frequency')
+    frequency: conint(le=2147483647, gt=0) = Field(..., title='Frequency')
     medicine_name: str = Field(..., title='Medicine Name')
-    medicine_policy: PositiveInt = Field(..., title='Medicine Policy')
+    medicine_policy: conint(le=2147483647, gt=0) = Field(..., title='Medicine Policy')
     name: Optional[str] = Field(None, title='Name')
     start_date: Optional[datetime] = Field(
         None, description='timezone is always UTC', title='Start Date'
     )
 
 
+class SScheduleBulkCreateResult(BaseModel):
+    line: int = Field(..., description='number of the request line starting from 1', title='Line')
+    schedule_id: Optional[UUID] = Field(None, title='Schedule UUID')
+    error: Optional[str] = Field(None, title='Error')
+
+
+class SScheduleExport(BaseModel):
+    user_id: int = Field(..., description='medicine policy number of user', title='User Id')
+    schedule_id: UUID = Field(..., title='Schedule UUID')
+    medicine_name: str = Field(..., title='Medicine Name')
+    frequency: PositiveInt = Field(..., title='Frequency')
+    start_date: datetime = Field(..., description='timezone is always UTC', title='Start Date')
+    end_date: Optional[datetime] = Field(
+        None, description='timezone is always UTC', title='End Date'
+    )
+
+
 class SScheduleCreateResponse(BaseModel):
     schedule_id: UUID = Field(..., title='Schedule UUID')
 
@@ -86,5 +116,9 @@ class SuccessResponseListSGetNextTakingsResponse(SuccessResponseSchema):
     data: List[SGetNextTakingsResponse] = Field(..., title='Data')
 
 
+class SuccessResponseListSGetCalendarTakingResponse(SuccessResponseSchema):
+    data: List[SGetCalendarTakingResponse] = Field(..., title='Data')
+
+
 class HTTPValidationError(BaseModel):
     detail: Optional[List[ValidationError]] = Field(None, title='Detail')
@@ -1,52 +1,95 @@
 # ruff: noqa: TRY003
-from datetime import UTC, datetime, timedelta
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from heapq import merge
+from itertools import islice
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
 from fastapi import HTTPException
 
+from src.api.v1.schedule.cache import (
+    NextTakingsCache,
+    ScheduleCache,
+    get_quarter_hour_tick,
+    widen_to_quarter_hours,
+)
+from src.api.v1.schedule.calendar import find_calendar_takings
 from src.api.v1.schedule.schemas import (
+    SGetCalendarTakingResponse,
     SGetNextTakingsResponse,
     SScheduleCreate,
     SScheduleCreateRequest,
     SUserCreate,
 )
-from src.api.v1.schedule.utils import find_next_takings, round_to_multiple, round_to_multiple_dt
+from src.api.v1.schedule.utils import (
+    TakingsCursor,
+    find_schedule_takings,
+    get_taking_end_time,
+    iter_next_takings,
+    round_to_multiple,
+    round_to_multiple_dt,
+)
 from src.core.config import settings
 from src.core.logger import get_logger
+from src.repositories.base_repo import Relation
+from src.repositories.user_repo import UserNotFoundError
 
 if TYPE_CHECKING:
+    from src.database.connection import SessionRouter
     from src.database.models.schedules import Schedules
-    from src.database.models.users import Users
-    from src.repositories import ScheduleRepository, UserRepository
+    from src.database.models.schedules_archive import SchedulesArchive
+    from src.repositories import (
+        ScheduleArchiveRepository,
+        ScheduleChange,
+        ScheduleReadRepository,
+        ScheduleRepository,
+        ScheduleRow,
+        UnitOfWork,
+        UpcomingTakingsRepository,
+        UserRepository,
+    )
+    from src.workers.reminders import ReminderDispatcher
 
 logger = get_logger(__name__)
 
 
 class ScheduleService:
-    def __init__(self, user_repo: "UserRepository", schedule_repo: "ScheduleRepository") -> None:
+    def __init__(
+        self,
+        user_repo: "UserRepository",
+        schedule_repo: "ScheduleRepository",
+        upcoming_takings_repo: "UpcomingTakingsRepository",
+        reminder_dispatcher: "ReminderDispatcher | None" = None,
+        session_router: "SessionRouter | None" = None,
+        schedule_read_repo: "ScheduleReadRepository | None" = None,
+        next_takings_cache: NextTakingsCache | None = None,
+        schedule_cache: ScheduleCache | None = None,
+        schedule_archive_repo: "ScheduleArchiveRepository | None" = None,
+        unit_of_work: "UnitOfWork | None" = None,
+    ) -> None:
         self._schedule_repo = schedule_repo
+        # Multi-step writes commit once, the repositories share the session
+        self._unit_of_work = unit_of_work or schedule_repo.unit_of_work()
+        # Hot reads skip the ORM when given, the ORM repository answers the same queries
+        self._schedule_read_repo = schedule_read_repo or schedule_repo
         self._user_repo = user_repo
+        self._upcoming_takings_repo = upcoming_takings_repo
+        self._reminder_dispatcher = reminder_dispatcher
+        self._session_router = session_router
+        self._next_takings_cache = next_takings_cache
+        self._schedule_cache = schedule_cache
+        # Reads including archived schedules need it
+        self._schedule_archive_repo = schedule_archive_repo
 
-    async def create_schedule(self, create_schedule_dto: SScheduleCreateRequest) -> UUID:
-        user: Users | None = await self._user_repo.get_by_medical_policy(
-            create_schedule_dto.medicine_policy
-        )
-        if user is None:
-            logger.debug(
-                f"User with policy {create_schedule_dto.medicine_policy} not found, create new one"
-            )
-            user: Users = await self._user_repo.create(
-                SUserCreate(
-                    name=create_schedule_dto.name,
-                    medicine_policy=create_schedule_dto.medicine_policy,
-                )
-            )
-            logger.debug("User created successfully")
-
+    @staticmethod
+    def get_schedule_period(
+        create_schedule_dto: SScheduleCreateRequest,
+    ) -> tuple[datetime, datetime]:
+        """Resolve the start (rounded to 15 minutes) and end dates of a new schedule"""
         if not create_schedule_dto.start_date:
             logger.debug("start date not found, getting it from now")
-            start_date = datetime.now(UTC), 15
+            start_date = datetime.now(UTC)
         else:
             logger.debug("start date found")
             start_date = create_schedule_dto.start_date
@@ -73,63 +116,410 @@ class ScheduleService:
         if end_date < start_date:
             raise ValueError("End date must be greater than start date")
 
+        return start_date, end_date
+
+    async def create_schedule(self, create_schedule_dto: SScheduleCreateRequest) -> UUID:
+        start_date, end_date = self.get_schedule_period(create_schedule_dto)
+
         logger.debug(
             "Checks are completed, start creating of schedule",
             context={"create_schedule_dto": create_schedule_dto.model_dump_json()},
         )
-        schedule: Schedules = await self._schedule_repo.create(
-            SScheduleCreate(
-                medicine_name=create_schedule_dto.medicine_name,
-                frequency=round_to_multiple(create_schedule_dto.frequency, 15),
-                start_date=start_date,
-                end_date=end_date,
-                user_id=user.id,
+        async with self._unit_of_work:
+            user_id: UUID = await self._user_repo.get_or_create_id(
+                SUserCreate(
+                    name=create_schedule_dto.name,
+                    medicine_policy=create_schedule_dto.medicine_policy,
+                )
             )
-        )
-        logger.debug(f"Schedule {create_schedule_dto.medicine_name} created with id {schedule.id}")
+            schedule: Schedules = await self._schedule_repo.create(
+                SScheduleCreate(
+                    medicine_name=create_schedule_dto.medicine_name,
+                    frequency=round_to_multiple(create_schedule_dto.frequency, 15),
+                    start_date=start_date,
+                    end_date=end_date,
+                    user_id=user_id,
+                )
+            )
+            # The takings refer to the schedule
+            await self._unit_of_work.flush()
+            logger.debug(
+                f"Schedule {create_schedule_dto.medicine_name} created with id {schedule.id}"
+            )
+
+            await self.materialize_takings([schedule], datetime.now(UTC))
+
+        if self._session_router is not None:
+            self._session_router.mark_written(create_schedule_dto.medicine_policy)
+        if self._next_takings_cache is not None:
+            self._next_takings_cache.invalidate(create_schedule_dto.medicine_policy)
+        await self._invalidate_schedule_cache(create_schedule_dto.medicine_policy)
+        if self._reminder_dispatcher is not None:
+            self._reminder_dispatcher.arm(schedule)
 
         return schedule.id
 
-    async def get_schedules_by_policy(self, medicine_policy: int) -> list["Schedules"]:
-        users: list[Users] | None = await self._user_repo.get_all_with_relations(
-            ["schedules"], medicine_policy=medicine_policy
+    async def create_schedules(
+        self, create_schedule_dtos: list[SScheduleCreateRequest]
+    ) -> list[UUID | ValueError]:
+        """
+        Create schedules like create_schedule, registering their users with one upsert,
+        inserting the schedules with multi-row statements and committing once.
+
+        Returns:
+            Id of the created schedule or the validation error for every request
+        """
+        errors: list[ValueError | None] = []
+        schedules_data: list[tuple[SScheduleCreateRequest, datetime, datetime]] = []
+        for create_schedule_dto in create_schedule_dtos:
+            try:
+                start_date, end_date = self.get_schedule_period(create_schedule_dto)
+            except ValueError as e:
+                errors.append(e)
+            else:
+                errors.append(None)
+                schedules_data.append((create_schedule_dto, start_date, end_date))
+        if not schedules_data:
+            return errors
+
+        async with self._unit_of_work:
+            user_ids: dict[int, UUID] = await self._user_repo.get_or_create_ids(
+                [
+                    SUserCreate(name=dto.name, medicine_policy=dto.medicine_policy)
+                    for dto, _, _ in schedules_data
+                ]
+            )
+            schedules: list[Schedules] = await self._schedule_repo.create_many(
+                [
+                    SScheduleCreate(
+                        medicine_name=dto.medicine_name,
+                        frequency=round_to_multiple(dto.frequency, 15),
+                        start_date=start_date,
+                        end_date=end_date,
+                        user_id=user_ids[dto.medicine_policy],
+                    )
+                    for dto, start_date, end_date in schedules_data
+                ]
+            )
+            logger.debug(f"{len(schedules)} schedules created")
+
+            await self.materialize_takings(schedules, datetime.now(UTC))
+
+        for medicine_policy in user_ids:
+            if self._session_router is not None:
+                self._session_router.mark_written(medicine_policy)
+            if self._next_takings_cache is not None:
+                self._next_takings_cache.invalidate(medicine_policy)
+            await self._invalidate_schedule_cache(medicine_policy)
+        if self._reminder_dispatcher is not None:
+            for schedule in schedules:
+                self._reminder_dispatcher.arm(schedule)
+
+        created = iter(schedules)
+        return [error if error is not None else next(created).id for error in errors]
+
+    async def _invalidate_schedule_cache(self, medicine_policy: int) -> None:
+        """
+        Drop the cached schedules of a user after a committed write. A failure is logged,
+        since the write is saved, and the entries expire after SCHEDULE_CACHE_TTL.
+        """
+        if self._schedule_cache is None:
+            return
+        try:
+            await self._schedule_cache.invalidate(medicine_policy)
+        except Exception:
+            logger.exception(f"Error invalidating cached schedules of {medicine_policy}")
+
+    async def materialize_takings(self, schedules: list["Schedules"], now: datetime) -> None:
+        """Extend upcoming takings of the schedules up to the rolling horizon"""
+        until = now + settings.UPCOMING_TAKINGS_HORIZON
+        await self._upcoming_takings_repo.materialize(
+            [
+                (
+                    schedule,
+                    find_schedule_takings(
+                        schedule,
+                        max(now, schedule.takings_materialized_until or now),
+                        until,
+                        settings,
+                    ),
+                )
+                for schedule in schedules
+            ],
+            until,
+        )
+
+    async def refresh_upcoming_takings(self) -> int:
+        """
+        Drop past upcoming takings and extend the rest up to the rolling horizon.
+
+        Returns:
+            Number of refreshed schedules
+        """
+        now = datetime.now(UTC)
+        until = now + settings.UPCOMING_TAKINGS_HORIZON
+        await self._upcoming_takings_repo.delete_before(now)
+
+        refreshed = 0
+        while schedules := await self._schedule_repo.get_not_materialized(
+            now, until, settings.UPCOMING_TAKINGS_BATCH_SIZE
+        ):
+            await self.materialize_takings(schedules, now)
+            refreshed += len(schedules)
+
+        return refreshed
+
+    async def archive_ended_schedules(self) -> int:
+        """
+        Move schedules ended SCHEDULE_ARCHIVE_AFTER ago into the archive in batches,
+        dropping the cached schedules of their users after every batch, so reads including
+        archived schedules do not return them twice.
+
+        Returns:
+            Number of archived schedules, 0 without the archive repository
+        """
+        if self._schedule_archive_repo is None:
+            logger.warning("Schedule archive repository is not set, nothing archived")
+            return 0
+
+        before = datetime.now(UTC) - settings.SCHEDULE_ARCHIVE_AFTER
+        archived = 0
+        while True:
+            moved_by_policy = await self._schedule_archive_repo.archive_ended(
+                before, settings.SCHEDULE_ARCHIVE_BATCH_SIZE
+            )
+            for medicine_policy in moved_by_policy:
+                await self._invalidate_schedule_cache(medicine_policy)
+
+            moved = sum(moved_by_policy.values())
+            archived += moved
+            if moved < settings.SCHEDULE_ARCHIVE_BATCH_SIZE:
+                return archived
+
+    def is_archive_needed(self, since: datetime) -> bool:
+        """Whether schedules overlapping a period from `since` on can be archived"""
+        return (
+            self._schedule_archive_repo is not None
+            and since < datetime.now(UTC) - settings.SCHEDULE_ARCHIVE_AFTER
+        )
+
+    async def _get_cached(
+        self,
+        medicine_policy: int,
+        query: str,
+        load: Callable[[], Awaitable[list[Any] | None]],
+    ) -> list[Any] | None:
+        """
+        Results of a query of a user from the schedule cache, loaded with `load` on a miss.
+        None for an unknown user is not cached.
+        """
+        if self._schedule_cache is None:
+            return await load()
+
+        cached = await self._schedule_cache.get(medicine_policy, query)
+        if cached is not None:
+            return cached
+
+        results = await load()
+        if results is None:
+            return None
+        return await self._schedule_cache.set(medicine_policy, query, results)
+
+    async def get_active_schedules_by_policy(
+        self, medicine_policy: int, since: datetime, until: datetime
+    ) -> list["Schedules | ScheduleRow"]:
+        """
+        Get schedules of a user overlapping [since, until] ordered by id,
+        including the archived ones when the period reaches back far enough
+        """
+        schedules: list[Schedules | ScheduleRow] | None
+        if self._schedule_cache is not None:
+            # Windows starting now differ on every call, the cache keeps the schedules
+            # of the enclosing quarter hours
+            cached_since, cached_until = widen_to_quarter_hours(since, until)
+            schedules = await self._get_cached(
+                medicine_policy,
+                f"active:{cached_since.isoformat()}:{cached_until.isoformat()}",
+                lambda: self._schedule_read_repo.get_active_by_medicine_policy(
+                    medicine_policy, cached_since, cached_until
+                ),
+            )
+            if schedules is not None:
+                schedules = [
+                    schedule
+                    for schedule in schedules
+                    if (schedule.end_date is None or schedule.end_date >= since)
+                    and schedule.start_date <= until
+                ]
+        else:
+            schedules = await self._schedule_read_repo.get_active_by_medicine_policy(
+                medicine_policy, since, until
+            )
+        if schedules is None:
+            raise HTTPException(404, f"User with medicine_policy {medicine_policy} not found")
+
+        if self.is_archive_needed(since):
+            archived = await self._schedule_archive_repo.get_by_medicine_policy(
+                medicine_policy, since, until
+            )
+            return list(merge(schedules, archived, key=lambda schedule: schedule.id))
+        return schedules
+
+    async def get_schedules_ids_by_policy(
+        self,
+        medicine_policy: int,
+        after_id: UUID | None = None,
+        limit: int | None = None,
+        include_archived: bool = False,
+    ) -> list[UUID]:
+        """Get ids of schedules of a user ordered by id, a page after `after_id` if given"""
+        schedule_ids: list[UUID] | None = await self._get_cached(
+            medicine_policy,
+            f"ids:{after_id}:{limit}",
+            lambda: self._schedule_repo.get_ids_by_medicine_policy(
+                medicine_policy, after_id, limit
+            ),
         )
-        if len(users) != 1:
+        if schedule_ids is None:
             raise HTTPException(404, f"User with medicine_policy {medicine_policy} not found")
 
-        return users[0].schedules
+        if include_archived and self._schedule_archive_repo is not None:
+            archived_ids = await self._schedule_archive_repo.get_ids_by_medicine_policy(
+                medicine_policy, after_id, limit
+            )
+            return list(islice(merge(schedule_ids, archived_ids), limit))
+        return schedule_ids
 
-    async def get_schedules_ids_by_policy(self, medicine_policy: int) -> list[UUID]:
-        return [sch.id for sch in await self.get_schedules_by_policy(medicine_policy)]
+    async def get_schedule_by_id(
+        self, medicine_policy: int, schedule_id: UUID, include_archived: bool = False
+    ) -> "Schedules | ScheduleRow | SchedulesArchive":
+        async def load() -> list["Schedules | ScheduleRow"]:
+            schedule = await self._schedule_read_repo.get_by_medicine_policy_and_id(
+                medicine_policy, schedule_id
+            )
+            return [] if schedule is None else [schedule]
+
+        try:
+            schedules = await self._get_cached(medicine_policy, f"id:{schedule_id}", load)
+        except UserNotFoundError as e:
+            raise HTTPException(404, str(e)) from None
 
-    async def get_schedule_by_id(self, medicine_policy: int, schedule_id: UUID) -> "Schedules":
-        user_schedules: list[Schedules] = await self.get_schedules_by_policy(medicine_policy)
-        schedule = [sch for sch in user_schedules if str(sch.id) == str(schedule_id)]
-        if len(schedule) != 1:
+        schedule: Schedules | ScheduleRow | SchedulesArchive | None = next(iter(schedules), None)
+        if schedule is None and include_archived and self._schedule_archive_repo is not None:
+            schedule = await self._schedule_archive_repo.get_by_medicine_policy_and_id(
+                medicine_policy, schedule_id
+            )
+        if schedule is None:
             raise HTTPException(404, f"Schedule with id {schedule_id} not found")
 
-        return schedule[0]
+        return schedule
+
+    async def get_schedule_changes_since(
+        self, medicine_policy: int, since: datetime
+    ) -> list["ScheduleChange"]:
+        """Get schedules of a user created at or after `since`, an unknown user has none"""
+        return await self._schedule_read_repo.get_created_since(medicine_policy, since)
+
+    async def get_user_id_by_policy(self, medicine_policy: int) -> UUID:
+        user = await self._user_repo.get_by_medical_policy(medicine_policy)
+        if user is None:
+            raise HTTPException(404, f"User with medicine_policy {medicine_policy} not found")
+        return user.id
+
+    def stream_schedules(
+        self, batch_size: int, user_id: UUID | None = None
+    ) -> AsyncIterator["Schedules"]:
+        """
+        Iterate over the schedules of a user, or of all users, with their medicine policy
+        from a server-side cursor, so exports do not hold the table in memory
+        """
+        filters = {} if user_id is None else {"user_id": user_id}
+        return self._schedule_repo.stream_all_with_relations(
+            [Relation("user", columns=("medicine_policy",))], batch_size=batch_size, **filters
+        )
+
+    async def iter_next_takings(
+        self,
+        medicine_policy: int,
+        next_takings_interval: timedelta = settings.NEXT_TAKING_TIMING,
+        after: TakingsCursor | None = None,
+        limit: int | None = None,
+        current_time: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        if current_time is None:
+            current_time = datetime.now(UTC)
+        taking_end_time = get_taking_end_time(current_time, next_takings_interval, settings)
+        materialized = await self._upcoming_takings_repo.get_by_medicine_policy(
+            medicine_policy, current_time, taking_end_time, after, limit
+        )
+        if materialized is None:
+            raise HTTPException(404, f"User with medicine_policy {medicine_policy} not found")
+
+        is_complete, takings = materialized
+        if is_complete:
+            return (
+                {"schedule": schedule, "next_taking_time": next_taking_time}
+                for next_taking_time, schedule in takings
+            )
+
+        logger.debug("Upcoming takings are not materialized for the interval, computing them")
+        # Schedules ordered by id keep the resume cursor valid between calls
+        user_schedules: list[Schedules | ScheduleRow] = await self.get_active_schedules_by_policy(
+            medicine_policy, current_time, taking_end_time
+        )
+        return islice(
+            iter_next_takings(
+                user_schedules,
+                next_takings_interval,
+                settings,
+                current_time,
+                after,
+            ),
+            limit,
+        )
 
     async def get_next_takings(
         self,
         medicine_policy: int,
         next_takings_interval: timedelta = settings.NEXT_TAKING_TIMING,
+        limit: int | None = None,
+        after: TakingsCursor | None = None,
     ) -> list[dict[str, Any]]:
-        user_schedules: list[Schedules] = await self.get_schedules_by_policy(medicine_policy)
-        return find_next_takings(
-            user_schedules,
-            next_takings_interval,
-            settings,
+        """Next takings, served from the next takings cache within a quarter hour if given"""
+        current_time = datetime.now(UTC)
+        tick = get_quarter_hour_tick(current_time)
+        params = (next_takings_interval, limit, after)
+        is_cacheable = (
+            self._next_takings_cache is not None
+            and tick is not None
+            and NextTakingsCache.is_cacheable(next_takings_interval)
         )
+        if is_cacheable:
+            takings = self._next_takings_cache.get(medicine_policy, params, tick)
+            if takings is not None:
+                return list(takings)
+
+        takings = list(
+            await self.iter_next_takings(
+                medicine_policy, next_takings_interval, after, limit, current_time
+            )
+        )
+        if is_cacheable:
+            self._next_takings_cache.set(medicine_policy, params, tick, takings)
+        return list(takings)
 
     async def get_next_takings_with_model(
         self,
         medicine_policy: int,
         next_takings_interval: timedelta | None,
+        limit: int | None = None,
+        after: TakingsCursor | None = None,
     ) -> list[SGetNextTakingsResponse]:
         next_takings = await self.get_next_takings(
             medicine_policy,
             next_takings_interval if next_takings_interval else settings.NEXT_TAKING_TIMING,
+            limit,
+            after,
         )
         return [
             SGetNextTakingsResponse(
@@ -142,3 +532,36 @@ class ScheduleService:
             )
             for taking in next_takings
         ]
+
+    async def get_calendar(
+        self, medicine_policy: int, start_date: date, end_date: date
+    ) -> list[dict[str, Any]]:
+        if end_date < start_date:
+            raise HTTPException(422, "end_date must not be earlier than start_date")
+        if (end_date - start_date).days >= settings.CALENDAR_MAX_DAYS:
+            raise HTTPException(
+                422, f"Calendar can not be longer than {settings.CALENDAR_MAX_DAYS} days"
+            )
+
+        user_schedules: list[Schedules | ScheduleRow] = await self.get_active_schedules_by_policy(
+            medicine_policy,
+            datetime.combine(start_date, time(), tzinfo=UTC),
+            datetime.combine(end_date + timedelta(days=1), time(), tzinfo=UTC),
+        )
+        return find_calendar_takings(user_schedules, start_date, end_date, settings)
+
+    async def get_calendar_with_model(
+        self, medicine_policy: int, start_date: date, end_date: date
+    ) -> list[SGetCalendarTakingResponse]:
+        calendar = await self.get_calendar(medicine_policy, start_date, end_date)
+        return [
+            SGetCalendarTakingResponse(
+                medicine_name=taking["schedule"].medicine_name,
+                frequency=taking["schedule"].frequency,
+                start_date=taking["schedule"].start_date,
+                end_date=taking["schedule"].end_date,
+                schedule_id=taking["schedule"].id,
+                taking_time=taking["taking_time"],
+            )
+            for taking in calendar
+        ]
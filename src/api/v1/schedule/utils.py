@@ -1,14 +1,39 @@
-from datetime import UTC, datetime, timedelta
-from typing import TYPE_CHECKING, Any
-
-from src.core.config import Settings
+from bisect import bisect_left
+from collections.abc import Iterator
+from datetime import UTC, datetime, time, timedelta, timezone
+from functools import lru_cache
+import heapq
+import math
+from typing import TYPE_CHECKING, Any, NamedTuple
+from uuid import UUID
+
+from src.core.config import Settings, settings
 from src.core.logger import get_logger
 
 if TYPE_CHECKING:
     from src.database.models.schedules import Schedules
+    from src.repositories.schedule_read_repo import ScheduleRow
 
 logger = get_logger(__name__)
 
+DAY_MICROSECONDS = 24 * 60 * 60 * 1_000_000
+MICROSECOND = timedelta(microseconds=1)
+WALL_CLOCK_EPOCH = datetime(1970, 1, 1)
+
+
+class TakingPattern(NamedTuple):
+    """Allowed taking offsets within one period (lcm of frequency and a day) of a schedule"""
+
+    period: int
+    offsets: tuple[int, ...]
+
+
+class TakingsCursor(NamedTuple):
+    """Position of the last taking a client has received"""
+
+    next_taking_time: datetime
+    schedule_id: UUID
+
 
 def round_to_multiple(value: int, multiple: int = 15) -> int:
     if value <= multiple:
@@ -61,24 +86,201 @@ def round_to_multiple_dt(value: datetime | None, multiple: int = 15) -> datetime
     return result.replace(minute=new_minutes)
 
 
-def find_next_takings(  # noqa: PLR0912
-    schedules: list["Schedules"],
+def time_to_microseconds(value: time) -> int:
+    """Convert a time of day to microseconds since midnight"""
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+
+
+def is_allowed_time(time_of_day: int, morning: int, evening: int) -> bool:
+    """Check that a time of day (in microseconds) lies within the allowed hours"""
+    if evening > morning:
+        return morning <= time_of_day <= evening
+    return time_of_day > morning or time_of_day < evening
+
+
+def steps_to_allowed_time(time_of_day: int, step: int, morning: int, evening: int) -> int:
+    """
+    Count frequency steps needed to leave the night gap in one jump.
+    Returns 0 if the time of day is already allowed. All values are in microseconds.
+    """
+    if is_allowed_time(time_of_day, morning, evening):
+        return 0
+
+    if evening > morning:
+        distance = (morning - time_of_day) % DAY_MICROSECONDS
+    else:
+        distance = morning + 1 - time_of_day
+
+    return max(-(-distance // step), 1)
+
+
+def to_wall_microseconds(value: datetime) -> int:
+    """Convert datetime to wall-clock microseconds since 1970-01-01, ignoring the timezone"""
+    return (value.replace(tzinfo=None) - WALL_CLOCK_EPOCH) // MICROSECOND
+
+
+@lru_cache(maxsize=settings.TAKING_PATTERN_CACHE_SIZE)
+def get_taking_pattern(step: int, phase: int, morning: int, evening: int) -> TakingPattern:
+    """
+    Get allowed taking offsets of a schedule within one period of its daily pattern.
+    All values are in microseconds, phase is the start wall-clock time modulo step.
+    Patterns are memoized with LRU eviction, see get_taking_pattern.cache_info().
+    """
+    period = math.lcm(step, DAY_MICROSECONDS)
+    offsets = tuple(
+        offset
+        for offset in range(phase, period, step)
+        if is_allowed_time(offset % DAY_MICROSECONDS, morning, evening)
+    )
+    return TakingPattern(period=period, offsets=offsets)
+
+
+def iter_pattern_times(pattern: TakingPattern, lower: int, upper: int) -> Iterator[int]:
+    """Yield wall-clock times (in microseconds) of a pattern in [lower, upper] in order"""
+    if not pattern.offsets:
+        return
+
+    period_start = lower - lower % pattern.period
+    index = bisect_left(pattern.offsets, lower - period_start)
+
+    while True:
+        if index == len(pattern.offsets):
+            period_start += pattern.period
+            index = 0
+
+        wall_time = period_start + pattern.offsets[index]
+        if wall_time > upper:
+            return
+
+        yield wall_time
+        index += 1
+
+
+def iter_schedule_takings(
+    schedule: "Schedules | ScheduleRow",
+    current_time: datetime,
+    taking_end_time: datetime,
+    config: Settings,
+) -> Iterator[datetime]:
+    """
+    Yield takings of a single schedule in [current_time, taking_end_time] in time order.
+    The first occurrence is computed arithmetically, the following ones are read from the
+    cached daily pattern (or jump over the night gap in one step for non fixed-offset timezones).
+    """
+    step = timedelta(minutes=schedule.frequency)
+    start_date = schedule.start_date
+
+    if current_time <= start_date <= taking_end_time:
+        logger.debug(f"Schedule starts at {start_date} within search interval")
+        if config.MORNING_TIME <= start_date.time() <= config.EVENING_TIME:
+            yield start_date
+        index = 1
+    else:
+        index = (current_time - start_date) // step + 1
+        # Elapsed time is real time but adding steps is wall-clock arithmetic, which across
+        # a DST change of a non fixed-offset timezone can land at or after current_time
+        if start_date + (index - 1) * step >= current_time:
+            index -= 1
+
+    last_taking_time = taking_end_time
+    if schedule.end_date and schedule.end_date < last_taking_time:
+        last_taking_time = schedule.end_date
+
+    morning = time_to_microseconds(config.MORNING_TIME)
+    evening = time_to_microseconds(config.EVENING_TIME)
+    step_microseconds = schedule.frequency * 60 * 1_000_000
+
+    if isinstance(start_date.tzinfo, timezone):
+        # Fixed UTC offset: wall-clock time maps to real time 1:1, so the cached pattern applies
+        start_wall_time = to_wall_microseconds(start_date)
+        pattern = get_taking_pattern(
+            step_microseconds, start_wall_time % step_microseconds, morning, evening
+        )
+        for wall_time in iter_pattern_times(
+            pattern,
+            start_wall_time + index * step_microseconds,
+            to_wall_microseconds(last_taking_time.astimezone(start_date.tzinfo)),
+        ):
+            yield start_date + timedelta(microseconds=wall_time - start_wall_time)
+        return
+
+    start_time_of_day = time_to_microseconds(start_date.time())
+
+    while True:
+        next_taking_time = start_date + index * step
+        if next_taking_time > last_taking_time:
+            return
+
+        time_of_day = (start_time_of_day + index * step_microseconds) % DAY_MICROSECONDS
+        skip = steps_to_allowed_time(time_of_day, step_microseconds, morning, evening)
+        if skip:
+            index += skip
+            continue
+
+        yield next_taking_time
+        index += 1
+
+
+def get_taking_end_time(
+    current_time: datetime, next_taking_interval: timedelta, config: Settings
+) -> datetime:
+    """End of the next takings search window, never later than the evening of its last day"""
+    taking_end_time: datetime = current_time + next_taking_interval
+
+    evening_time_today = datetime.combine(taking_end_time.date(), config.EVENING_TIME, tzinfo=UTC)
+    return min(taking_end_time, evening_time_today)
+
+
+def find_schedule_takings(
+    schedule: "Schedules | ScheduleRow", since: datetime, until: datetime, config: Settings
+) -> list[datetime]:
+    """Find all takings of a single schedule in [since, until]"""
+    if schedule.end_date and schedule.end_date < since:
+        return []
+    if schedule.start_date > until:
+        return []
+    return list(iter_schedule_takings(schedule, since, until, config))
+
+
+def _iter_positioned_takings(
+    schedule: "Schedules | ScheduleRow",
+    position: int,
+    current_time: datetime,
+    taking_end_time: datetime,
+    config: Settings,
+) -> Iterator[tuple[datetime, int, "Schedules | ScheduleRow"]]:
+    for next_taking_time in iter_schedule_takings(schedule, current_time, taking_end_time, config):
+        yield next_taking_time, position, schedule
+
+
+def iter_next_takings(
+    schedules: list["Schedules | ScheduleRow"],
     next_taking_interval: timedelta,
     config: Settings,
     current_time: datetime | None = None,
-) -> list[dict[str, Any]]:
+    after: TakingsCursor | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Lazily yield next takings in time order by heap-merging per-schedule streams.
+    Takings at the same time keep the order of schedules in the list.
+    If a cursor is given, only takings strictly after it are yielded, within the same window.
+    """
     if current_time is None:
         current_time = datetime.now(UTC)
 
-    taking_end_time: datetime = current_time + next_taking_interval
+    taking_end_time = get_taking_end_time(current_time, next_taking_interval, config)
 
-    evening_time_today = datetime.combine(taking_end_time.date(), config.EVENING_TIME, tzinfo=UTC)
-    taking_end_time = min(taking_end_time, evening_time_today)
+    if after is not None:
+        current_time = max(current_time, after.next_taking_time)
 
-    next_takings: list[dict[str, Any]] = []
+    streams: list[Iterator[tuple[datetime, int, Schedules | ScheduleRow]]] = []
+    cursor_position = -1
 
-    for schedule in schedules:
+    for position, schedule in enumerate(schedules):
         logger.debug(f"Checking schedule {schedule.id}")
+        if after is not None and schedule.id == after.schedule_id:
+            cursor_position = position
+
         if schedule.end_date and schedule.end_date < current_time:
             logger.debug(f"Schedule {schedule.id} has ended")
             continue
@@ -87,58 +289,24 @@ def find_next_takings(  # noqa: PLR0912
             logger.debug(f"Schedule {schedule.id} has not started yet")
             continue
 
-        if schedule.start_date >= current_time and schedule.start_date <= taking_end_time:
-            logger.debug(f"Schedule starts at {schedule.start_date} within search interval")
-            schedule_time = schedule.start_date.time()
-            if config.MORNING_TIME <= schedule_time <= config.EVENING_TIME:
-                next_takings.append({"schedule": schedule, "next_taking_time": schedule.start_date})
-                logger.debug(f"Added first taking at schedule start: {schedule.start_date}")
-            next_taking_time = schedule.start_date + timedelta(minutes=schedule.frequency)
-        else:
-            elapsed_time: float = (current_time - schedule.start_date).total_seconds() / 60
-            intervals_passed: int = int(elapsed_time / schedule.frequency)
-
-            last_taking_time: datetime = schedule.start_date + timedelta(
-                minutes=intervals_passed * schedule.frequency
-            )
-
-            if last_taking_time >= current_time:
-                last_taking_time -= timedelta(minutes=schedule.frequency)
-
-            next_taking_time = last_taking_time + timedelta(minutes=schedule.frequency)
-            logger.debug(f"Schedule already started, next taking time: {next_taking_time}")
-
-        while next_taking_time <= taking_end_time:
-            if schedule.end_date and next_taking_time > schedule.end_date:
-                logger.debug(
-                    f"Next taking time {next_taking_time} is after end date {schedule.end_date}"
-                )
-                break
-
-            next_taking_time_of_day = next_taking_time.time()
-            if config.EVENING_TIME > config.MORNING_TIME:
-                if not (config.MORNING_TIME <= next_taking_time_of_day <= config.EVENING_TIME):
-                    logger.debug(
-                        f"Next taking time {next_taking_time} is not in the allowed hours, searching for next taking"
-                    )
-                    next_taking_time += timedelta(minutes=schedule.frequency)
-                    continue
-            elif not (
-                next_taking_time_of_day > config.MORNING_TIME
-                or next_taking_time_of_day < config.EVENING_TIME
-            ):
-                logger.debug(
-                    f"Next taking time {next_taking_time} is not in the allowed hours, searching for next taking"
-                )
-                next_taking_time += timedelta(minutes=schedule.frequency)
-                continue
-
-            logger.debug(
-                f"Next taking time {next_taking_time} is in the allowed hours, adding to next takings"
-            )
-            next_takings.append({"schedule": schedule, "next_taking_time": next_taking_time})
-
-            next_taking_time += timedelta(minutes=schedule.frequency)
-            logger.debug(f"Next taking time is {next_taking_time}")
-
-    return sorted(next_takings, key=lambda x: x["next_taking_time"])
+        streams.append(
+            _iter_positioned_takings(schedule, position, current_time, taking_end_time, config)
+        )
+
+    for next_taking_time, position, schedule in heapq.merge(*streams):
+        if (
+            after is not None
+            and next_taking_time == after.next_taking_time
+            and position <= cursor_position
+        ):
+            continue
+        yield {"schedule": schedule, "next_taking_time": next_taking_time}
+
+
+def find_next_takings(
+    schedules: list["Schedules | ScheduleRow"],
+    next_taking_interval: timedelta,
+    config: Settings,
+    current_time: datetime | None = None,
+) -> list[dict[str, Any]]:
+    return list(iter_next_takings(schedules, next_taking_interval, config, current_time))
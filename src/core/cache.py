@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import timedelta
+import time
+from typing import Any, Protocol
+
+from redis.asyncio import Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import RedisError
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(Protocol):
+    """
+    Store of cached values under a key and a field, all fields of a key are deleted at once.
+    Keys expire after the TTL of the backend, counted from the first field set.
+    """
+
+    async def get(self, key: str, field: str) -> Any | None: ...
+
+    async def set(self, key: str, field: str, value: Any) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+
+class MemoryCacheBackend:
+    """
+    In-process backend with a TTL and LRU eviction of keys above max_entries.
+    Deleting a key only affects the process, see ScheduleCacheInvalidator.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl: timedelta, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_entries = max_entries
+        self._ttl = ttl.total_seconds()
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    async def get(self, key: str, field: str) -> Any | None:
+        fields = self._get_fields(key)
+        if fields is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return fields.get(field)
+
+    async def set(self, key: str, field: str, value: Any) -> None:
+        fields = self._get_fields(key)
+        if fields is None:
+            fields = {}
+            self._entries[key] = (self._clock() + self._ttl, fields)
+        self._entries.move_to_end(key)
+        fields[field] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get_fields(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+
+class RedisCacheBackend:
+    """
+    Backend on a Redis server shared by all processes, a key is a hash of fields
+    stored with encode and read with decode.
+    Failed reads and writes are logged and make the cache miss, so the service keeps working
+    without the server. Deletes are retried with backoff, since a lost delete serves stale
+    values until the TTL, and raise RedisError when all attempts fail.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: timedelta,
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+        retries: int = 3,
+    ) -> None:
+        self._client = Redis.from_url(url)
+        self._ttl = ttl
+        self._encode = encode
+        self._decode = decode
+        self._retry = Retry(ExponentialBackoff(cap=1, base=0.05), retries)
+
+    async def get(self, key: str, field: str) -> Any | None:
+        try:
+            value = await self._client.hget(key, field)
+        except RedisError as e:
+            logger.warning(f"Redis cache read of {key} failed: {e!r}")
+            return None
+        return self._decode(value) if value is not None else None
+
+    async def set(self, key: str, field: str, value: Any) -> None:
+        try:
+            async with self._client.pipeline(transaction=True) as pipeline:
+                await pipeline.hset(key, field, self._encode(value)).expire(
+                    key, self._ttl, nx=True
+                ).execute()
+        except RedisError as e:
+            logger.warning(f"Redis cache write of {key} failed: {e!r}")
+
+    async def delete(self, key: str) -> None:
+        await self._retry.call_with_retry(lambda: self._client.delete(key), self._on_delete_error)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    @staticmethod
+    async def _on_delete_error(error: RedisError) -> None:
+        logger.warning(f"Redis cache delete failed, retrying: {error!r}")
@@ -1,6 +1,7 @@
 # ruff: noqa: N802
 from datetime import time, timedelta
 from pathlib import Path
+from typing import Literal
 
 from pydantic import PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -26,6 +27,47 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> PostgresDsn:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    # Pool of every engine, the primary and the replica
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: timedelta = timedelta(seconds=30)
+    # Connections older than this are replaced on checkout, never if unset
+    DB_POOL_RECYCLE: timedelta | None = None
+    DB_POOL_PRE_PING: bool = False
+    # asyncpg caches, set both to 0 behind pgbouncer in transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Run-time parameters of every connection, e.g. {"jit": "off"}
+    DB_SERVER_SETTINGS: dict[str, str] = {}
+
+    # Read replica, every unset part is taken from the primary settings above
+    REPLICA_DB_USER: str | None = None
+    REPLICA_DB_PASS: str | None = None
+    REPLICA_DB_HOST: str | None = None
+    REPLICA_DB_PORT: str | None = None
+    REPLICA_DB_NAME: str | None = None
+
+    @property
+    def REPLICA_DATABASE_URL(self) -> PostgresDsn | None:
+        if not any(
+            (
+                self.REPLICA_DB_USER,
+                self.REPLICA_DB_PASS,
+                self.REPLICA_DB_HOST,
+                self.REPLICA_DB_PORT,
+                self.REPLICA_DB_NAME,
+            )
+        ):
+            return None
+        return (
+            f"postgresql+asyncpg://{self.REPLICA_DB_USER or self.DB_USER}"
+            f":{self.REPLICA_DB_PASS or self.DB_PASS}@{self.REPLICA_DB_HOST or self.DB_HOST}"
+            f":{self.REPLICA_DB_PORT or self.DB_PORT}/{self.REPLICA_DB_NAME or self.DB_NAME}"
+        )
+
+    # Reads of a user stay on the primary for this long after the user's schedules were written
+    READ_YOUR_WRITES_WINDOW: timedelta = timedelta(seconds=5)
+
     SQLALCHEMY_ECHO: bool = False
 
     LOG_SENSITIVE_DATA: list[str] = ["name"]
@@ -50,5 +92,41 @@ class Settings(BaseSettings):
     MORNING_TIME: time = time(8, 0)
     EVENING_TIME: time = time(22, 0)
 
+    TAKING_PATTERN_CACHE_SIZE: int = 4096
+
+    UPCOMING_TAKINGS_HORIZON: timedelta = timedelta(days=2)
+    UPCOMING_TAKINGS_REFRESH_INTERVAL: timedelta = timedelta(minutes=15)
+    UPCOMING_TAKINGS_BATCH_SIZE: int = 500
+
+    # Schedules ended this long ago are moved to schedules_archive
+    SCHEDULE_ARCHIVE_AFTER: timedelta = timedelta(days=30)
+    SCHEDULE_ARCHIVE_INTERVAL: timedelta = timedelta(hours=1)
+    SCHEDULE_ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Cached next takings per process, each entry weighs its number of takings plus one
+    NEXT_TAKINGS_CACHE_MAX_WEIGHT: int = 100_000
+
+    # Results of the schedule queries of users, "memory" is per process and relies on
+    # LISTEN for the invalidations of other processes, "redis" is shared by all of them
+    SCHEDULE_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    SCHEDULE_CACHE_TTL: timedelta = timedelta(minutes=1)
+    SCHEDULE_CACHE_MAX_ENTRIES: int = 10_000
+    SCHEDULE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    CALENDAR_MAX_DAYS: int = 93
+
+    BULK_BATCH_SIZE: int = 500
+    BULK_MAX_LINE_SIZE: int = 64 * 1024
+    # Schedules fetched from the cursor and sent per chunk by the NDJSON export
+    EXPORT_BATCH_SIZE: int = 1000
+
+    REMINDER_SINK: Literal["log", "queue", "outbox"] = "log"
+    REMINDER_TICK: timedelta = timedelta(seconds=1)
+    REMINDER_WHEEL_SIZE: int = 3600
+    REMINDER_HORIZON: timedelta = timedelta(days=2)
+
+    # WatchSchedules streams are interrupted when this many schedules are not sent yet
+    SCHEDULE_FEED_MAX_PENDING: int = 1000
+
 
 settings = Settings()
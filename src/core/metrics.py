@@ -0,0 +1,60 @@
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Yields lines of the Prometheus text exposition format
+MetricsCollector = Callable[[], Iterable[str]]
+
+_collectors: list[MetricsCollector] = []
+
+
+def register_collector(collector: MetricsCollector) -> MetricsCollector:
+    _collectors.append(collector)
+    return collector
+
+
+def render_metrics() -> str:
+    """Render the metrics of all registered collectors"""
+    return "".join(f"{line}\n" for collector in _collectors for line in collector())
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def format_sample(name: str, labels: dict[str, str], value: float) -> str:
+    return f"{name}{format_labels(labels)} {value}"
+
+
+def format_header(name: str, metric_type: str, description: str) -> Iterator[str]:
+    yield f"# HELP {name} {description}"
+    yield f"# TYPE {name} {metric_type}"
+
+
+class Histogram:
+    """Histogram with fixed upper bounds of buckets, rendered cumulatively like Prometheus"""
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # The last count is for values above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name: str, labels: dict[str, str]) -> Iterator[str]:
+        cumulative = 0
+        for upper_bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            cumulative += count
+            yield format_sample(f"{name}_bucket", {**labels, "le": str(upper_bound)}, cumulative)
+        yield format_sample(f"{name}_sum", labels, self.sum)
+        yield format_sample(f"{name}_count", labels, cumulative)
@@ -10,6 +10,8 @@ from src.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+STREAMED_MEDIA_TYPES = ("application/x-ndjson",)
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
@@ -56,6 +58,11 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     def get_response_size(response: Response) -> int:
         try:
             response_size = response.headers.get("Content-Length")
+            if response_size is None and response.headers.get("Content-Type") in (
+                STREAMED_MEDIA_TYPES
+            ):
+                # The size of a streamed body is not known in advance
+                return 0
             response_size = int(response_size) if response_size else len(response.body)
 
         except Exception as e:  # noqa: BLE001
@@ -93,8 +100,12 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     @staticmethod
     async def get_context(request: Request) -> dict[str, Any]:
         trace_id = str(uuid.uuid4())
-        body = await request.body()
-        body = body.decode()
+        if request.headers.get("Content-Type", "").split(";")[0] in STREAMED_MEDIA_TYPES:
+            # Reading the body here would load the whole stream into memory
+            body = "<stream>"
+        else:
+            body = await request.body()
+            body = body.decode()
 
         return {
             "trace_id": trace_id,
@@ -1,12 +1,50 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable, Hashable
+from datetime import timedelta
+from functools import partial
+import time
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from src.core.config import settings
+from src.core.metrics import register_collector
+from src.database.pool import MeteredAsyncAdaptedQueuePool, collect_pool_metrics
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """Engine with the pool and asyncpg settings"""
+    return create_async_engine(
+        url,
+        echo=settings.SQLALCHEMY_ECHO,
+        future=True,
+        poolclass=MeteredAsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT.total_seconds(),
+        pool_recycle=settings.DB_POOL_RECYCLE.total_seconds() if settings.DB_POOL_RECYCLE else -1,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+            "server_settings": {
+                "application_name": settings.APP_NAME,
+                **settings.DB_SERVER_SETTINGS,
+            },
+        },
+    )
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.SQLALCHEMY_ECHO, future=True)
+engine = create_engine(settings.DATABASE_URL)
+replica_engine = (
+    create_engine(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else engine
+)
+register_collector(partial(collect_pool_metrics, {"primary": engine, "replica": replica_engine}))
 
 AsyncSessionMaker = async_sessionmaker(
     engine,
@@ -14,6 +52,65 @@ AsyncSessionMaker = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+ReplicaSessionMaker = (
+    async_sessionmaker(
+        replica_engine,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+    if replica_engine is not engine
+    else AsyncSessionMaker
+)
+
+
+class SessionRouter:
+    """
+    Chooses the primary or the replica session maker for read-only work.
+    Reads of a key (medicine policy) written within the read-your-writes window
+    stay on the primary, so a client sees its own writes despite replication lag.
+    Written keys are tracked in the memory of the process.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replica: async_sessionmaker[AsyncSession],
+        sticky_window: timedelta,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self._sticky_window = sticky_window.total_seconds()
+        self._clock = clock
+        # Ordered by write time, so expired keys are at the front
+        self._written_at: dict[Hashable, float] = {}
+
+    def mark_written(self, key: Hashable) -> None:
+        if self.replica is self.primary:
+            return
+
+        now = self._clock()
+        self._written_at.pop(key, None)
+        self._written_at[key] = now
+        while self._written_at:
+            oldest_key, oldest_written_at = next(iter(self._written_at.items()))
+            if oldest_written_at + self._sticky_window > now:
+                break
+            del self._written_at[oldest_key]
+
+    def is_sticky(self, key: Hashable) -> bool:
+        written_at = self._written_at.get(key)
+        return written_at is not None and self._clock() < written_at + self._sticky_window
+
+    def get_reader(self, key: Hashable) -> async_sessionmaker[AsyncSession]:
+        """Session maker for read-only work on the data of the key"""
+        return self.primary if self.is_sticky(key) else self.replica
+
+
+session_router = SessionRouter(
+    AsyncSessionMaker, ReplicaSessionMaker, settings.READ_YOUR_WRITES_WINDOW
+)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -1,9 +1,15 @@
 from src.database.models.base_model import BaseModel
+from src.database.models.reminder_outbox import ReminderOutbox
 from src.database.models.schedules import Schedules
+from src.database.models.schedules_archive import SchedulesArchive
+from src.database.models.upcoming_takings import UpcomingTakings
 from src.database.models.users import Users
 
 __all__ = [
     "BaseModel",
+    "ReminderOutbox",
     "Schedules",
+    "SchedulesArchive",
+    "UpcomingTakings",
     "Users",
 ]
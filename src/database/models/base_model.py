@@ -1,12 +1,12 @@
-from datetime import datetime
+from datetime import UTC, datetime
 
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase
 
 
 def get_datetime_UTC() -> datetime:  # noqa: N802
-    """Get current UTC datetime"""
-    return datetime.now()
+    """Get current UTC datetime, naive like the columns it fills"""
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 class BaseModel(AsyncAttrs, DeclarativeBase):
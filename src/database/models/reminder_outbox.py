@@ -0,0 +1,36 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.models.base_model import BaseModel, get_datetime_UTC
+
+
+class ReminderOutbox(BaseModel):
+    """Due takings emitted by the reminder dispatcher, waiting to be delivered"""
+
+    __tablename__ = "reminder_outbox"
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "taking_time"),
+        Index("ix_reminder_outbox_user_id", "user_id"),
+    )
+
+    repr_cols = ("schedule_id", "taking_time")
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
+    )
+
+    schedule_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("schedules.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+
+    medicine_name: Mapped[str] = mapped_column(nullable=False)
+    taking_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(nullable=False, default=get_datetime_UTC)
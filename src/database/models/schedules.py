@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 import uuid
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,11 +14,23 @@ if TYPE_CHECKING:
 
 class Schedules(BaseModel):
     __tablename__ = "schedules"
+    __table_args__ = (
+        Index("ix_schedules_user_id_start_date_end_date", "user_id", "start_date", "end_date"),
+        # keyset pagination over the ids of a user's schedules
+        Index("ix_schedules_user_id_id", "user_id", "id"),
+        Index("ix_schedules_end_date", "end_date"),
+        # open-ended schedules never match the end_date range scans above
+        Index(
+            "ix_schedules_start_date_open_ended",
+            "start_date",
+            postgresql_where=text("end_date IS NULL"),
+        ),
+    )
 
     repr_cols = ("id", "medicine_name")
 
     id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
     )
 
     user_id: Mapped[UUID] = mapped_column(
@@ -31,6 +43,11 @@ class Schedules(BaseModel):
     start_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
     end_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True)
 
+    # upcoming_takings are filled up to this time
+    takings_materialized_until: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
+
     created_at: Mapped[datetime] = mapped_column(nullable=False, default=get_datetime_UTC)
 
     user: Mapped["Users"] = relationship("Users", back_populates="schedules")
@@ -0,0 +1,34 @@
+from datetime import datetime
+import uuid
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database.models.base_model import BaseModel, get_datetime_UTC
+
+
+class SchedulesArchive(BaseModel):
+    """Schedules moved out of schedules long after they ended, with the same columns"""
+
+    __tablename__ = "schedules_archive"
+    __table_args__ = (Index("ix_schedules_archive_user_id_id", "user_id", "id"),)
+
+    repr_cols = ("id", "medicine_name")
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+    )
+
+    medicine_name: Mapped[str] = mapped_column(nullable=False)
+    frequency: Mapped[int] = mapped_column(nullable=False)
+
+    start_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    end_date: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(nullable=False, default=get_datetime_UTC)
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+import uuid
+
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database.models.base_model import BaseModel
+
+if TYPE_CHECKING:
+    from src.database.models.schedules import Schedules
+
+
+class UpcomingTakings(BaseModel):
+    """Materialized takings of active schedules, kept a rolling horizon ahead"""
+
+    __tablename__ = "upcoming_takings"
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "taking_time"),
+        Index("ix_upcoming_takings_user_id_taking_time", "user_id", "taking_time"),
+    )
+
+    repr_cols = ("schedule_id", "taking_time")
+
+    id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
+    )
+
+    schedule_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("schedules.id", ondelete="CASCADE"), nullable=False
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+
+    taking_time: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+
+    schedule: Mapped["Schedules"] = relationship("Schedules")
@@ -17,7 +17,7 @@ class Users(BaseModel):
     repr_cols = ("id", "name")
 
     id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
     )
     medicine_policy: Mapped[int] = mapped_column(nullable=False, unique=True)
     name: Mapped[str] = mapped_column(nullable=True)
@@ -0,0 +1,61 @@
+from collections.abc import Iterator
+import time
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from src.core.metrics import Histogram, format_header, format_sample
+
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MeteredAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long checkouts wait for a connection"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+    def recreate(self) -> "MeteredAsyncAdaptedQueuePool":
+        # Engine.dispose() replaces the pool, the histogram is kept
+        pool = super().recreate()
+        pool.wait_time = self.wait_time
+        return pool
+
+
+def collect_pool_metrics(engines: dict[str, AsyncEngine]) -> Iterator[str]:
+    """Pool metrics of the engines labeled by name, an engine listed twice is reported once"""
+    pools: dict[str, AsyncAdaptedQueuePool] = {}
+    for name, engine in engines.items():
+        if engine.pool not in pools.values():
+            pools[name] = engine.pool
+
+    gauges = (
+        ("db_pool_size", "Configured number of persistent connections", "size"),
+        ("db_pool_checked_in", "Idle connections in the pool", "checkedin"),
+        ("db_pool_checked_out", "Connections in use", "checkedout"),
+        (
+            "db_pool_overflow",
+            "Connections above the pool size, negative if not all opened",
+            "overflow",
+        ),
+    )
+    for metric_name, description, method in gauges:
+        yield from format_header(metric_name, "gauge", description)
+        for name, pool in pools.items():
+            yield format_sample(metric_name, {"pool": name}, getattr(pool, method)())
+
+    yield from format_header(
+        "db_pool_wait_seconds", "histogram", "Time spent waiting for a pooled connection"
+    )
+    for name, pool in pools.items():
+        if isinstance(pool, MeteredAsyncAdaptedQueuePool):
+            yield from pool.wait_time.render("db_pool_wait_seconds", {"pool": name})
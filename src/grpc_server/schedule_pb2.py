@@ -22,7 +22,7 @@ from google.protobuf import duration_pb2 as google_dot_protobuf_dot_duration__pb
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n\x0eschedule.proto\x12\x08schedule\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1egoogle/protobuf/duration.proto"\xb9\x02\n\x15\x43reateScheduleRequest\x12\x11\n\x04name\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x17\n\x0fmedicine_policy\x18\x02 \x01(\x05\x12\x15\n\rmedicine_name\x18\x03 \x01(\t\x12\x11\n\tfrequency\x18\x04 \x01(\x05\x12\x33\n\nstart_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x31\n\x08\x65nd_date\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12\x30\n\x08\x64uration\x18\x07 \x01(\x0b\x32\x19.google.protobuf.DurationH\x03\x88\x01\x01\x42\x07\n\x05_nameB\r\n\x0b_start_dateB\x0b\n\t_end_dateB\x0b\n\t_duration"$\n\x16\x43reateScheduleResponse\x12\n\n\x02id\x18\x01 \x01(\t")\n\x16GetSchedulesIdsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05"/\n\x17GetSchedulesIdsResponse\x12\x14\n\x0cschedule_ids\x18\x01 \x03(\t":\n\x12GetScheduleRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x13\n\x0bschedule_id\x18\x02 \x01(\t"\xbc\x01\n\x0cScheduleInfo\x12\x15\n\rmedicine_name\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x05\x12\x33\n\nstart_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x12\x31\n\x08\x65nd_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x42\r\n\x0b_start_dateB\x0b\n\t_end_date"?\n\x13GetScheduleResponse\x12(\n\x08schedule\x18\x01 \x01(\x0b\x32\x16.schedule.ScheduleInfo"\x81\x01\n\x15GetNextTakingsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12=\n\x15next_takings_interval\x18\x02 \x01(\x0b\x32\x19.google.protobuf.DurationH\x00\x88\x01\x01\x42\x18\n\x16_next_takings_interval"u\n\x0eNextTakingInfo\x12-\n\rschedule_info\x18\x01 \x01(\x0b\x32\x16.schedule.ScheduleInfo\x12\x34\n\x10next_taking_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp"C\n\x16GetNextTakingsResponse\x12)\n\x07takings\x18\x01 \x03(\x0b\x32\x18.schedule.NextTakingInfo2\xdf\x02\n\x0fScheduleService\x12S\n\x0e\x43reateSchedule\x12\x1f.schedule.CreateScheduleRequest\x1a .schedule.CreateScheduleResponse\x12V\n\x0fGetSchedulesIds\x12 .schedule.GetSchedulesIdsRequest\x1a!.schedule.GetSchedulesIdsResponse\x12J\n\x0bGetSchedule\x12\x1c.schedule.GetScheduleRequest\x1a\x1d.schedule.GetScheduleResponse\x12S\n\x0eGetNextTakings\x12\x1f.schedule.GetNextTakingsRequest\x1a .schedule.GetNextTakingsResponseb\x06proto3'
+    b'\n\x0eschedule.proto\x12\x08schedule\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1egoogle/protobuf/duration.proto"\xb9\x02\n\x15\x43reateScheduleRequest\x12\x11\n\x04name\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x17\n\x0fmedicine_policy\x18\x02 \x01(\x05\x12\x15\n\rmedicine_name\x18\x03 \x01(\t\x12\x11\n\tfrequency\x18\x04 \x01(\x05\x12\x33\n\nstart_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x31\n\x08\x65nd_date\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12\x30\n\x08\x64uration\x18\x07 \x01(\x0b\x32\x19.google.protobuf.DurationH\x03\x88\x01\x01\x42\x07\n\x05_nameB\r\n\x0b_start_dateB\x0b\n\t_end_dateB\x0b\n\t_duration"$\n\x16\x43reateScheduleResponse\x12\n\n\x02id\x18\x01 \x01(\t"\x9f\x01\n\x16GetSchedulesIdsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x15\n\x08\x61\x66ter_id\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x12\n\x05limit\x18\x03 \x01(\x05H\x01\x88\x01\x01\x12\x1d\n\x10include_archived\x18\x04 \x01(\x08H\x02\x88\x01\x01\x42\x0b\n\t_after_idB\x08\n\x06_limitB\x13\n\x11_include_archived"/\n\x17GetSchedulesIdsResponse\x12\x14\n\x0cschedule_ids\x18\x01 \x03(\t"n\n\x12GetScheduleRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12\x13\n\x0bschedule_id\x18\x02 \x01(\t\x12\x1d\n\x10include_archived\x18\x03 \x01(\x08H\x00\x88\x01\x01\x42\x13\n\x11_include_archived"\xbc\x01\n\x0cScheduleInfo\x12\x15\n\rmedicine_name\x18\x01 \x01(\t\x12\x11\n\tfrequency\x18\x02 \x01(\x05\x12\x33\n\nstart_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x12\x31\n\x08\x65nd_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x42\r\n\x0b_start_dateB\x0b\n\t_end_date"?\n\x13GetScheduleResponse\x12(\n\x08schedule\x18\x01 \x01(\x0b\x32\x16.schedule.ScheduleInfo"\x99\x02\n\x15GetNextTakingsRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12=\n\x15next_takings_interval\x18\x02 \x01(\x0b\x32\x19.google.protobuf.DurationH\x00\x88\x01\x01\x12\x12\n\x05limit\x18\x03 \x01(\x05H\x01\x88\x01\x01\x12\x33\n\nafter_time\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12\x1e\n\x11\x61\x66ter_schedule_id\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\x18\n\x16_next_takings_intervalB\x08\n\x06_limitB\r\n\x0b_after_timeB\x14\n\x12_after_schedule_id"\x8a\x01\n\x0eNextTakingInfo\x12-\n\rschedule_info\x18\x01 \x01(\x0b\x32\x16.schedule.ScheduleInfo\x12\x34\n\x10next_taking_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x13\n\x0bschedule_id\x18\x03 \x01(\t"C\n\x16GetNextTakingsResponse\x12)\n\x07takings\x18\x01 \x03(\x0b\x32\x18.schedule.NextTakingInfo"\x83\x01\n\x12GetCalendarRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12.\n\nstart_date\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08\x65nd_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp"\x89\x01\n\x12\x43\x61lendarTakingInfo\x12-\n\rschedule_info\x18\x01 \x01(\x0b\x32\x16.schedule.ScheduleInfo\x12/\n\x0btaking_time\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x13\n\x0bschedule_id\x18\x03 \x01(\t"D\n\x13GetCalendarResponse\x12-\n\x07takings\x18\x01 \x03(\x0b\x32\x1c.schedule.CalendarTakingInfo"b\n\x15WatchSchedulesRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\x05\x12.\n\x05since\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x42\x08\n\x06_since"~\n\rScheduleEvent\x12\x13\n\x0bschedule_id\x18\x01 \x01(\t\x12(\n\x08schedule\x18\x02 \x01(\x0b\x32\x16.schedule.ScheduleInfo\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp2\xf9\x03\n\x0fScheduleService\x12S\n\x0e\x43reateSchedule\x12\x1f.schedule.CreateScheduleRequest\x1a .schedule.CreateScheduleResponse\x12V\n\x0fGetSchedulesIds\x12 .schedule.GetSchedulesIdsRequest\x1a!.schedule.GetSchedulesIdsResponse\x12J\n\x0bGetSchedule\x12\x1c.schedule.GetScheduleRequest\x1a\x1d.schedule.GetScheduleResponse\x12S\n\x0eGetNextTakings\x12\x1f.schedule.GetNextTakingsRequest\x1a .schedule.GetNextTakingsResponse\x12J\n\x0bGetCalendar\x12\x1c.schedule.GetCalendarRequest\x1a\x1d.schedule.GetCalendarResponse\x12L\n\x0eWatchSchedules\x12\x1f.schedule.WatchSchedulesRequest\x1a\x17.schedule.ScheduleEvent0\x01\x62\x06proto3'
 )
 
 _globals = globals()
@@ -34,22 +34,32 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_CREATESCHEDULEREQUEST"]._serialized_end = 407
     _globals["_CREATESCHEDULERESPONSE"]._serialized_start = 409
     _globals["_CREATESCHEDULERESPONSE"]._serialized_end = 445
-    _globals["_GETSCHEDULESIDSREQUEST"]._serialized_start = 447
-    _globals["_GETSCHEDULESIDSREQUEST"]._serialized_end = 488
-    _globals["_GETSCHEDULESIDSRESPONSE"]._serialized_start = 490
-    _globals["_GETSCHEDULESIDSRESPONSE"]._serialized_end = 537
-    _globals["_GETSCHEDULEREQUEST"]._serialized_start = 539
-    _globals["_GETSCHEDULEREQUEST"]._serialized_end = 597
-    _globals["_SCHEDULEINFO"]._serialized_start = 600
-    _globals["_SCHEDULEINFO"]._serialized_end = 788
-    _globals["_GETSCHEDULERESPONSE"]._serialized_start = 790
-    _globals["_GETSCHEDULERESPONSE"]._serialized_end = 853
-    _globals["_GETNEXTTAKINGSREQUEST"]._serialized_start = 856
-    _globals["_GETNEXTTAKINGSREQUEST"]._serialized_end = 985
-    _globals["_NEXTTAKINGINFO"]._serialized_start = 987
-    _globals["_NEXTTAKINGINFO"]._serialized_end = 1104
-    _globals["_GETNEXTTAKINGSRESPONSE"]._serialized_start = 1106
-    _globals["_GETNEXTTAKINGSRESPONSE"]._serialized_end = 1173
-    _globals["_SCHEDULESERVICE"]._serialized_start = 1176
-    _globals["_SCHEDULESERVICE"]._serialized_end = 1527
+    _globals["_GETSCHEDULESIDSREQUEST"]._serialized_start = 448
+    _globals["_GETSCHEDULESIDSREQUEST"]._serialized_end = 607
+    _globals["_GETSCHEDULESIDSRESPONSE"]._serialized_start = 609
+    _globals["_GETSCHEDULESIDSRESPONSE"]._serialized_end = 656
+    _globals["_GETSCHEDULEREQUEST"]._serialized_start = 658
+    _globals["_GETSCHEDULEREQUEST"]._serialized_end = 768
+    _globals["_SCHEDULEINFO"]._serialized_start = 771
+    _globals["_SCHEDULEINFO"]._serialized_end = 959
+    _globals["_GETSCHEDULERESPONSE"]._serialized_start = 961
+    _globals["_GETSCHEDULERESPONSE"]._serialized_end = 1024
+    _globals["_GETNEXTTAKINGSREQUEST"]._serialized_start = 1027
+    _globals["_GETNEXTTAKINGSREQUEST"]._serialized_end = 1308
+    _globals["_NEXTTAKINGINFO"]._serialized_start = 1311
+    _globals["_NEXTTAKINGINFO"]._serialized_end = 1449
+    _globals["_GETNEXTTAKINGSRESPONSE"]._serialized_start = 1451
+    _globals["_GETNEXTTAKINGSRESPONSE"]._serialized_end = 1518
+    _globals["_GETCALENDARREQUEST"]._serialized_start = 1521
+    _globals["_GETCALENDARREQUEST"]._serialized_end = 1652
+    _globals["_CALENDARTAKINGINFO"]._serialized_start = 1655
+    _globals["_CALENDARTAKINGINFO"]._serialized_end = 1792
+    _globals["_GETCALENDARRESPONSE"]._serialized_start = 1794
+    _globals["_GETCALENDARRESPONSE"]._serialized_end = 1862
+    _globals["_WATCHSCHEDULESREQUEST"]._serialized_start = 1864
+    _globals["_WATCHSCHEDULESREQUEST"]._serialized_end = 1962
+    _globals["_SCHEDULEEVENT"]._serialized_start = 1964
+    _globals["_SCHEDULEEVENT"]._serialized_end = 2090
+    _globals["_SCHEDULESERVICE"]._serialized_start = 2093
+    _globals["_SCHEDULESERVICE"]._serialized_end = 2598
 # @@protoc_insertion_point(module_scope)
@@ -59,6 +59,18 @@ class ScheduleServiceStub(object):
             response_deserializer=schedule__pb2.GetNextTakingsResponse.FromString,
             _registered_method=True,
         )
+        self.GetCalendar = channel.unary_unary(
+            "/schedule.ScheduleService/GetCalendar",
+            request_serializer=schedule__pb2.GetCalendarRequest.SerializeToString,
+            response_deserializer=schedule__pb2.GetCalendarResponse.FromString,
+            _registered_method=True,
+        )
+        self.WatchSchedules = channel.unary_stream(
+            "/schedule.ScheduleService/WatchSchedules",
+            request_serializer=schedule__pb2.WatchSchedulesRequest.SerializeToString,
+            response_deserializer=schedule__pb2.ScheduleEvent.FromString,
+            _registered_method=True,
+        )
 
 
 class ScheduleServiceServicer(object):
@@ -88,6 +100,18 @@ class ScheduleServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetCalendar(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def WatchSchedules(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_ScheduleServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -111,6 +135,16 @@ def add_ScheduleServiceServicer_to_server(servicer, server):
             request_deserializer=schedule__pb2.GetNextTakingsRequest.FromString,
             response_serializer=schedule__pb2.GetNextTakingsResponse.SerializeToString,
         ),
+        "GetCalendar": grpc.unary_unary_rpc_method_handler(
+            servicer.GetCalendar,
+            request_deserializer=schedule__pb2.GetCalendarRequest.FromString,
+            response_serializer=schedule__pb2.GetCalendarResponse.SerializeToString,
+        ),
+        "WatchSchedules": grpc.unary_stream_rpc_method_handler(
+            servicer.WatchSchedules,
+            request_deserializer=schedule__pb2.WatchSchedulesRequest.FromString,
+            response_serializer=schedule__pb2.ScheduleEvent.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "schedule.ScheduleService", rpc_method_handlers
@@ -242,3 +276,63 @@ class ScheduleService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def GetCalendar(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/schedule.ScheduleService/GetCalendar",
+            schedule__pb2.GetCalendarRequest.SerializeToString,
+            schedule__pb2.GetCalendarResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def WatchSchedules(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/schedule.ScheduleService/WatchSchedules",
+            schedule__pb2.WatchSchedulesRequest.SerializeToString,
+            schedule__pb2.ScheduleEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -1,15 +1,22 @@
 # ruff: noqa: N802
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, AsyncIterator
 from contextlib import asynccontextmanager
+from uuid import UUID
 
-from grpc import ServicerContext
+from grpc import ServicerContext, StatusCode
 
+from src.api.v1.schedule.dependencies import make_schedule_service
 from src.api.v1.schedule.schemas import SScheduleCreateRequest
 from src.api.v1.schedule.service import ScheduleService
-from src.database.connection import AsyncSessionMaker
+from src.api.v1.schedule.utils import TakingsCursor
+from src.core.config import settings
+from src.database import connection
 from src.grpc_server.schedule_pb2 import (
+    CalendarTakingInfo,
     CreateScheduleRequest,
     CreateScheduleResponse,
+    GetCalendarRequest,
+    GetCalendarResponse,
     GetNextTakingsRequest,
     GetNextTakingsResponse,
     GetScheduleRequest,
@@ -17,7 +24,9 @@ from src.grpc_server.schedule_pb2 import (
     GetSchedulesIdsRequest,
     GetSchedulesIdsResponse,
     NextTakingInfo,
+    ScheduleEvent,
     ScheduleInfo,
+    WatchSchedulesRequest,
 )
 from src.grpc_server.schedule_pb2_grpc import ScheduleServiceServicer
 from src.grpc_server.servicers.utils import (
@@ -25,7 +34,21 @@ from src.grpc_server.servicers.utils import (
     convert_from_timestamp,
     convert_to_timestamp,
 )
-from src.repositories import ScheduleRepository, UserRepository
+from src.repositories import ScheduleChange
+from src.workers.schedule_feed import ScheduleFeedInterruptedError, schedule_feed
+
+
+def make_schedule_event(change: ScheduleChange) -> ScheduleEvent:
+    return ScheduleEvent(
+        schedule_id=str(change.schedule.id),
+        schedule=ScheduleInfo(
+            medicine_name=change.schedule.medicine_name,
+            frequency=change.schedule.frequency,
+            start_date=convert_to_timestamp(change.schedule.start_date),
+            end_date=convert_to_timestamp(change.schedule.end_date),
+        ),
+        created_at=convert_to_timestamp(change.created_at),
+    )
 
 
 class ScheduleServicer(ScheduleServiceServicer):
@@ -34,12 +57,23 @@ class ScheduleServicer(ScheduleServiceServicer):
         self.service: ScheduleService | None = schedule_service
 
     @asynccontextmanager
-    async def get_service(self) -> AsyncGenerator[ScheduleService, None]:
+    async def get_service(
+        self, read_medicine_policy: int | None = None
+    ) -> AsyncGenerator[ScheduleService, None]:
+        """
+        Service on a primary session, or for read_medicine_policy on a session
+        from the replica unless the user wrote recently
+        """
         if self.service is None:
-            async with AsyncSessionMaker() as session:
-                user_repo: UserRepository = UserRepository(session)
-                schedule_repo: ScheduleRepository = ScheduleRepository(session)
-                yield ScheduleService(user_repo=user_repo, schedule_repo=schedule_repo)
+            session_maker = (
+                connection.session_router.get_reader(read_medicine_policy)
+                if read_medicine_policy is not None
+                else connection.AsyncSessionMaker
+            )
+            async with session_maker() as session:
+                yield make_schedule_service(session)
+        else:
+            yield self.service
 
     async def CreateSchedule(
         self, request: CreateScheduleRequest, _context: ServicerContext
@@ -60,8 +94,10 @@ class ScheduleServicer(ScheduleServiceServicer):
     async def GetSchedule(
         self, request: GetScheduleRequest, _context: ServicerContext
     ) -> GetScheduleResponse:
-        async with self.get_service() as service:
-            response = await service.get_schedule_by_id(request.user_id, request.schedule_id)
+        async with self.get_service(request.user_id) as service:
+            response = await service.get_schedule_by_id(
+                request.user_id, UUID(request.schedule_id), request.include_archived
+            )
         return GetScheduleResponse(
             schedule=ScheduleInfo(
                 medicine_name=response.medicine_name,
@@ -74,17 +110,46 @@ class ScheduleServicer(ScheduleServiceServicer):
     async def GetSchedulesIds(
         self, request: GetSchedulesIdsRequest, _context: ServicerContext
     ) -> GetSchedulesIdsResponse:
-        async with self.get_service() as service:
-            response = await service.get_schedules_ids_by_policy(request.user_id)
+        async with self.get_service(request.user_id) as service:
+            response = await service.get_schedules_ids_by_policy(
+                request.user_id,
+                UUID(request.after_id) if request.HasField("after_id") else None,
+                request.limit if request.HasField("limit") else None,
+                request.include_archived,
+            )
         return GetSchedulesIdsResponse(schedule_ids=[str(schedule_id) for schedule_id in response])
 
     async def GetNextTakings(
-        self, request: GetNextTakingsRequest, _context: ServicerContext
+        self, request: GetNextTakingsRequest, context: ServicerContext
     ) -> GetNextTakingsResponse:
-        async with self.get_service() as service:
+        after = None
+        if request.HasField("after_time") or request.HasField("after_schedule_id"):
+            if not (request.HasField("after_time") and request.HasField("after_schedule_id")):
+                await context.abort(
+                    StatusCode.INVALID_ARGUMENT,
+                    "after_time and after_schedule_id must be provided together",
+                )
+            try:
+                after_schedule_id = UUID(request.after_schedule_id)
+            except ValueError:
+                await context.abort(
+                    StatusCode.INVALID_ARGUMENT, "after_schedule_id must be a valid UUID"
+                )
+            after = TakingsCursor(convert_from_timestamp(request, "after_time"), after_schedule_id)
+
+        next_takings_interval = (
+            convert_from_duration(request, "next_takings_interval")
+            if request.HasField("next_takings_interval")
+            else settings.NEXT_TAKING_TIMING
+        )
+        async with self.get_service(request.user_id) as service:
             response = await service.get_next_takings(
-                request.user_id, request.next_takings_interval
+                request.user_id,
+                next_takings_interval,
+                request.limit if request.HasField("limit") else None,
+                after,
             )
+
         takings = []
         for taking in response:
             schedule_info = ScheduleInfo(
@@ -97,8 +162,67 @@ class ScheduleServicer(ScheduleServiceServicer):
             taking_info = NextTakingInfo(
                 schedule_info=schedule_info,
                 next_taking_time=convert_to_timestamp(taking["next_taking_time"]),
+                schedule_id=str(taking["schedule"].id),
             )
 
             takings.append(taking_info)
 
         return GetNextTakingsResponse(takings=takings)
+
+    async def GetCalendar(
+        self, request: GetCalendarRequest, _context: ServicerContext
+    ) -> GetCalendarResponse:
+        async with self.get_service(request.user_id) as service:
+            response = await service.get_calendar(
+                request.user_id,
+                convert_from_timestamp(request, "start_date").date(),
+                convert_from_timestamp(request, "end_date").date(),
+            )
+
+        takings = []
+        for taking in response:
+            schedule_info = ScheduleInfo(
+                medicine_name=taking["schedule"].medicine_name,
+                frequency=taking["schedule"].frequency,
+                start_date=convert_to_timestamp(taking["schedule"].start_date),
+                end_date=convert_to_timestamp(taking["schedule"].end_date),
+            )
+
+            taking_info = CalendarTakingInfo(
+                schedule_info=schedule_info,
+                taking_time=convert_to_timestamp(taking["taking_time"]),
+                schedule_id=str(taking["schedule"].id),
+            )
+
+            takings.append(taking_info)
+
+        return GetCalendarResponse(takings=takings)
+
+    async def WatchSchedules(
+        self, request: WatchSchedulesRequest, context: ServicerContext
+    ) -> AsyncIterator[ScheduleEvent]:
+        """
+        Stream schedules of a user created since `since`, then the new ones as they are created.
+        Subscribes before the catch-up query, so no schedule falls between the two.
+        """
+        async with schedule_feed.subscribe(request.user_id) as subscription:
+            sent: set[UUID] = set()
+            if request.HasField("since"):
+                # The primary, the replica may lag behind the notifications
+                async with self.get_service() as service:
+                    changes = await service.get_schedule_changes_since(
+                        request.user_id, convert_from_timestamp(request, "since")
+                    )
+                for change in changes:
+                    sent.add(change.schedule.id)
+                    yield make_schedule_event(change)
+
+            try:
+                async for change in subscription:
+                    if change.schedule.id not in sent:
+                        yield make_schedule_event(change)
+            except ScheduleFeedInterruptedError:
+                await context.abort(
+                    StatusCode.UNAVAILABLE,
+                    "Schedule feed was interrupted, resume from the last created_at",
+                )
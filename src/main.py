@@ -3,11 +3,20 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from src.api.metrics import router as metrics_router
 from src.api.v1 import v1_router
+from src.api.v1.schedule.cache import schedule_cache
 from src.core.config import settings
 from src.core.logger import get_logger
 from src.core.middleware import RequestLoggingMiddleware
 from src.grpc_server.server import GRPCServer
+from src.workers import (
+    ScheduleArchiver,
+    ScheduleCacheInvalidator,
+    UpcomingTakingsRefresher,
+    reminder_dispatcher,
+    schedule_feed,
+)
 
 logger = get_logger(__name__)
 
@@ -19,9 +28,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # noqa: ARG001
     logger.info(f"OpenAPI docs: {base_path}/docs")
     grpc_server = GRPCServer(settings.GRPC_SERVER_PORT)
     await grpc_server.start()
+    upcoming_takings_refresher = UpcomingTakingsRefresher()
+    await upcoming_takings_refresher.start()
+    await reminder_dispatcher.start()
+    schedule_archiver = ScheduleArchiver()
+    await schedule_archiver.start()
+    schedule_cache_invalidator = None
+    if ScheduleCacheInvalidator.is_needed(schedule_cache):
+        schedule_cache_invalidator = ScheduleCacheInvalidator(schedule_cache)
+        await schedule_cache_invalidator.start()
     yield
     logger.warning("Stopping app...")
+    if schedule_cache_invalidator is not None:
+        await schedule_cache_invalidator.stop()
+    await schedule_archiver.stop()
+    await reminder_dispatcher.stop()
+    await upcoming_takings_refresher.stop()
     await grpc_server.stop()
+    await schedule_feed.stop()
 
 
 app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
@@ -29,6 +53,7 @@ app = FastAPI(title=settings.APP_NAME, debug=settings.DEBUG, lifespan=lifespan)
 app.add_middleware(RequestLoggingMiddleware)
 
 app.include_router(v1_router)
+app.include_router(metrics_router)
 
 if __name__ == "__main__":
     import uvicorn
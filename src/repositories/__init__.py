@@ -1,4 +1,27 @@
+from src.repositories.base_repo import LoadStrategy, Relation
+from src.repositories.reminder_outbox_repo import ReminderOutboxRepository
+from src.repositories.schedule_archive_repo import ScheduleArchiveRepository
+from src.repositories.schedule_read_repo import (
+    ScheduleChange,
+    ScheduleReadRepository,
+    ScheduleRow,
+)
 from src.repositories.schedule_repo import ScheduleRepository
-from src.repositories.user_repo import UserRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.upcoming_takings_repo import UpcomingTakingsRepository
+from src.repositories.user_repo import UserNotFoundError, UserRepository
 
-__all__ = ["ScheduleRepository", "UserRepository"]
+__all__ = [
+    "LoadStrategy",
+    "Relation",
+    "ReminderOutboxRepository",
+    "ScheduleArchiveRepository",
+    "ScheduleChange",
+    "ScheduleReadRepository",
+    "ScheduleRepository",
+    "ScheduleRow",
+    "UnitOfWork",
+    "UpcomingTakingsRepository",
+    "UserNotFoundError",
+    "UserRepository",
+]
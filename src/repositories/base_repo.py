@@ -1,30 +1,87 @@
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from collections.abc import AsyncIterator, Callable
+from enum import StrEnum
+from typing import Any, Generic, NamedTuple, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel as PydanticBaseModel
-from sqlalchemy import delete, select, update
+from sqlalchemy import Select, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import (
+    Load,
+    joinedload,
+    load_only,
+    noload,
+    raiseload,
+    selectinload,
+    subqueryload,
+)
 
 from src.database.models.base_model import BaseModel
+from src.repositories.unit_of_work import UnitOfWork
 
 MODEL_TYPE = TypeVar("MODEL_TYPE", bound=BaseModel)
 PYDANTIC_TYPE = TypeVar("PYDANTIC_TYPE", bound=PydanticBaseModel)
 
 
+class LoadStrategy(StrEnum):
+    # One query, a row per child deduplicated in Python
+    JOINED = "joined"
+    # A second query with the parent keys in IN, best for one-to-many
+    SELECTIN = "selectin"
+    # A second query repeating the parent query as a subquery
+    SUBQUERY = "subquery"
+    # Accessing the relation raises instead of lazy loading
+    RAISE = "raise"
+    # The relation stays empty
+    NOLOAD = "noload"
+
+
+LOADERS: dict[LoadStrategy, Callable[[Any], Load]] = {
+    LoadStrategy.JOINED: joinedload,
+    LoadStrategy.SELECTIN: selectinload,
+    LoadStrategy.SUBQUERY: subqueryload,
+    LoadStrategy.RAISE: raiseload,
+    LoadStrategy.NOLOAD: noload,
+}
+
+
+class Relation(NamedTuple):
+    """Relation to load with a strategy, and only the given columns of the related model"""
+
+    name: str
+    strategy: LoadStrategy = LoadStrategy.JOINED
+    columns: tuple[str, ...] | None = None
+
+
+RELATIONS_TYPE = list[str | Relation] | None
+
+
+def as_relation(relation_or_name: str | Relation) -> Relation:
+    return Relation(relation_or_name) if isinstance(relation_or_name, str) else relation_or_name
+
+
+# Rows fetched from a server-side cursor at a time
+STREAM_BATCH_SIZE = 1000
+
+
 class IBaseRepository(Generic[MODEL_TYPE], ABC):
     """
     Base repository interface
     """
 
     @abstractmethod
-    async def create(self, data: dict[str, Any] | PYDANTIC_TYPE) -> MODEL_TYPE:
+    async def create(
+        self, data: dict[str, Any] | PYDANTIC_TYPE, refresh: bool = True
+    ) -> MODEL_TYPE:
         """
         Create a new record in the repository.
 
         Args:
             data: Data for creating a record
+            refresh: Reload the record after commit. Records whose columns are all
+                filled on the client side do not need it. Within a unit of work the record
+                is only added and gets its defaults on the flush
 
         Returns:
             Created record
@@ -64,16 +121,37 @@ class IBaseRepository(Generic[MODEL_TYPE], ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_all(
+        self, batch_size: int = STREAM_BATCH_SIZE, **filters: dict[str, Any]
+    ) -> AsyncIterator[MODEL_TYPE]:
+        """
+        Iterate over all records that match the filters with a server-side cursor,
+        holding only one batch in memory.
+
+        Args:
+            batch_size: Number of rows fetched from the cursor at a time
+            filters: Filters for the query
+
+        Returns:
+            Async iterator of records
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id_with_relations(
-        self, id: UUID, relations: list[str] | None = None
+        self,
+        id: UUID,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
     ) -> MODEL_TYPE:
         """
         Get a record by id with relations.
 
         Args:
             id: Record id
-            relations: Relations to load
+            relations: Relations to load, names are joined-loaded
+            columns: Load only these columns of the record
 
         Returns:
             Record with relations
@@ -82,13 +160,17 @@ class IBaseRepository(Generic[MODEL_TYPE], ABC):
 
     @abstractmethod
     async def get_all_with_relations(
-        self, relations: list[str] | None = None, **filters: dict[str, Any]
+        self,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
+        **filters: dict[str, Any],
     ) -> list[MODEL_TYPE]:
         """
         Get all records with relations.
 
         Args:
-            relations: Relations to load
+            relations: Relations to load, names are joined-loaded
+            columns: Load only these columns of the records
             filters: Filters for the query
 
         Returns:
@@ -96,6 +178,30 @@ class IBaseRepository(Generic[MODEL_TYPE], ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def stream_all_with_relations(
+        self,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        **filters: dict[str, Any],
+    ) -> AsyncIterator[MODEL_TYPE]:
+        """
+        Iterate over all records with relations with a server-side cursor.
+        Collections are selectin-loaded per batch, joined and subquery loading
+        would need the whole result.
+
+        Args:
+            relations: Relations to load, names are joined-loaded
+            columns: Load only these columns of the records
+            batch_size: Number of rows fetched from the cursor at a time
+            filters: Filters for the query
+
+        Returns:
+            Async iterator of records with relations
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update(self, id: UUID, data: dict[str, Any]) -> MODEL_TYPE | None:
         """
@@ -130,15 +236,30 @@ class BaseRepository(IBaseRepository[MODEL_TYPE]):
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def create(self, data: dict[str, Any] | PYDANTIC_TYPE) -> MODEL_TYPE:
+    def unit_of_work(self) -> UnitOfWork:
+        """Unit of work on the session of the repository"""
+        return UnitOfWork(self._session)
+
+    async def _commit(self) -> None:
+        """Commit, unless the writes belong to a unit of work committing them once"""
+        if not UnitOfWork.is_active(self._session):
+            await self._session.commit()
+
+    async def create(
+        self, data: dict[str, Any] | PYDANTIC_TYPE, refresh: bool = True
+    ) -> MODEL_TYPE:
         if isinstance(data, PydanticBaseModel):
             data = data.model_dump()
 
         obj = self.model(**data)
 
         self._session.add(obj)
+        if UnitOfWork.is_active(self._session):
+            return obj
+
         await self._session.commit()
-        await self._session.refresh(obj)
+        if refresh:
+            await self._session.refresh(obj)
 
         return obj
 
@@ -153,35 +274,101 @@ class BaseRepository(IBaseRepository[MODEL_TYPE]):
         return result.scalar_one_or_none()
 
     async def get_all(self, **filters: dict[str, Any]) -> list[MODEL_TYPE]:
-        query = select(self.model)
-        if filters:
-            for field, value in filters.items():
-                query = query.where(getattr(self.model, field) == value)
-        result = await self._session.execute(query)
+        result = await self._session.execute(self._filtered(select(self.model), filters))
         return result.scalars().all()
 
+    def _filtered(self, query: Select, filters: dict[str, Any]) -> Select:
+        for field, value in filters.items():
+            query = query.where(getattr(self.model, field) == value)
+        return query
+
+    async def _stream(self, query: Select, batch_size: int) -> AsyncIterator[MODEL_TYPE]:
+        # yield_per fetches from a server-side cursor one batch at a time, the identity map
+        # holds the records weakly so consumed batches are freed
+        result = await self._session.stream_scalars(query.execution_options(yield_per=batch_size))
+        try:
+            async for obj in result:
+                yield obj
+        finally:
+            await result.close()
+
+    def stream_all(
+        self, batch_size: int = STREAM_BATCH_SIZE, **filters: dict[str, Any]
+    ) -> AsyncIterator[MODEL_TYPE]:
+        return self._stream(self._filtered(select(self.model), filters), batch_size)
+
+    def _with_relations(
+        self, query: Select, relations: RELATIONS_TYPE, columns: tuple[str, ...] | None
+    ) -> tuple[Select, bool]:
+        """
+        Add the loader options of the relations and the columns to the query.
+
+        Returns:
+            Query and whether joined rows must be deduplicated
+        """
+        if columns:
+            query = query.options(load_only(*(getattr(self.model, column) for column in columns)))
+
+        is_joined = False
+        for relation in map(as_relation, relations or ()):
+            attribute = getattr(self.model, relation.name)
+            option = LOADERS[relation.strategy](attribute)
+            if relation.columns and relation.strategy not in (
+                LoadStrategy.RAISE,
+                LoadStrategy.NOLOAD,
+            ):
+                related_model = attribute.property.mapper.class_
+                option = option.load_only(
+                    *(getattr(related_model, column) for column in relation.columns)
+                )
+            query = query.options(option)
+            is_joined = is_joined or relation.strategy == LoadStrategy.JOINED
+
+        return query, is_joined
+
     async def get_by_id_with_relations(
-        self, id: UUID, relations: list[str] | None = None
+        self,
+        id: UUID,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
     ) -> MODEL_TYPE:
-        query = select(self.model).where(self.model.id == id)
-        if relations:
-            for relation in relations:
-                query = query.options(joinedload(getattr(self.model, relation)))
+        query, is_joined = self._with_relations(
+            select(self.model).where(self.model.id == id), relations, columns
+        )
         result = await self._session.execute(query)
+        if is_joined:
+            result = result.unique()
         return result.scalar_one_or_none()
 
     async def get_all_with_relations(
-        self, relations: list[str] | None = None, **filters: dict[str, Any]
+        self,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
+        **filters: dict[str, Any],
     ) -> list[MODEL_TYPE]:
-        query = select(self.model)
-        if relations:
-            for relation in relations:
-                query = query.options(joinedload(getattr(self.model, relation)))
-        if filters:
-            for field, value in filters.items():
-                query = query.where(getattr(self.model, field) == value)
-        result = await self._session.execute(query)
-        return result.scalars().unique().all()
+        query, is_joined = self._with_relations(select(self.model), relations, columns)
+        result = (await self._session.execute(self._filtered(query, filters))).scalars()
+        if is_joined:
+            result = result.unique()
+        return result.all()
+
+    def stream_all_with_relations(
+        self,
+        relations: RELATIONS_TYPE = None,
+        columns: tuple[str, ...] | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+        **filters: dict[str, Any],
+    ) -> AsyncIterator[MODEL_TYPE]:
+        for relation in map(as_relation, relations or ()):
+            if (
+                relation.strategy in (LoadStrategy.JOINED, LoadStrategy.SUBQUERY)
+                and getattr(self.model, relation.name).property.uselist
+            ):
+                raise ValueError(  # noqa: TRY003
+                    f"Streamed collection {relation.name} must be loaded with selectin"
+                )
+        query, _ = self._with_relations(select(self.model), relations, columns)
+        return self._stream(self._filtered(query, filters), batch_size)
 
     async def update(self, id: UUID, data: dict[str, Any] | PYDANTIC_TYPE) -> MODEL_TYPE | None:
         if isinstance(data, PydanticBaseModel):
@@ -189,13 +376,11 @@ class BaseRepository(IBaseRepository[MODEL_TYPE]):
 
         query = update(self.model).where(self.model.id == id).values(**data).returning(self.model)
         result = await self._session.execute(query)
-        if not self._session.in_transaction():
-            await self._session.commit()
+        await self._commit()
         return result.scalar_one_or_none()
 
     async def delete(self, id: UUID) -> bool:
         query = delete(self.model).where(self.model.id == id)
         result = await self._session.execute(query)
-        if not self._session.in_transaction():
-            await self._session.commit()
+        await self._commit()
         return result.rowcount > 0
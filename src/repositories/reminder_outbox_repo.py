@@ -0,0 +1,42 @@
+from itertools import batched
+from typing import TYPE_CHECKING
+import uuid
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database.models.base_model import get_datetime_UTC
+from src.database.models.reminder_outbox import ReminderOutbox
+from src.repositories.base_repo import BaseRepository
+
+if TYPE_CHECKING:
+    from src.workers.reminders import DueTaking
+
+# asyncpg allows at most 32767 bind parameters per statement
+INSERT_CHUNK_SIZE = 5000
+
+
+class ReminderOutboxRepository(BaseRepository[ReminderOutbox]):
+    model: ReminderOutbox = ReminderOutbox
+
+    async def add_many(self, takings: list["DueTaking"]) -> None:
+        """Store due takings, takings already in the outbox are skipped"""
+        created_at = get_datetime_UTC()
+        values = [
+            {
+                "id": uuid.uuid4(),
+                "schedule_id": taking.schedule_id,
+                "user_id": taking.user_id,
+                "medicine_name": taking.medicine_name,
+                "taking_time": taking.taking_time,
+                "created_at": created_at,
+            }
+            for taking in takings
+        ]
+        for chunk in batched(values, INSERT_CHUNK_SIZE):
+            query = (
+                insert(self.model)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=["schedule_id", "taking_time"])
+            )
+            await self._session.execute(query)
+        await self._commit()
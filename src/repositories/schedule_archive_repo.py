@@ -0,0 +1,120 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Text, delete, func, insert, select
+
+from src.database.models.schedules import Schedules
+from src.database.models.schedules_archive import SchedulesArchive
+from src.database.models.users import Users
+from src.repositories.base_repo import BaseRepository
+
+ARCHIVED_COLUMNS = (
+    "id",
+    "user_id",
+    "medicine_name",
+    "frequency",
+    "start_date",
+    "end_date",
+    "created_at",
+)
+
+# Notified once per archived batch and user with the medicine policy, on commit
+SCHEDULES_ARCHIVED_CHANNEL = "schedules_archived"
+
+
+class ScheduleArchiveRepository(BaseRepository[SchedulesArchive]):
+    model: SchedulesArchive = SchedulesArchive
+
+    async def archive_ended(self, before: datetime, limit: int) -> dict[int, int]:
+        """
+        Move up to `limit` schedules ended before `before` into schedules_archive
+        with a single DELETE ... RETURNING feeding an INSERT, committing unless a unit of work
+        is active.
+        Their upcoming takings and reminders are deleted by the cascade, and their users
+        are notified on SCHEDULES_ARCHIVED_CHANNEL.
+
+        Returns:
+            Number of archived schedules by medicine policy of their user
+        """
+        batch = (
+            select(Schedules.id)
+            .where(Schedules.end_date < before)
+            .order_by(Schedules.end_date)
+            .limit(limit)
+            # Concurrent archivers take different batches
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Schedules)
+            .where(Schedules.id.in_(batch.scalar_subquery()))
+            .returning(*(getattr(Schedules, column) for column in ARCHIVED_COLUMNS))
+            .cte("moved")
+        )
+        archived = (
+            insert(self.model)
+            .from_select(
+                [*ARCHIVED_COLUMNS, "archived_at"],
+                select(*(moved.c[column] for column in ARCHIVED_COLUMNS), func.now()),
+            )
+            .returning(self.model.user_id)
+            .cte("archived")
+        )
+        query = (
+            select(
+                Users.medicine_policy,
+                func.count(),
+                func.pg_notify(
+                    SCHEDULES_ARCHIVED_CHANNEL,
+                    func.json_build_object("medicine_policy", Users.medicine_policy).cast(Text),
+                ),
+            )
+            .join(archived, archived.c.user_id == Users.id)
+            .group_by(Users.medicine_policy)
+        )
+        rows = (await self._session.execute(query)).all()
+        await self._commit()
+        return {medicine_policy: count for medicine_policy, count, _ in rows}
+
+    async def get_by_medicine_policy(
+        self,
+        medicine_policy: int,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[SchedulesArchive]:
+        """Get archived schedules of a user ordered by id, overlapping [since, until] if given"""
+        query = (
+            select(self.model)
+            .join(Users, Users.id == self.model.user_id)
+            .where(Users.medicine_policy == medicine_policy)
+            .order_by(self.model.id)
+        )
+        if since is not None:
+            query = query.where(self.model.end_date >= since)
+        if until is not None:
+            query = query.where(self.model.start_date <= until)
+        return (await self._session.scalars(query)).all()
+
+    async def get_by_medicine_policy_and_id(
+        self, medicine_policy: int, schedule_id: UUID
+    ) -> SchedulesArchive | None:
+        query = (
+            select(self.model)
+            .join(Users, Users.id == self.model.user_id)
+            .where(Users.medicine_policy == medicine_policy, self.model.id == schedule_id)
+        )
+        return (await self._session.scalars(query)).one_or_none()
+
+    async def get_ids_by_medicine_policy(
+        self, medicine_policy: int, after_id: UUID | None = None, limit: int | None = None
+    ) -> list[UUID]:
+        """Get ids of archived schedules of a user ordered by id, greater than `after_id`"""
+        query = (
+            select(self.model.id)
+            .join(Users, Users.id == self.model.user_id)
+            .where(Users.medicine_policy == medicine_policy)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(self.model.id > after_id)
+        return (await self._session.scalars(query)).all()
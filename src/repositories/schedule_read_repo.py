@@ -0,0 +1,163 @@
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import UUID
+
+from asyncpg import Connection, Record
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.user_repo import UserNotFoundError
+
+if TYPE_CHECKING:
+    from src.database.models.schedules import Schedules
+
+# users.id tells "user not found" (no rows) from "no schedules" (one row of NULLs)
+SELECT_BY_MEDICINE_POLICY = """
+    SELECT users.id, s.id, s.user_id, s.medicine_name, s.frequency, s.start_date, s.end_date
+    FROM users
+    LEFT JOIN schedules AS s ON s.user_id = users.id
+    WHERE users.medicine_policy = $1
+    ORDER BY s.id
+"""
+SELECT_ACTIVE_BY_MEDICINE_POLICY = """
+    SELECT users.id, s.id, s.user_id, s.medicine_name, s.frequency, s.start_date, s.end_date
+    FROM users
+    LEFT JOIN schedules AS s ON s.user_id = users.id
+        AND (s.end_date IS NULL OR s.end_date >= $2)
+        AND s.start_date <= $3
+    WHERE users.medicine_policy = $1
+    ORDER BY s.id
+"""
+SELECT_BY_MEDICINE_POLICY_AND_ID = """
+    SELECT users.id, s.id, s.user_id, s.medicine_name, s.frequency, s.start_date, s.end_date
+    FROM users
+    LEFT JOIN schedules AS s ON s.user_id = users.id AND s.id = $2
+    WHERE users.medicine_policy = $1
+"""
+SELECT_CREATED_SINCE = """
+    SELECT s.id, s.user_id, s.medicine_name, s.frequency, s.start_date, s.end_date, s.created_at
+    FROM schedules AS s
+    JOIN users ON users.id = s.user_id
+    WHERE users.medicine_policy = $1 AND s.created_at >= $2
+    ORDER BY s.created_at, s.id
+"""
+SELECT_CHANGES_BY_IDS = """
+    SELECT s.id, s.user_id, s.medicine_name, s.frequency, s.start_date, s.end_date, s.created_at
+    FROM schedules AS s
+    WHERE s.id = ANY($1::uuid[])
+    ORDER BY s.created_at, s.id
+"""
+
+
+class ScheduleRow(NamedTuple):
+    """Schedule columns the takings engine and the response builders read"""
+
+    id: UUID
+    user_id: UUID
+    medicine_name: str
+    frequency: int
+    start_date: datetime
+    end_date: datetime | None
+
+    @classmethod
+    def from_schedule(cls, schedule: "Schedules | ScheduleRow") -> "ScheduleRow":
+        if isinstance(schedule, ScheduleRow):
+            return schedule
+        return cls(
+            schedule.id,
+            schedule.user_id,
+            schedule.medicine_name,
+            schedule.frequency,
+            schedule.start_date,
+            schedule.end_date,
+        )
+
+
+class ScheduleChange(NamedTuple):
+    """Created schedule with its creation time, naive UTC like the column"""
+
+    schedule: ScheduleRow
+    created_at: datetime
+
+
+def to_schedule_change(record: Record) -> ScheduleChange:
+    return ScheduleChange(ScheduleRow(*record[:6]), record[6])
+
+
+def to_schedule_rows(records: list[Record]) -> list[ScheduleRow] | None:
+    if not records:
+        return None
+
+    return [ScheduleRow(*record[1:]) for record in records if record[1] is not None]
+
+
+class ScheduleReadRepository:
+    """
+    Read-only schedule queries run on the asyncpg connection of the session,
+    returning ScheduleRow tuples without the ORM identity map.
+    asyncpg prepares every statement once per connection and caches it.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def _get_connection(self) -> Connection:
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    async def get_by_medicine_policy(self, medicine_policy: int) -> list[ScheduleRow] | None:
+        """
+        Get all schedules of a user ordered by id.
+
+        Returns:
+            None if the user is not found, otherwise the schedules
+        """
+        connection = await self._get_connection()
+        return to_schedule_rows(await connection.fetch(SELECT_BY_MEDICINE_POLICY, medicine_policy))
+
+    async def get_active_by_medicine_policy(
+        self, medicine_policy: int, since: datetime, until: datetime
+    ) -> list[ScheduleRow] | None:
+        """
+        Get schedules of a user overlapping [since, until] ordered by id.
+
+        Returns:
+            None if the user is not found, otherwise the schedules
+        """
+        connection = await self._get_connection()
+        return to_schedule_rows(
+            await connection.fetch(SELECT_ACTIVE_BY_MEDICINE_POLICY, medicine_policy, since, until)
+        )
+
+    async def get_by_medicine_policy_and_id(
+        self, medicine_policy: int, schedule_id: UUID
+    ) -> ScheduleRow | None:
+        """
+        Get a schedule of a user by id.
+
+        Returns:
+            The schedule or None if the user has no schedule with the id
+
+        Raises:
+            UserNotFoundError: If the user is not found
+        """
+        connection = await self._get_connection()
+        record = await connection.fetchrow(
+            SELECT_BY_MEDICINE_POLICY_AND_ID, medicine_policy, schedule_id
+        )
+        if record is None:
+            raise UserNotFoundError(medicine_policy)
+
+        return None if record[1] is None else ScheduleRow(*record[1:])
+
+    async def get_created_since(
+        self, medicine_policy: int, since: datetime
+    ) -> list[ScheduleChange]:
+        """Get schedules of a user created at or after `since` in the order of creation"""
+        connection = await self._get_connection()
+        return [
+            to_schedule_change(record)
+            for record in await connection.fetch(
+                SELECT_CREATED_SINCE, medicine_policy, since.astimezone(UTC).replace(tzinfo=None)
+            )
+        ]
@@ -1,6 +1,160 @@
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel as PydanticBaseModel
+from sqlalchemy import and_, insert, or_, select
+
 from src.database.models.schedules import Schedules
+from src.database.models.users import Users
 from src.repositories.base_repo import BaseRepository
+from src.repositories.schedule_read_repo import ScheduleChange, ScheduleRow
+from src.repositories.user_repo import UserNotFoundError
 
 
 class ScheduleRepository(BaseRepository[Schedules]):
     model: Schedules = Schedules
+
+    async def create_many(self, data: list[dict[str, Any] | PydanticBaseModel]) -> list[Schedules]:
+        """
+        Insert the schedules with multi-row INSERT ... RETURNING statements
+        and without committing.
+
+        Returns:
+            Created schedules in the order of `data`
+        """
+        values = [
+            item.model_dump() if isinstance(item, PydanticBaseModel) else item for item in data
+        ]
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self._session.scalars(query, values)
+        return result.all()
+
+    async def get_not_materialized(
+        self, now: datetime, until: datetime, limit: int
+    ) -> list[Schedules]:
+        """Get active schedules whose upcoming takings are not materialized up to `until`"""
+        query = (
+            select(self.model)
+            .where(
+                or_(self.model.end_date.is_(None), self.model.end_date >= now),
+                self.model.start_date <= until,
+                or_(
+                    self.model.takings_materialized_until.is_(None),
+                    self.model.takings_materialized_until < until,
+                ),
+            )
+            .limit(limit)
+        )
+        result = await self._session.execute(query)
+        return result.scalars().all()
+
+    async def get_active(self, now: datetime) -> list[Schedules]:
+        """Get schedules that have not ended by `now`"""
+        query = select(self.model).where(
+            or_(self.model.end_date.is_(None), self.model.end_date >= now)
+        )
+        result = await self._session.execute(query)
+        return result.scalars().all()
+
+    async def get_active_by_medicine_policy(
+        self, medicine_policy: int, since: datetime, until: datetime
+    ) -> list[Schedules] | None:
+        """
+        Get schedules of a user overlapping [since, until] ordered by id.
+
+        Returns:
+            None if the user is not found, otherwise the schedules
+        """
+        query = (
+            select(Users.id, self.model)
+            .select_from(Users)
+            .outerjoin(
+                self.model,
+                and_(
+                    self.model.user_id == Users.id,
+                    or_(self.model.end_date.is_(None), self.model.end_date >= since),
+                    self.model.start_date <= until,
+                ),
+            )
+            .where(Users.medicine_policy == medicine_policy)
+            .order_by(self.model.id)
+        )
+        rows = (await self._session.execute(query)).all()
+        if not rows:
+            return None
+
+        return [schedule for _, schedule in rows if schedule is not None]
+
+    async def get_by_medicine_policy_and_id(
+        self, medicine_policy: int, schedule_id: UUID
+    ) -> Schedules | None:
+        """
+        Get a schedule of a user by id with a single primary key lookup.
+
+        Returns:
+            The schedule or None if the user has no schedule with the id
+
+        Raises:
+            UserNotFoundError: If the user is not found
+        """
+        query = (
+            select(Users.id, self.model)
+            .select_from(Users)
+            .outerjoin(
+                self.model,
+                and_(self.model.user_id == Users.id, self.model.id == schedule_id),
+            )
+            .where(Users.medicine_policy == medicine_policy)
+        )
+        row = (await self._session.execute(query)).one_or_none()
+        if row is None:
+            raise UserNotFoundError(medicine_policy)
+
+        return row[1]
+
+    async def get_ids_by_medicine_policy(
+        self, medicine_policy: int, after_id: UUID | None = None, limit: int | None = None
+    ) -> list[UUID] | None:
+        """
+        Get ids of schedules of a user ordered by id without loading the schedules.
+
+        Returns:
+            None if the user is not found, otherwise the ids greater than `after_id`
+        """
+        schedule_filter = self.model.user_id == Users.id
+        if after_id is not None:
+            schedule_filter = and_(schedule_filter, self.model.id > after_id)
+
+        query = (
+            select(self.model.id)
+            .select_from(Users)
+            .outerjoin(self.model, schedule_filter)
+            .where(Users.medicine_policy == medicine_policy)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+        schedule_ids = (await self._session.scalars(query)).all()
+        if not schedule_ids:
+            return None
+
+        return [schedule_id for schedule_id in schedule_ids if schedule_id is not None]
+
+    async def get_created_since(
+        self, medicine_policy: int, since: datetime
+    ) -> list[ScheduleChange]:
+        """Get schedules of a user created at or after `since` in the order of creation"""
+        query = (
+            select(self.model)
+            .join(Users, Users.id == self.model.user_id)
+            .where(
+                Users.medicine_policy == medicine_policy,
+                self.model.created_at >= since.astimezone(UTC).replace(tzinfo=None),
+            )
+            .order_by(self.model.created_at, self.model.id)
+        )
+        result = await self._session.scalars(query)
+        return [
+            ScheduleChange(ScheduleRow.from_schedule(schedule), schedule.created_at)
+            for schedule in result.all()
+        ]
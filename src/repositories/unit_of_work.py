@@ -0,0 +1,48 @@
+from types import TracebackType
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Depth of the units of work entered on the session, shared by all its repositories
+DEPTH_KEY = "unit_of_work_depth"
+
+
+class UnitOfWork:
+    """
+    Groups the writes of all repositories on a session into one transaction.
+
+    Within a unit of work repositories add and execute without committing, sessions do
+    not autoflush, so pending records reach the database on an explicit flush or on the
+    commit. The outermost unit commits once on a clean exit and rolls back on an error,
+    nested units join it.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    @staticmethod
+    def is_active(session: AsyncSession) -> bool:
+        return session.info.get(DEPTH_KEY, 0) > 0
+
+    async def flush(self) -> None:
+        """Send the pending records in one batch, e.g. to use their ids in statements"""
+        await self._session.flush()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._session.info[DEPTH_KEY] = self._session.info.get(DEPTH_KEY, 0) + 1
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        _exc: BaseException | None,
+        _traceback: TracebackType | None,
+    ) -> None:
+        depth = self._session.info[DEPTH_KEY] - 1
+        self._session.info[DEPTH_KEY] = depth
+        if depth:
+            return
+
+        if exc_type is None:
+            await self._session.commit()
+        else:
+            await self._session.rollback()
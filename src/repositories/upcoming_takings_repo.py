@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+import uuid
+
+from sqlalchemy import and_, delete, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from src.database.models.schedules import Schedules
+from src.database.models.upcoming_takings import UpcomingTakings
+from src.database.models.users import Users
+from src.repositories.base_repo import BaseRepository
+
+if TYPE_CHECKING:
+    from src.api.v1.schedule.utils import TakingsCursor
+
+
+class UpcomingTakingsRepository(BaseRepository[UpcomingTakings]):
+    model: UpcomingTakings = UpcomingTakings
+
+    async def materialize(
+        self, takings: list[tuple[Schedules, list[datetime]]], until: datetime
+    ) -> None:
+        """
+        Store takings of the schedules and mark them as materialized up to `until`.
+        Already stored takings are skipped.
+        """
+        values = [
+            {
+                "id": uuid.uuid4(),
+                "schedule_id": schedule.id,
+                "user_id": schedule.user_id,
+                "taking_time": taking_time,
+            }
+            for schedule, taking_times in takings
+            for taking_time in taking_times
+        ]
+        if values:
+            # executemany keeps a single cached statement instead of compiling huge VALUES lists
+            query = insert(self.model).on_conflict_do_nothing(
+                index_elements=["schedule_id", "taking_time"]
+            )
+            await self._session.execute(query, values)
+
+        query = (
+            update(Schedules)
+            .where(Schedules.id.in_([schedule.id for schedule, _ in takings]))
+            .values(takings_materialized_until=until)
+        )
+        await self._session.execute(query)
+        await self._commit()
+
+    async def delete_before(self, time: datetime) -> int:
+        query = delete(self.model).where(self.model.taking_time < time)
+        result = await self._session.execute(query)
+        await self._commit()
+        return result.rowcount
+
+    async def get_by_medicine_policy(
+        self,
+        medicine_policy: int,
+        start: datetime,
+        end: datetime,
+        after: "TakingsCursor | None" = None,
+        limit: int | None = None,
+    ) -> tuple[bool, list[tuple[datetime, Schedules]]] | None:
+        """
+        Get materialized takings of a user in [start, end] ordered by (taking_time, schedule_id)
+        with a single indexed range scan.
+
+        Returns:
+            None if the user is not found, otherwise a flag telling whether every active
+            schedule of the user is materialized up to `end`, and the takings
+        """
+        schedule = aliased(Schedules)
+        stale = (
+            select(schedule.id)
+            .where(
+                schedule.user_id == Users.id,
+                or_(schedule.end_date.is_(None), schedule.end_date >= start),
+                schedule.start_date <= end,
+                or_(
+                    schedule.takings_materialized_until.is_(None),
+                    schedule.takings_materialized_until < end,
+                ),
+            )
+            .exists()
+        )
+
+        takings_filter = and_(
+            self.model.user_id == Users.id,
+            self.model.taking_time >= start,
+            self.model.taking_time <= end,
+        )
+        if after is not None:
+            takings_filter = and_(
+                takings_filter,
+                tuple_(self.model.taking_time, self.model.schedule_id)
+                > tuple_(after.next_taking_time, after.schedule_id),
+            )
+
+        query = (
+            select(stale, self.model.taking_time, Schedules)
+            .select_from(Users)
+            .outerjoin(self.model, takings_filter)
+            .outerjoin(Schedules, Schedules.id == self.model.schedule_id)
+            .where(Users.medicine_policy == medicine_policy)
+            .order_by(self.model.taking_time, self.model.schedule_id)
+            .limit(limit)
+        )
+        rows = (await self._session.execute(query)).all()
+        if not rows:
+            return None
+
+        return not rows[0][0], [
+            (taking_time, schedule) for _, taking_time, schedule in rows if taking_time
+        ]
@@ -1,8 +1,26 @@
+from itertools import batched
+from typing import Any
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel as PydanticBaseModel
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 
+from src.database.models.base_model import get_datetime_UTC
 from src.database.models.users import Users
 from src.repositories.base_repo import BaseRepository
 
+# asyncpg allows at most 32767 bind parameters per statement
+INSERT_CHUNK_SIZE = 5000
+
+
+class UserNotFoundError(LookupError):
+    """No user has the medicine policy"""
+
+    def __init__(self, medicine_policy: int) -> None:
+        super().__init__(f"User with medicine_policy {medicine_policy} not found")
+        self.medicine_policy = medicine_policy
+
 
 class UserRepository(BaseRepository[Users]):
     model: Users = Users
@@ -11,3 +29,54 @@ class UserRepository(BaseRepository[Users]):
         query = select(self.model).where(self.model.medicine_policy == medical_policy)
         result = await self._session.execute(query)
         return result.scalar_one_or_none()
+
+    async def get_or_create_id(self, data: dict[str, Any] | PydanticBaseModel) -> UUID:
+        """
+        Insert the user unless a user with the same medicine policy exists, in one statement
+        and without committing. Concurrent calls for a new medicine policy do not conflict.
+
+        Returns:
+            Id of the new or the existing user
+        """
+        if isinstance(data, PydanticBaseModel):
+            data = data.model_dump()
+
+        query = insert(self.model).values(**data)
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.medicine_policy],
+            # A no-op update, unlike DO NOTHING, makes RETURNING return the existing row
+            set_={"medicine_policy": query.excluded.medicine_policy},
+        ).returning(self.model.id)
+        result = await self._session.execute(query)
+        return result.scalar_one()
+
+    async def get_or_create_ids(
+        self, users: list[dict[str, Any] | PydanticBaseModel]
+    ) -> dict[int, UUID]:
+        """
+        Insert the users missing by medicine policy with multi-row statements and without
+        committing, like get_or_create_id. Rows are inserted in medicine policy order,
+        so concurrent calls lock them in the same order.
+
+        Returns:
+            Ids of the new and the existing users by medicine policy
+        """
+        created_at = get_datetime_UTC()
+        values: dict[int, dict[str, Any]] = {}
+        for data in users:
+            if isinstance(data, PydanticBaseModel):
+                data = data.model_dump()  # noqa: PLW2901
+            values.setdefault(
+                data["medicine_policy"], {"id": uuid4(), "created_at": created_at, **data}
+            )
+
+        user_ids: dict[int, UUID] = {}
+        for chunk in batched((values[policy] for policy in sorted(values)), INSERT_CHUNK_SIZE):
+            query = insert(self.model).values(chunk)
+            query = query.on_conflict_do_update(
+                index_elements=[self.model.medicine_policy],
+                set_={"medicine_policy": query.excluded.medicine_policy},
+            ).returning(self.model.medicine_policy, self.model.id)
+            result = await self._session.execute(query)
+            user_ids.update(result.tuples().all())
+        return user_ids
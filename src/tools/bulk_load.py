@@ -0,0 +1,265 @@
+"""
+Load users and schedules from CSV or JSONL files with COPY.
+
+Every row holds the fields of SScheduleCreateRequest and is normalized like
+ScheduleService.create_schedule. Batches of rows are copied into a staging table
+and merged into users and schedules, one transaction per batch. Existing users are kept.
+Upcoming takings of the loaded schedules are materialized by the upcoming takings refresher.
+
+    python -m src.tools.bulk_load schedules.csv --batch-size 100000 --rejects rejects.csv
+"""
+
+import argparse
+import asyncio
+from collections.abc import Iterator
+import csv
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import batched
+from pathlib import Path
+import sys
+import time
+from typing import Any, Literal
+
+import numpy as np
+from pydantic import ValidationError
+
+from src.api.v1.schedule.batch import round_to_multiple_array
+from src.api.v1.schedule.bulk import format_validation_error
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.database.connection import engine
+
+MINUTE_MICROSECONDS = 60 * 1_000_000
+NOT_A_TIME = np.iinfo(np.int64).min
+# Staging and target columns are integer, a larger value would abort the COPY of the batch
+INT32_MAX = np.iinfo(np.int32).max
+# gRPC clients send the Unix epoch for an unset end_date, see ScheduleService.get_schedule_period
+EPOCH_YEAR_END = np.datetime64("1971-01-01", "us").astype(np.int64)
+
+STAGING_COLUMNS = (
+    "line",
+    "medicine_policy",
+    "name",
+    "medicine_name",
+    "frequency",
+    "start_date",
+    "end_date",
+)
+CREATE_STAGING_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS bulk_load_schedules (
+        line bigint NOT NULL,
+        medicine_policy integer NOT NULL,
+        name text,
+        medicine_name text NOT NULL,
+        frequency integer NOT NULL,
+        start_date bigint NOT NULL,
+        end_date bigint NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+MERGE_USERS = """
+    INSERT INTO users (id, medicine_policy, name, created_at)
+    SELECT DISTINCT ON (medicine_policy) gen_random_uuid(), medicine_policy, name, timezone('UTC', now())
+    FROM bulk_load_schedules
+    ORDER BY medicine_policy, line
+    ON CONFLICT (medicine_policy) DO NOTHING
+"""
+MERGE_SCHEDULES = """
+    INSERT INTO schedules (id, user_id, medicine_name, frequency, start_date, end_date, created_at)
+    SELECT
+        gen_random_uuid(),
+        users.id,
+        staging.medicine_name,
+        staging.frequency,
+        timestamptz 'epoch' + staging.start_date * interval '1 microsecond',
+        timestamptz 'epoch' + staging.end_date * interval '1 microsecond',
+        timezone('UTC', now())
+    FROM bulk_load_schedules AS staging
+    JOIN users USING (medicine_policy)
+"""
+
+
+@dataclass
+class LoadStats:
+    rows: int = 0
+    users: int = 0
+    schedules: int = 0
+    rejected: int = 0
+
+
+def read_rows(
+    path: Path, file_format: Literal["csv", "jsonl"]
+) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """Yield line numbers with CSV rows or raw JSON lines"""
+    with path.open(newline="") as file:
+        if file_format == "csv":
+            # Line 1 is the header
+            for line, row in enumerate(csv.DictReader(file), start=2):
+                yield line, {field: value for field, value in row.items() if value != ""}
+        else:
+            for line, text in enumerate(file, start=1):
+                if text.strip():
+                    yield line, text
+
+
+def parse_rows(
+    rows: tuple[tuple[int, dict[str, Any] | str], ...],
+) -> tuple[list[tuple[int, SScheduleCreateRequest]], list[tuple[int, str]]]:
+    """Validate the rows with the API schema"""
+    requests = []
+    rejects = []
+    for line, row in rows:
+        try:
+            if isinstance(row, str):
+                request = SScheduleCreateRequest.model_validate_json(row)
+            else:
+                request = SScheduleCreateRequest.model_validate(row)
+        except ValidationError as e:
+            rejects.append((line, format_validation_error(e)))
+        else:
+            requests.append((line, request))
+    return requests, rejects
+
+
+def to_microseconds(values: list[Any], dtype: str) -> np.ndarray:
+    """Datetimes (as UTC wall time) or timedeltas to int64 microseconds, None to NOT_A_TIME"""
+    return np.array(values, dtype=dtype).astype(np.int64)
+
+
+def normalize_requests(
+    requests: list[tuple[int, SScheduleCreateRequest]], now: datetime
+) -> tuple[list[tuple], list[tuple[int, str]]]:
+    """
+    Vectorized ScheduleService.get_schedule_period and frequency rounding.
+
+    Returns:
+        Staging records in the order of STAGING_COLUMNS and the rejected lines
+    """
+    lines = np.array([line for line, _ in requests], dtype=np.int64)
+    # The service takes the wall time of every date as UTC
+    start = to_microseconds(
+        [(request.start_date or now).replace(tzinfo=None) for _, request in requests],
+        "datetime64[us]",
+    )
+    end = to_microseconds(
+        [
+            request.end_date.replace(tzinfo=None) if request.end_date else None
+            for _, request in requests
+        ],
+        "datetime64[us]",
+    )
+    duration = to_microseconds([request.duration for _, request in requests], "timedelta64[us]")
+    frequency = np.array([request.frequency for _, request in requests], dtype=np.int64)
+    medicine_policy = np.array([request.medicine_policy for _, request in requests], dtype=np.int64)
+
+    end[(end >= 0) & (end < EPOCH_YEAR_END)] = NOT_A_TIME
+    has_end = end != NOT_A_TIME
+    has_duration = (duration != NOT_A_TIME) & (duration != 0)
+    end = np.where(has_end, end, start + np.where(has_duration, duration, 0))
+    start = round_to_multiple_array(start // MINUTE_MICROSECONDS) * MINUTE_MICROSECONDS
+    frequency = np.maximum(round_to_multiple_array(frequency), 15)
+
+    out_of_range = (frequency > INT32_MAX) | (medicine_policy > INT32_MAX)
+    no_period = ~out_of_range & ~has_end & ~has_duration
+    ends_early = ~out_of_range & ~no_period & (end < start)
+    valid = ~out_of_range & ~no_period & ~ends_early
+
+    rejects = [
+        (int(line), f"frequency and medicine_policy must not exceed {INT32_MAX}")
+        for line in lines[out_of_range]
+    ]
+    rejects.extend(
+        (int(line), "Either end_date or duration must be provided") for line in lines[no_period]
+    )
+    rejects.extend(
+        (int(line), "End date must be greater than start date") for line in lines[ends_early]
+    )
+    records = [
+        (line, request.medicine_policy, request.name, request.medicine_name, *values)
+        for (line, request), values, is_valid in zip(
+            requests,
+            zip(frequency.tolist(), start.tolist(), end.tolist(), strict=True),
+            valid.tolist(),
+            strict=True,
+        )
+        if is_valid
+    ]
+    return records, rejects
+
+
+def get_row_count(status: str) -> int:
+    """Row count of an asyncpg command status such as 'INSERT 0 100'"""
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def load(
+    path: Path,
+    file_format: Literal["csv", "jsonl"],
+    batch_size: int,
+    rejects_path: Path | None = None,
+) -> LoadStats:
+    stats = LoadStats()
+    rejects_file = rejects_path.open("w", newline="") if rejects_path else None
+    rejects_writer = csv.writer(rejects_file) if rejects_file else None
+    if rejects_writer:
+        rejects_writer.writerow(("line", "error"))
+
+    try:
+        async with engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.execute(CREATE_STAGING_TABLE)
+
+            for rows in batched(read_rows(path, file_format), batch_size):
+                requests, rejects = parse_rows(rows)
+                records, normalize_rejects = normalize_requests(requests, datetime.now(UTC))
+                rejects.extend(normalize_rejects)
+
+                async with driver_connection.transaction():
+                    await driver_connection.copy_records_to_table(
+                        "bulk_load_schedules", records=records, columns=STAGING_COLUMNS
+                    )
+                    users_status = await driver_connection.execute(MERGE_USERS)
+                    schedules_status = await driver_connection.execute(MERGE_SCHEDULES)
+
+                stats.rows += len(rows)
+                stats.users += get_row_count(users_status)
+                stats.schedules += get_row_count(schedules_status)
+                stats.rejected += len(rejects)
+                if rejects_writer:
+                    rejects_writer.writerows(sorted(rejects))
+    finally:
+        if rejects_file:
+            rejects_file.close()
+
+    return stats
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", type=Path, help="CSV file with a header or JSONL file")
+    parser.add_argument(
+        "--format", choices=("csv", "jsonl"), help="File format, taken from the suffix by default"
+    )
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--rejects", type=Path, help="CSV file for the lines that were skipped")
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    file_format = args.format or ("csv" if args.path.suffix == ".csv" else "jsonl")
+
+    start_time = time.perf_counter()
+    stats = await load(args.path, file_format, args.batch_size, args.rejects)
+    duration = time.perf_counter() - start_time
+    await engine.dispose()
+
+    sys.stdout.write(
+        f"{stats.rows} rows in {duration:.2f}s ({stats.rows / duration:.0f} rows/s): "
+        f"{stats.schedules} schedules and {stats.users} new users loaded, "
+        f"{stats.rejected} rows rejected\n"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
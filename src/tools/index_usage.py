@@ -0,0 +1,266 @@
+"""
+Report which indexes the repository lookup paths use.
+
+Seeds the Postgres of --database-url with synthetic users, schedules and upcoming takings,
+runs every lookup path through the repositories and prints the plan nodes
+of the queries they send together with the index scan counters of the transaction.
+Everything runs in one transaction that is rolled back, so the seeded rows are not kept.
+
+    python -m src.tools.index_usage --database-url postgresql+asyncpg://... --users 2000
+"""
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+import json
+import os
+import sys
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.core.config import settings
+from src.database.connection import create_engine
+from src.repositories import ScheduleRepository, UpcomingTakingsRepository, UserRepository
+
+# Seeded users get medicine policies above this value
+SEED_POLICY_OFFSET = 900_000_000
+TABLES = ("users", "schedules", "upcoming_takings", "reminder_outbox")
+
+SEED_USERS = text(
+    """
+    INSERT INTO users (id, medicine_policy, name, created_at)
+    SELECT gen_random_uuid(), :offset + n, 'Index Usage User', timezone('UTC', now())
+    FROM generate_series(1, :users) AS n
+    ON CONFLICT (medicine_policy) DO NOTHING
+    """
+)
+SEED_SCHEDULES = text(
+    """
+    INSERT INTO schedules (id, user_id, medicine_name, frequency, start_date, end_date, created_at)
+    SELECT
+        gen_random_uuid(),
+        user_id,
+        'Index Usage Medicine',
+        frequency,
+        start_date,
+        CASE WHEN random() < 0.3 THEN NULL ELSE start_date + random() * interval '60 days' END,
+        timezone('UTC', now())
+    FROM (
+        SELECT
+            users.id AS user_id,
+            15 * (1 + floor(random() * 96)::int) AS frequency,
+            date_trunc('hour', now()) - random() * interval '90 days' AS start_date
+        FROM users
+        CROSS JOIN generate_series(1, :schedules_per_user)
+        WHERE users.medicine_policy > :offset
+            AND NOT EXISTS (SELECT FROM schedules WHERE schedules.user_id = users.id)
+    ) AS seeded
+    """
+)
+SEED_UPCOMING_TAKINGS = text(
+    """
+    INSERT INTO upcoming_takings (id, schedule_id, user_id, taking_time)
+    SELECT gen_random_uuid(), schedules.id, schedules.user_id, takings.taking_time
+    FROM schedules
+    JOIN users ON users.id = schedules.user_id
+    CROSS JOIN LATERAL (
+        SELECT taking_time
+        FROM generate_series(
+            date_trunc('hour', now()) + make_interval(mins => schedules.frequency),
+            now() + interval '30 days',
+            make_interval(mins => schedules.frequency)
+        ) AS taking_time
+        WHERE (taking_time AT TIME ZONE 'UTC')::time BETWEEN :morning AND :evening
+        LIMIT :takings_per_schedule
+    ) AS takings
+    WHERE users.medicine_policy > :offset
+        AND (schedules.end_date IS NULL OR schedules.end_date >= now())
+    ON CONFLICT (schedule_id, taking_time) DO NOTHING
+    """
+)
+INDEX_SCANS = text(
+    """
+    SELECT
+        relname,
+        indexrelname,
+        pg_stat_get_xact_numscans(indexrelid) AS idx_scan,
+        pg_relation_size(indexrelid) AS size
+    FROM pg_stat_user_indexes
+    WHERE relname = ANY(:tables)
+    ORDER BY relname, indexrelname
+    """
+)
+
+
+async def seed(
+    connection: AsyncConnection, users: int, schedules_per_user: int, takings_per_schedule: int
+) -> None:
+    """
+    Insert the synthetic data with the takings inside the allowed daytime window
+    and refresh the planner statistics
+    """
+    await connection.execute(SEED_USERS, {"offset": SEED_POLICY_OFFSET, "users": users})
+    await connection.execute(
+        SEED_SCHEDULES, {"offset": SEED_POLICY_OFFSET, "schedules_per_user": schedules_per_user}
+    )
+    await connection.execute(
+        SEED_UPCOMING_TAKINGS,
+        {
+            "offset": SEED_POLICY_OFFSET,
+            "takings_per_schedule": takings_per_schedule,
+            "morning": settings.MORNING_TIME,
+            "evening": settings.EVENING_TIME,
+        },
+    )
+    for table in TABLES:
+        await connection.execute(text(f"ANALYZE {table}"))
+
+
+def get_lookup_paths(
+    medicine_policy: int, now: datetime
+) -> dict[str, Callable[[AsyncSession], Awaitable[Any]]]:
+    """Repository calls issued by the API, the gRPC server and the workers"""
+    return {
+        "user by medicine policy": lambda session: UserRepository(session).get_by_medical_policy(
+            medicine_policy
+        ),
+        "schedule ids of a user": lambda session: ScheduleRepository(
+            session
+        ).get_ids_by_medicine_policy(medicine_policy, limit=100),
+        "active schedules of a user": lambda session: ScheduleRepository(
+            session
+        ).get_active_by_medicine_policy(medicine_policy, now, now + timedelta(days=1)),
+        "upcoming takings of a user": lambda session: UpcomingTakingsRepository(
+            session
+        ).get_by_medicine_policy(medicine_policy, now, now + timedelta(days=1)),
+        "active schedules (reminder dispatcher)": lambda session: ScheduleRepository(
+            session
+        ).get_active(now),
+        "not materialized schedules (upcoming takings refresher)": lambda session: (
+            ScheduleRepository(session).get_not_materialized(now, now + timedelta(days=2), 100)
+        ),
+    }
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """Collect the SQL statements sent by the engine with their parameters"""
+    statements: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        _connection: Any, _cursor: Any, statement: str, parameters: Any, *_: Any
+    ) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def iter_plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def describe_plan_node(node: dict[str, Any]) -> str:
+    """E.g. 'Index Scan using ix_schedules_end_date on schedules'"""
+    description = node["Node Type"]
+    if "Index Name" in node:
+        description += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        description += f" on {node['Relation Name']}"
+    return description
+
+
+async def explain(session: AsyncSession, statement: str, parameters: Any) -> list[str]:
+    """Scan nodes of the executed plan of the statement"""
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return [
+        describe_plan_node(node)
+        for node in iter_plan_nodes(plan[0]["Plan"])
+        if "Relation Name" in node or "Index Name" in node
+    ]
+
+
+async def get_index_scans(connection: AsyncConnection) -> dict[tuple[str, str], tuple[int, int]]:
+    """Index scans of the current transaction, not flushed to pg_stat_user_indexes until it ends"""
+    result = await connection.execute(INDEX_SCANS, {"tables": list(TABLES)})
+    return {(row.relname, row.indexrelname): (row.idx_scan, row.size) for row in result}
+
+
+async def report(
+    engine: AsyncEngine, connection: AsyncConnection, medicine_policy: int, repeat: int
+) -> None:
+    now = datetime.now(UTC)
+    scans_before = await get_index_scans(connection)
+
+    for name, lookup in get_lookup_paths(medicine_policy, now).items():
+        # Joins the transaction of the connection and leaves it open on close
+        async with AsyncSession(bind=connection) as session:
+            with capture_statements(engine) as statements:
+                for _ in range(repeat):
+                    await lookup(session)
+            sys.stdout.write(f"{name}\n")
+            for statement, parameters in statements[: len(statements) // repeat]:
+                for node in await explain(session, statement, parameters):
+                    sys.stdout.write(f"    {node}\n")
+
+    scans_after = await get_index_scans(connection)
+    sys.stdout.write(f"\n{'index':<64} {'scans':>8} {'size, KiB':>10}\n")
+    for (table, index), (scans, size) in scans_after.items():
+        scans_before_report = scans_before.get((table, index), (0, 0))[0]
+        sys.stdout.write(
+            f"{table + '.' + index:<64} {scans - scans_before_report:>8} {size // 1024:>10}\n"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database-url",
+        default=os.environ.get("INDEX_USAGE_DATABASE_URL"),
+        help="Migrated database to seed and inspect, nothing is kept in it "
+        "(default: INDEX_USAGE_DATABASE_URL)",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--schedules-per-user", type=int, default=10)
+    parser.add_argument("--takings-per-schedule", type=int, default=8)
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="How many times every lookup path is run"
+    )
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("pass --database-url or set INDEX_USAGE_DATABASE_URL")
+    return args
+
+
+async def main() -> None:
+    args = parse_args()
+    engine = create_engine(args.database_url)
+    try:
+        async with engine.connect() as connection, connection.begin() as transaction:
+            await seed(connection, args.users, args.schedules_per_user, args.takings_per_schedule)
+            # A seeded user from the middle of the range
+            await report(
+                engine, connection, SEED_POLICY_OFFSET + max(1, args.users // 2), args.repeat
+            )
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,15 @@
+from src.workers.reminders import ReminderDispatcher, reminder_dispatcher
+from src.workers.schedule_archiver import ScheduleArchiver
+from src.workers.schedule_cache_invalidator import ScheduleCacheInvalidator
+from src.workers.schedule_feed import ScheduleFeed, schedule_feed
+from src.workers.upcoming_takings import UpcomingTakingsRefresher
+
+__all__ = [
+    "ReminderDispatcher",
+    "ScheduleArchiver",
+    "ScheduleCacheInvalidator",
+    "ScheduleFeed",
+    "UpcomingTakingsRefresher",
+    "reminder_dispatcher",
+    "schedule_feed",
+]
@@ -0,0 +1,212 @@
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+from uuid import UUID
+
+from src.api.v1.schedule.utils import MICROSECOND, iter_schedule_takings
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.database.connection import AsyncSessionMaker
+from src.repositories import ReminderOutboxRepository, ScheduleRepository
+from src.workers.timing_wheel import TimingWheel
+
+if TYPE_CHECKING:
+    from src.database.models.schedules import Schedules
+
+logger = get_logger(__name__)
+
+
+class DueTaking(NamedTuple):
+    """Taking that has come due"""
+
+    schedule_id: UUID
+    user_id: UUID
+    medicine_name: str
+    taking_time: datetime
+
+
+class ReminderSink(Protocol):
+    """Destination of due takings"""
+
+    async def emit(self, takings: list[DueTaking]) -> None: ...
+
+
+class LogReminderSink:
+    """Write due takings to the log"""
+
+    async def emit(self, takings: list[DueTaking]) -> None:
+        for taking in takings:
+            logger.info(
+                f"Taking of {taking.medicine_name} is due at {taking.taking_time}",
+                context={"schedule_id": str(taking.schedule_id), "user_id": str(taking.user_id)},
+            )
+
+
+class QueueReminderSink:
+    """Put due takings into an in-memory queue for in-process consumers"""
+
+    def __init__(self, queue: asyncio.Queue[DueTaking] | None = None) -> None:
+        self.queue: asyncio.Queue[DueTaking] = queue if queue is not None else asyncio.Queue()
+
+    async def emit(self, takings: list[DueTaking]) -> None:
+        for taking in takings:
+            self.queue.put_nowait(taking)
+
+
+class OutboxReminderSink:
+    """Store due takings in the reminder_outbox table for delivery by another process"""
+
+    async def emit(self, takings: list[DueTaking]) -> None:
+        async with AsyncSessionMaker() as session:
+            await ReminderOutboxRepository(session).add_many(takings)
+
+
+REMINDER_SINKS: dict[str, type[ReminderSink]] = {
+    "log": LogReminderSink,
+    "queue": QueueReminderSink,
+    "outbox": OutboxReminderSink,
+}
+
+
+class _Reminder(NamedTuple):
+    schedule: "Schedules"
+    # False for a wake-up to look for takings beyond the search horizon
+    is_due: bool
+
+
+class ReminderDispatcher:
+    """
+    In-process dispatcher emitting takings to a sink at the moment they come due.
+    Only the next taking of every active schedule is armed in a timing wheel,
+    the following one is computed when it fires.
+    Every app process runs its own dispatcher and emits its own events.
+    """
+
+    def __init__(
+        self,
+        sink: ReminderSink,
+        tick: timedelta = settings.REMINDER_TICK,
+        wheel_size: int = settings.REMINDER_WHEEL_SIZE,
+        horizon: timedelta = settings.REMINDER_HORIZON,
+    ) -> None:
+        self.sink = sink
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.horizon = horizon
+        self._wheel: TimingWheel[_Reminder] | None = None
+        # Latest reminder of every schedule, replaced ones are skipped when they expire
+        self._armed: dict[UUID, _Reminder] = {}
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._armed)
+
+    def __contains__(self, schedule_id: UUID) -> bool:
+        return schedule_id in self._armed
+
+    def arm(self, schedule: "Schedules", since: datetime | None = None) -> datetime | None:
+        """
+        Arm the first taking of the schedule at or after `since`, replacing the armed one.
+        Does nothing until the dispatcher is loaded.
+
+        Returns:
+            Time of the armed taking or None if there is nothing to arm
+        """
+        if self._wheel is None:
+            return None
+        if since is None:
+            since = datetime.now(UTC)
+
+        if schedule.end_date and schedule.end_date < since:
+            self._armed.pop(schedule.id, None)
+            return None
+
+        since = max(since, schedule.start_date)
+        until = since + self.horizon
+        taking_time = next(iter_schedule_takings(schedule, since, until, settings), None)
+        if taking_time is None:
+            if schedule.end_date and schedule.end_date <= until:
+                self._armed.pop(schedule.id, None)
+                return None
+            reminder, taking_time = _Reminder(schedule, is_due=False), until
+        else:
+            reminder = _Reminder(schedule, is_due=True)
+
+        self._armed[schedule.id] = reminder
+        self._wheel.insert(taking_time, reminder)
+        return taking_time
+
+    async def load(self, now: datetime | None = None) -> int:
+        """
+        Reset the timing wheel and arm all active schedules.
+
+        Returns:
+            Number of armed schedules
+        """
+        if now is None:
+            now = datetime.now(UTC)
+
+        self._wheel = TimingWheel(self.tick, self.wheel_size, now)
+        self._armed = {}
+        async with AsyncSessionMaker() as session:
+            schedules = await ScheduleRepository(session).get_active(now)
+
+        for schedule in schedules:
+            self.arm(schedule, now)
+        return len(self._armed)
+
+    async def dispatch(self, now: datetime) -> list[DueTaking]:
+        """Emit takings due by `now` to the sink and arm the following ones"""
+        if self._wheel is None:
+            return []
+
+        due: list[DueTaking] = []
+        for time, reminder in self._wheel.advance(now):
+            schedule = reminder.schedule
+            if self._armed.get(schedule.id) is not reminder:
+                continue
+
+            if reminder.is_due:
+                due.append(
+                    DueTaking(
+                        schedule_id=schedule.id,
+                        user_id=schedule.user_id,
+                        medicine_name=schedule.medicine_name,
+                        taking_time=time,
+                    )
+                )
+                self.arm(schedule, time + MICROSECOND)
+            else:
+                self.arm(schedule, time)
+
+        if due:
+            await self.sink.emit(due)
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick.total_seconds())
+            try:
+                await self.dispatch(datetime.now(UTC))
+            except Exception:
+                logger.exception("Error dispatching due takings")
+
+    async def start(self) -> None:
+        armed = await self.load()
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Reminder dispatcher started with {armed} armed schedules")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._wheel = None
+        self._armed = {}
+        logger.warning("Reminder dispatcher stopped")
+
+
+reminder_dispatcher = ReminderDispatcher(REMINDER_SINKS[settings.REMINDER_SINK]())
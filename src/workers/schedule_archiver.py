@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+
+from src.api.v1.schedule.cache import ScheduleCache, schedule_cache
+from src.api.v1.schedule.service import ScheduleService
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.database.connection import AsyncSessionMaker
+from src.repositories import (
+    ScheduleArchiveRepository,
+    ScheduleRepository,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+
+logger = get_logger(__name__)
+
+
+class ScheduleArchiver:
+    """Background task moving long-ended schedules out of the schedules table"""
+
+    def __init__(
+        self,
+        interval: timedelta = settings.SCHEDULE_ARCHIVE_INTERVAL,
+        schedule_cache: ScheduleCache | None = schedule_cache,
+    ) -> None:
+        self.interval = interval
+        self.schedule_cache = schedule_cache
+        self._task: asyncio.Task | None = None
+
+    async def archive(self) -> int:
+        async with AsyncSessionMaker() as session:
+            service = ScheduleService(
+                user_repo=UserRepository(session),
+                schedule_repo=ScheduleRepository(session),
+                upcoming_takings_repo=UpcomingTakingsRepository(session),
+                schedule_cache=self.schedule_cache,
+                schedule_archive_repo=ScheduleArchiveRepository(session),
+            )
+            return await service.archive_ended_schedules()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                archived = await self.archive()
+                logger.info(f"{archived} ended schedules archived")
+            except Exception:
+                logger.exception("Error archiving ended schedules")
+            await asyncio.sleep(self.interval.total_seconds())
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Schedule archiver started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.warning("Schedule archiver stopped")
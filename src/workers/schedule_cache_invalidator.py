@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from datetime import timedelta
+import json
+
+from asyncpg import Connection, PostgresError
+
+from src.api.v1.schedule.cache import ScheduleCache
+from src.core.cache import MemoryCacheBackend
+from src.core.logger import get_logger
+from src.repositories.schedule_archive_repo import SCHEDULES_ARCHIVED_CHANNEL
+from src.workers.schedule_feed import SCHEDULE_CREATED_CHANNEL, connect_listener
+
+logger = get_logger(__name__)
+
+
+class ScheduleCacheInvalidator:
+    """
+    Background task dropping the schedules of users cached in the memory of the process
+    when any process creates or archives schedules of them, from the notifications of the
+    schedules_notify_created trigger and of the archiver. Notifications are lost while
+    the connection is down, so the cache is cleared whenever it is (re)connected.
+    """
+
+    def __init__(
+        self,
+        schedule_cache: ScheduleCache,
+        connect: Callable[[], Awaitable[Connection]] = connect_listener,
+        reconnect_interval: timedelta = timedelta(seconds=5),
+    ) -> None:
+        self.schedule_cache = schedule_cache
+        self.reconnect_interval = reconnect_interval
+        self._connect = connect
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def is_needed(schedule_cache: ScheduleCache | None) -> bool:
+        """Shared backends are invalidated by the writing process itself"""
+        return schedule_cache is not None and isinstance(schedule_cache.backend, MemoryCacheBackend)
+
+    async def listen(self, connected: asyncio.Event | None = None) -> None:
+        """Invalidate the cache on notifications until the connection is lost"""
+        notifications: asyncio.Queue[str | None] = asyncio.Queue()
+        connection = await self._connect()
+        try:
+            connection.add_termination_listener(lambda _: notifications.put_nowait(None))
+            for channel in (SCHEDULE_CREATED_CHANNEL, SCHEDULES_ARCHIVED_CHANNEL):
+                await connection.add_listener(
+                    channel,
+                    lambda _connection, _pid, _channel, payload: notifications.put_nowait(payload),
+                )
+            self.schedule_cache.backend.clear()
+            if connected is not None:
+                connected.set()
+
+            while (payload := await notifications.get()) is not None:
+                await self.schedule_cache.invalidate(json.loads(payload)["medicine_policy"])
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.listen()
+                logger.warning("Schedule cache invalidator connection closed")
+            except (OSError, PostgresError) as e:
+                logger.warning(f"Schedule cache invalidator failed: {e!r}")
+            self.schedule_cache.backend.clear()
+            await asyncio.sleep(self.reconnect_interval.total_seconds())
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Schedule cache invalidator started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.warning("Schedule cache invalidator stopped")
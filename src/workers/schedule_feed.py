@@ -0,0 +1,164 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+import json
+from uuid import UUID
+
+import asyncpg
+from asyncpg import Connection, PostgresError
+
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.repositories.schedule_read_repo import (
+    SELECT_CHANGES_BY_IDS,
+    ScheduleChange,
+    to_schedule_change,
+)
+
+logger = get_logger(__name__)
+
+# Notified by the schedules_notify_created trigger once per statement and user,
+# with the medicine policy and the ids of the created schedules
+SCHEDULE_CREATED_CHANNEL = "schedule_created"
+
+
+class ScheduleFeedInterruptedError(Exception):
+    """The feed lost its connection or the subscriber fell behind, resume from the last change"""
+
+
+class ScheduleSubscription:
+    """Created schedules of a user, interrupted when more than max_pending are not consumed"""
+
+    def __init__(self, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self.is_interrupted = False
+        self._queue: asyncio.Queue[ScheduleChange | None] = asyncio.Queue()
+
+    def push(self, change: ScheduleChange) -> None:
+        if self.is_interrupted:
+            return
+        if self._queue.qsize() >= self.max_pending:
+            self.interrupt()
+            return
+        self._queue.put_nowait(change)
+
+    def interrupt(self) -> None:
+        if not self.is_interrupted:
+            self.is_interrupted = True
+            self._queue.put_nowait(None)
+
+    def __aiter__(self) -> "ScheduleSubscription":
+        return self
+
+    async def __anext__(self) -> ScheduleChange:
+        change = await self._queue.get()
+        if change is None:
+            raise ScheduleFeedInterruptedError
+        return change
+
+
+class ScheduleFeed:
+    """
+    One LISTEN connection per process fanning created schedules out to the subscribers
+    of their users. The connection is opened by the first subscriber, and the schedules
+    of a notification are read in one query and only when their user has subscribers.
+    """
+
+    def __init__(self, connect: Callable[[], Awaitable[Connection]], max_pending: int) -> None:
+        self._connect = connect
+        self.max_pending = max_pending
+        self._subscriptions: dict[int, set[ScheduleSubscription]] = {}
+        self._connection: Connection | None = None
+        self._notifications: asyncio.Queue[str | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, medicine_policy: int) -> AsyncGenerator[ScheduleSubscription, None]:
+        await self.start()
+        subscription = ScheduleSubscription(self.max_pending)
+        self._subscriptions.setdefault(medicine_policy, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions.get(medicine_policy, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(medicine_policy, None)
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._task is not None:
+                return
+
+            self._connection = await self._connect()
+            self._connection.add_termination_listener(self._on_termination)
+            await self._connection.add_listener(SCHEDULE_CREATED_CHANNEL, self._on_notification)
+            self._notifications = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+            logger.info("Schedule feed started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        await self._close()
+
+    def _on_notification(
+        self, _connection: Connection, _pid: int, _channel: str, payload: str
+    ) -> None:
+        self._notifications.put_nowait(payload)
+
+    def _on_termination(self, _connection: Connection) -> None:
+        logger.warning("Schedule feed connection closed")
+        self._notifications.put_nowait(None)
+
+    async def _run(self) -> None:
+        try:
+            while (payload := await self._notifications.get()) is not None:
+                notification = json.loads(payload)
+                subscriptions = self._subscriptions.get(notification["medicine_policy"])
+                if not subscriptions:
+                    continue
+
+                records = await self._connection.fetch(
+                    SELECT_CHANGES_BY_IDS,
+                    [UUID(schedule_id) for schedule_id in notification["ids"]],
+                )
+                for record in records:
+                    change = to_schedule_change(record)
+                    for subscription in subscriptions.copy():
+                        subscription.push(change)
+        except (OSError, PostgresError) as e:
+            logger.warning(f"Schedule feed failed: {e!r}")
+        finally:
+            self._task = None
+            await self._close()
+
+    async def _close(self) -> None:
+        """Close the connection and interrupt the subscribers, the next one reconnects"""
+        if self._connection is not None:
+            self._connection.remove_termination_listener(self._on_termination)
+            if not self._connection.is_closed():
+                await self._connection.close()
+            self._connection = None
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.interrupt()
+        self._subscriptions.clear()
+
+
+async def connect_listener() -> Connection:
+    # LISTEN works on the primary only
+    return await asyncpg.connect(
+        user=settings.DB_USER,
+        password=settings.DB_PASS,
+        host=settings.DB_HOST,
+        port=settings.DB_PORT,
+        database=settings.DB_NAME,
+        server_settings={"application_name": f"{settings.APP_NAME}-schedule-feed"},
+    )
+
+
+schedule_feed = ScheduleFeed(connect_listener, settings.SCHEDULE_FEED_MAX_PENDING)
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+import heapq
+from itertools import count
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class TimingWheel(Generic[T]):
+    """
+    Hashed timing wheel of `size` slots, each `tick` long.
+    Deadlines within one revolution are inserted and expired in O(1), entries further ahead
+    wait in an overflow heap until the wheel reaches them.
+    An entry expires on the first tick boundary at or after its deadline, never earlier.
+    """
+
+    def __init__(self, tick: timedelta, size: int, start: datetime) -> None:
+        self.tick = tick
+        self.size = size
+        self._origin = start
+        # Last expired tick, counted from the origin
+        self._current = 0
+        self._slots: list[list[tuple[datetime, T]]] = [[] for _ in range(size)]
+        self._overflow: list[tuple[int, int, datetime, T]] = []
+        self._sequence = count()
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _ceil_tick(self, time: datetime) -> int:
+        return -((self._origin - time) // self.tick)
+
+    def _floor_tick(self, time: datetime) -> int:
+        return (time - self._origin) // self.tick
+
+    def insert(self, time: datetime, item: T) -> None:
+        """Add an item expiring at `time`, past deadlines expire on the next tick"""
+        tick = max(self._ceil_tick(time), self._current + 1)
+        if tick - self._current <= self.size:
+            self._slots[tick % self.size].append((time, item))
+        else:
+            heapq.heappush(self._overflow, (tick, next(self._sequence), time, item))
+        self._length += 1
+
+    def advance(self, now: datetime) -> list[tuple[datetime, T]]:
+        """Move the wheel to `now` and return expired entries ordered by deadline"""
+        target = self._floor_tick(now)
+        if target <= self._current:
+            return []
+
+        expired: list[tuple[datetime, T]] = []
+        for tick in range(self._current + 1, min(target, self._current + self.size) + 1):
+            slot = tick % self.size
+            expired.extend(self._slots[slot])
+            self._slots[slot] = []
+        self._current = target
+
+        while self._overflow and self._overflow[0][0] - self._current <= self.size:
+            tick, _, time, item = heapq.heappop(self._overflow)
+            if tick <= self._current:
+                expired.append((time, item))
+            else:
+                self._slots[tick % self.size].append((time, item))
+
+        self._length -= len(expired)
+        expired.sort(key=lambda entry: entry[0])
+        return expired
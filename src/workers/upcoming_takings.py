@@ -0,0 +1,50 @@
+import asyncio
+from contextlib import suppress
+from datetime import timedelta
+
+from src.api.v1.schedule.service import ScheduleService
+from src.core.config import settings
+from src.core.logger import get_logger
+from src.database.connection import AsyncSessionMaker
+from src.repositories import ScheduleRepository, UpcomingTakingsRepository, UserRepository
+
+logger = get_logger(__name__)
+
+
+class UpcomingTakingsRefresher:
+    """Background task keeping upcoming_takings a rolling horizon ahead"""
+
+    def __init__(self, interval: timedelta = settings.UPCOMING_TAKINGS_REFRESH_INTERVAL) -> None:
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def refresh(self) -> int:
+        async with AsyncSessionMaker() as session:
+            service = ScheduleService(
+                user_repo=UserRepository(session),
+                schedule_repo=ScheduleRepository(session),
+                upcoming_takings_repo=UpcomingTakingsRepository(session),
+            )
+            return await service.refresh_upcoming_takings()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.refresh()
+                logger.info(f"Upcoming takings refreshed for {refreshed} schedules")
+            except Exception:
+                logger.exception("Error refreshing upcoming takings")
+            await asyncio.sleep(self.interval.total_seconds())
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        logger.info("Upcoming takings refresher started")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.warning("Upcoming takings refresher stopped")
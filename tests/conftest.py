@@ -17,6 +17,9 @@ if dotenv_path:
     dotenv.load_dotenv(dotenv_path)
 
 DB_ORIGINAL_NAME = os.environ["DB_NAME"]
+TEST_DB_NAME = "kd-schedule-test"
+# Stands in for a read replica: migrated like the test database but never written by the app
+TEST_REPLICA_DB_NAME = "kd-schedule-test-replica"
 
 
 @contextmanager
@@ -46,16 +49,20 @@ def get_db_cursor(dbname: str = "postgres"):
 
 def pytest_configure(config):
     """Configure test environment before any imports."""
-    os.environ["DB_NAME"] = "kd-schedule-test"
+    os.environ["DB_NAME"] = TEST_DB_NAME
 
     if dotenv_path:
-        dotenv.set_key(dotenv_path, "DB_NAME", "kd-schedule-test")
+        dotenv.set_key(dotenv_path, "DB_NAME", TEST_DB_NAME)
         dotenv.load_dotenv(dotenv_path, override=True)
 
     with get_db_cursor() as cur:
-        cur.execute('DROP DATABASE IF EXISTS "kd-schedule-test"')
-        cur.execute('CREATE DATABASE "kd-schedule-test"')
+        for dbname in (TEST_DB_NAME, TEST_REPLICA_DB_NAME):
+            cur.execute(f'DROP DATABASE IF EXISTS "{dbname}"')
+            cur.execute(f'CREATE DATABASE "{dbname}"')
 
+    os.environ["DB_NAME"] = TEST_REPLICA_DB_NAME
+    command.upgrade(alembic_cfg, "head")
+    os.environ["DB_NAME"] = TEST_DB_NAME
     command.upgrade(alembic_cfg, "head")
 
 
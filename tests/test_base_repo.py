@@ -0,0 +1,93 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, inspect
+
+from src.api.v1.schedule.schemas import SScheduleCreate, SUserCreate
+from src.database.connection import AsyncSessionMaker, engine
+from src.repositories import (
+    LoadStrategy,
+    Relation,
+    ScheduleRepository,
+    UserRepository,
+)
+
+MEDICINE_POLICY = 64859
+SCHEDULES = 3
+
+
+class StatementCounter:
+    def __init__(self) -> None:
+        self.statements = 0
+
+    def __call__(self, *_: object) -> None:
+        self.statements += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(engine.sync_engine, "after_cursor_execute", self)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        event.remove(engine.sync_engine, "after_cursor_execute", self)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_relation_strategies() -> None:
+    now = datetime.now(UTC)
+    async with AsyncSessionMaker() as session:
+        user = await UserRepository(session).create(
+            SUserCreate(name="Relations User", medicine_policy=MEDICINE_POLICY)
+        )
+        for index in range(SCHEDULES):
+            await ScheduleRepository(session).create(
+                SScheduleCreate(
+                    medicine_name=f"Relations Medicine {index}",
+                    frequency=15,
+                    start_date=now,
+                    end_date=now + timedelta(days=1),
+                    user_id=user.id,
+                )
+            )
+
+    for strategy, statements in (
+        (LoadStrategy.JOINED, 1),
+        (LoadStrategy.SELECTIN, 2),
+        (LoadStrategy.SUBQUERY, 2),
+    ):
+        async with AsyncSessionMaker() as session:
+            with StatementCounter() as counter:
+                users = await UserRepository(session).get_all_with_relations(
+                    [Relation("schedules", strategy)], medicine_policy=MEDICINE_POLICY
+                )
+            assert len(users) == 1
+            assert len(users[0].schedules) == SCHEDULES
+            assert counter.statements == statements
+
+    async with AsyncSessionMaker() as session:
+        users = await UserRepository(session).get_all_with_relations(
+            [Relation("schedules", LoadStrategy.NOLOAD)], medicine_policy=MEDICINE_POLICY
+        )
+        assert users[0].schedules == []
+
+    async with AsyncSessionMaker() as session:
+        users = await UserRepository(session).get_all_with_relations(
+            [Relation("schedules", LoadStrategy.RAISE)], medicine_policy=MEDICINE_POLICY
+        )
+        with pytest.raises(Exception, match="raise"):
+            _ = users[0].schedules
+
+    async with AsyncSessionMaker() as session:
+        users = await UserRepository(session).get_all_with_relations(
+            [Relation("schedules", LoadStrategy.SELECTIN, ("id", "medicine_name"))],
+            columns=("id",),
+            medicine_policy=MEDICINE_POLICY,
+        )
+        assert "name" in inspect(users[0]).unloaded
+        schedule = users[0].schedules[0]
+        assert "frequency" in inspect(schedule).unloaded
+        assert "medicine_name" not in inspect(schedule).unloaded
+
+    # Names keep loading with a join, deduplicated for a single record too
+    async with AsyncSessionMaker() as session:
+        loaded = await UserRepository(session).get_by_id_with_relations(user.id, ["schedules"])
+        assert len(loaded.schedules) == SCHEDULES
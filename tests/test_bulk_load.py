@@ -0,0 +1,174 @@
+from datetime import UTC, datetime, timedelta
+import json
+from pathlib import Path
+import random
+
+import numpy as np
+import pytest
+
+from src.api.v1.schedule.batch import round_to_multiple_array
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.api.v1.schedule.utils import round_to_multiple
+from src.database.connection import AsyncSessionMaker
+from src.repositories import ScheduleRepository
+from src.tools.bulk_load import load, normalize_requests
+
+MEDICINE_POLICY = 97531
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def test_round_to_multiple_array() -> None:
+    values = np.arange(-100, 2000)
+    assert (
+        np.maximum(round_to_multiple_array(values), 15)[values > 0]
+        == [round_to_multiple(value) for value in values[values > 0]]
+    ).all()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_normalize_requests_matches_service(seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime(2025, 3, 1, 12, 7, 31, tzinfo=UTC)
+    requests = []
+    for line in range(1, 301):
+        start_date = rng.choice(
+            [
+                None,
+                now
+                + timedelta(
+                    seconds=rng.randint(-(10**7), 10**7), microseconds=rng.randint(0, 999_999)
+                ),
+            ]
+        )
+        end_date = rng.choice([None, EPOCH, now + timedelta(seconds=rng.randint(-(10**7), 10**7))])
+        duration = rng.choice([None, timedelta(0), timedelta(minutes=rng.randint(-100, 10**5))])
+        requests.append(
+            (
+                line,
+                SScheduleCreateRequest(
+                    medicine_policy=MEDICINE_POLICY,
+                    medicine_name="Bulk Load Medicine",
+                    frequency=rng.randint(1, 2000),
+                    start_date=start_date,
+                    end_date=end_date,
+                    duration=duration,
+                ),
+            )
+        )
+
+    records, rejects = normalize_requests(requests, now)
+
+    expected_records = []
+    expected_rejects = []
+    for line, request in requests:
+        try:
+            start_date, end_date = ScheduleService.get_schedule_period(
+                request.model_copy(update={"start_date": request.start_date or now})
+            )
+        except ValueError as e:
+            expected_rejects.append((line, str(e)))
+        else:
+            expected_records.append(
+                (
+                    line,
+                    round_to_multiple(request.frequency, 15),
+                    (start_date - EPOCH) // timedelta(microseconds=1),
+                    (end_date - EPOCH) // timedelta(microseconds=1),
+                )
+            )
+
+    assert [(record[0], *record[4:]) for record in records] == expected_records
+    assert sorted(rejects) == expected_rejects
+
+
+def test_normalize_requests_rejects_out_of_range() -> None:
+    now = datetime(2025, 3, 1, 12, 7, tzinfo=UTC)
+    fields = {
+        "medicine_policy": MEDICINE_POLICY,
+        "medicine_name": "Bulk Load Medicine",
+        "frequency": 60,
+        "start_date": None,
+        "end_date": None,
+        "duration": timedelta(days=1),
+        "name": None,
+    }
+    # Constructed without validation, as the schema bounds would reject them first
+    requests = [
+        (1, SScheduleCreateRequest.model_construct(**fields)),
+        (2, SScheduleCreateRequest.model_construct(**{**fields, "frequency": 10000000005})),
+        (3, SScheduleCreateRequest.model_construct(**{**fields, "medicine_policy": 2**31})),
+    ]
+
+    records, rejects = normalize_requests(requests, now)
+
+    assert [record[0] for record in records] == [1]
+    assert rejects == [
+        (2, "frequency and medicine_policy must not exceed 2147483647"),
+        (3, "frequency and medicine_policy must not exceed 2147483647"),
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestBulkLoad:
+    @pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+    async def test_load(self, tmp_path: Path, file_format: str) -> None:
+        medicine_policy = MEDICINE_POLICY + (0 if file_format == "csv" else 10)
+        rows = [
+            {
+                "name": "Bulk Load User",
+                "medicine_policy": medicine_policy + index % 3,
+                "medicine_name": f"Bulk Load Medicine {index}",
+                "frequency": 50,
+                "start_date": "2025-03-01T10:07:00",
+                "duration": "P1D",
+            }
+            for index in range(10)
+        ]
+        rows[4]["duration"] = ""
+        rows[7]["frequency"] = "0"
+        # Beyond the integer columns, would abort the COPY
+        rows[8]["medicine_policy"] = 10000000005
+
+        path = tmp_path / f"schedules.{file_format}"
+        if file_format == "csv":
+            fields = list(rows[0])
+            path.write_text(
+                "\n".join(
+                    [",".join(fields)]
+                    + [",".join(str(row[field]) for field in fields) for row in rows]
+                )
+            )
+        else:
+            path.write_text(
+                "\n".join(
+                    json.dumps({field: value for field, value in row.items() if value != ""})
+                    for row in rows
+                )
+            )
+        rejects_path = tmp_path / "rejects.csv"
+
+        stats = await load(path, file_format, 4, rejects_path)
+
+        assert (stats.rows, stats.users, stats.schedules, stats.rejected) == (10, 3, 7, 3)
+        first_line = 2 if file_format == "csv" else 1
+        assert rejects_path.read_text().splitlines()[1:] == [
+            f"{first_line + 4},Either end_date or duration must be provided",
+            f"{first_line + 7},frequency: Input should be greater than 0",
+            f"{first_line + 8},medicine_policy: Input should be less than or equal to 2147483647",
+        ]
+        async with AsyncSessionMaker() as session:
+            schedules = await ScheduleRepository(session).get_active_by_medicine_policy(
+                medicine_policy, datetime(2025, 3, 1, tzinfo=UTC), datetime(2025, 3, 2, tzinfo=UTC)
+            )
+        assert sorted(schedule.medicine_name for schedule in schedules) == [
+            "Bulk Load Medicine 0",
+            "Bulk Load Medicine 3",
+            "Bulk Load Medicine 6",
+            "Bulk Load Medicine 9",
+        ]
+        assert {
+            (schedule.frequency, schedule.start_date, schedule.end_date) for schedule in schedules
+        } == {
+            (45, datetime(2025, 3, 1, 10, 0, tzinfo=UTC), datetime(2025, 3, 2, 10, 7, tzinfo=UTC))
+        }
@@ -0,0 +1,58 @@
+from httpx import ASGITransport, AsyncClient
+import pytest
+from sqlalchemy import text
+
+from src.core.config import settings
+from src.core.metrics import PROMETHEUS_MEDIA_TYPE, Histogram
+from src.database.connection import engine
+from src.main import app
+
+
+def test_histogram_render() -> None:
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert list(histogram.render("wait_seconds", {"pool": "primary"})) == [
+        'wait_seconds_bucket{pool="primary",le="0.1"} 2',
+        'wait_seconds_bucket{pool="primary",le="1.0"} 3',
+        'wait_seconds_bucket{pool="primary",le="+Inf"} 4',
+        'wait_seconds_sum{pool="primary"} 3.65',
+        'wait_seconds_count{pool="primary"} 4',
+    ]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_engine_settings() -> None:
+    assert engine.pool.size() == settings.DB_POOL_SIZE
+    async with engine.connect() as connection:
+        application_name = await connection.scalar(text("SHOW application_name"))
+        raw_connection = await connection.get_raw_connection()
+        statement_cache = raw_connection.driver_connection._stmt_cache
+
+    assert application_name == settings.APP_NAME
+    assert statement_cache.get_max_size() == settings.DB_STATEMENT_CACHE_SIZE
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_pool_metrics() -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == PROMETHEUS_MEDIA_TYPE
+    samples = dict(
+        line.rsplit(" ", 1) for line in response.text.splitlines() if not line.startswith("#")
+    )
+    assert samples['db_pool_size{pool="primary"}'] == str(settings.DB_POOL_SIZE)
+    assert 'db_pool_checked_out{pool="primary"}' in samples
+    assert int(samples['db_pool_wait_seconds_count{pool="primary"}']) >= 1
+    assert samples['db_pool_wait_seconds_bucket{pool="primary",le="+Inf"}'] == (
+        samples['db_pool_wait_seconds_count{pool="primary"}']
+    )
+    # Without a configured replica both engines share the pool
+    assert not any('pool="replica"' in sample for sample in samples)
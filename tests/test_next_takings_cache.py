@@ -0,0 +1,115 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.api.v1.schedule import service as service_module
+from src.api.v1.schedule.cache import NextTakingsCache, get_quarter_hour_tick
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.database.connection import AsyncSessionMaker
+from src.repositories import (
+    ScheduleReadRepository,
+    ScheduleRepository,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+
+MEDICINE_POLICY = 64297
+HOUR = timedelta(hours=1)
+
+
+def test_get_quarter_hour_tick() -> None:
+    boundary = datetime(2025, 3, 1, 10, 15, tzinfo=UTC)
+
+    assert get_quarter_hour_tick(boundary) is None
+    assert (
+        get_quarter_hour_tick(boundary + timedelta(microseconds=1))
+        == get_quarter_hour_tick(boundary + timedelta(minutes=14, seconds=59))
+        == get_quarter_hour_tick(boundary - timedelta(minutes=1)) + 1
+    )
+    assert NextTakingsCache.is_cacheable(timedelta(hours=2, minutes=45))
+    assert not NextTakingsCache.is_cacheable(timedelta(minutes=50))
+
+
+def test_cache_expiry_eviction_and_invalidation() -> None:
+    cache = NextTakingsCache(max_weight=6)
+    takings = [{"next_taking_time": index} for index in range(2)]
+
+    cache.set(1, HOUR, 100, takings)
+    assert cache.get(1, HOUR, 100) == takings
+    # Expired at the next quarter hour
+    assert cache.get(1, HOUR, 101) is None
+    assert cache.weight == 0
+
+    cache.set(1, HOUR, 101, takings)
+    cache.set(2, HOUR, 101, takings)
+    assert cache.get(1, HOUR, 101) == takings
+    # The least recently used entry of user 2 makes room
+    cache.set(3, HOUR, 101, [])
+    cache.set(1, 2 * HOUR, 101, [])
+    assert cache.get(2, HOUR, 101) is None
+    assert cache.weight == 5
+
+    cache.invalidate(1)
+    assert cache.get(1, HOUR, 101) is None
+    assert cache.get(1, 2 * HOUR, 101) is None
+    assert cache.get(3, HOUR, 101) == []
+    assert cache.weight == 1
+
+    # Entries heavier than the cache are not stored
+    cache.set(4, HOUR, 101, [{}] * 6)
+    assert cache.get(4, HOUR, 101) is None
+    assert (cache.hits, cache.misses) == (3, 5)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_service_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Within a quarter hour and within the allowed hours of the day
+    frozen_now = datetime.now(UTC).replace(hour=12, minute=7, second=0, microsecond=0)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz: object = None) -> datetime:  # noqa: ARG003
+            return frozen_now
+
+    monkeypatch.setattr(service_module, "datetime", FrozenDatetime)
+    cache = NextTakingsCache(max_weight=1000)
+
+    async def create_schedule(medicine_name: str) -> None:
+        async with AsyncSessionMaker() as session:
+            await ScheduleService(
+                user_repo=UserRepository(session),
+                schedule_repo=ScheduleRepository(session),
+                upcoming_takings_repo=UpcomingTakingsRepository(session),
+                next_takings_cache=cache,
+            ).create_schedule(
+                SScheduleCreateRequest(
+                    name="Cached Takings User",
+                    medicine_policy=MEDICINE_POLICY,
+                    medicine_name=medicine_name,
+                    frequency=15,
+                    duration=timedelta(days=1),
+                )
+            )
+
+    async def get_next_takings() -> list[str]:
+        async with AsyncSessionMaker() as session:
+            takings = await ScheduleService(
+                user_repo=UserRepository(session),
+                schedule_repo=ScheduleRepository(session),
+                upcoming_takings_repo=UpcomingTakingsRepository(session),
+                schedule_read_repo=ScheduleReadRepository(session),
+                next_takings_cache=cache,
+            ).get_next_takings(MEDICINE_POLICY, HOUR)
+        return [taking["schedule"].medicine_name for taking in takings]
+
+    await create_schedule("Cached Medicine 1")
+    first = await get_next_takings()
+    assert first
+    assert set(first) == {"Cached Medicine 1"}
+    assert await get_next_takings() == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await create_schedule("Cached Medicine 2")
+    assert set(await get_next_takings()) == {"Cached Medicine 1", "Cached Medicine 2"}
+    assert (cache.hits, cache.misses) == (1, 2)
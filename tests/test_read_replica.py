@@ -0,0 +1,112 @@
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+
+from httpx import ASGITransport, AsyncClient
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.api.v1.schedule import dependencies
+from src.core.config import settings
+from src.database import connection
+from src.database.connection import AsyncSessionMaker, SessionRouter, create_engine
+from src.main import app
+
+MEDICINE_POLICY = 75319
+STICKY_WINDOW = timedelta(seconds=5)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_session_router_stickiness() -> None:
+    clock = Clock()
+    primary = async_sessionmaker()
+    replica = async_sessionmaker()
+    router = SessionRouter(primary, replica, STICKY_WINDOW, clock)
+
+    assert router.get_reader(1) is replica
+    router.mark_written(1)
+    clock.now = 4.9
+    assert router.get_reader(1) is primary
+    assert router.get_reader(2) is replica
+
+    router.mark_written(2)
+    clock.now = 5
+    assert router.get_reader(1) is replica
+    assert router.get_reader(2) is primary
+
+    clock.now = 10
+    router.mark_written(3)
+    assert list(router._written_at) == [3]
+
+    # Without a replica there is nothing to stick to
+    router = SessionRouter(primary, primary, STICKY_WINDOW, clock)
+    router.mark_written(1)
+    assert router.get_reader(1) is primary
+    assert not router._written_at
+
+
+@pytest_asyncio.fixture
+async def replica_clock(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[Clock, None]:
+    """
+    Route reads to the replica test database, which the app never writes to.
+    The schedule cache would serve reads of the primary, so it is disabled.
+    """
+    monkeypatch.setattr(dependencies, "schedule_cache", None)
+    replica_settings = settings.model_copy(update={"REPLICA_DB_NAME": "kd-schedule-test-replica"})
+    replica_engine = create_engine(replica_settings.REPLICA_DATABASE_URL)
+    clock = Clock()
+    monkeypatch.setattr(
+        connection,
+        "session_router",
+        SessionRouter(
+            AsyncSessionMaker,
+            async_sessionmaker(replica_engine, expire_on_commit=False),
+            STICKY_WINDOW,
+            clock,
+        ),
+    )
+    yield clock
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_reads_follow_writes(replica_clock: Clock) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/schedule",
+            json={
+                "name": "Replica User",
+                "medicine_policy": MEDICINE_POLICY,
+                "medicine_name": "Replica Medicine",
+                "frequency": 60,
+                "duration": "P1D",
+            },
+        )
+        assert response.status_code == 200
+        schedule_id = response.json()["data"]["schedule_id"]
+        params = {"user_id": MEDICINE_POLICY, "schedule_id": schedule_id}
+
+        # Sticky to the primary right after the write
+        replica_clock.now = 1
+        response = await client.get("/api/v1/schedule", params=params)
+        assert response.status_code == 200
+        assert response.json()["data"]["schedule_id"] == schedule_id
+
+        # Routed to the replica afterwards, where the write never arrives
+        replica_clock.now = 10
+        for path, path_params in (
+            ("/api/v1/schedule", params),
+            ("/api/v1/schedules", {"user_id": MEDICINE_POLICY}),
+            ("/api/v1/next_takings", {"user_id": MEDICINE_POLICY}),
+        ):
+            response = await client.get(path, params=path_params)
+            assert response.status_code == 404
+            assert "medicine_policy" in response.json()["detail"]
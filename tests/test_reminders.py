@@ -0,0 +1,152 @@
+from datetime import UTC, datetime, time, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.api.v1.schedule.utils import find_schedule_takings
+from src.core.config import settings
+from src.database.connection import AsyncSessionMaker
+from src.database.models import ReminderOutbox
+from src.repositories import ScheduleRepository, UpcomingTakingsRepository, UserRepository
+from src.workers.reminders import (
+    DueTaking,
+    OutboxReminderSink,
+    QueueReminderSink,
+    ReminderDispatcher,
+)
+from src.workers.timing_wheel import TimingWheel
+
+MEDICINE_POLICY = 65432
+START = datetime.combine(datetime.now(UTC).date() + timedelta(days=1), time(10, 0), tzinfo=UTC)
+
+
+class TestTimingWheel:
+    def test_expires_in_deadline_order(self) -> None:
+        wheel: TimingWheel[str] = TimingWheel(timedelta(seconds=1), 60, START)
+        wheel.insert(START + timedelta(seconds=30), "b")
+        wheel.insert(START + timedelta(seconds=10, milliseconds=500), "a")
+        wheel.insert(START + timedelta(hours=2), "overflow")
+        assert len(wheel) == 3
+
+        assert wheel.advance(START + timedelta(seconds=10)) == []
+        assert [item for _, item in wheel.advance(START + timedelta(seconds=11))] == ["a"]
+        assert [item for _, item in wheel.advance(START + timedelta(minutes=5))] == ["b"]
+        assert wheel.advance(START + timedelta(hours=1, minutes=59, seconds=59)) == []
+        assert wheel.advance(START + timedelta(hours=2)) == [
+            (START + timedelta(hours=2), "overflow")
+        ]
+        assert len(wheel) == 0
+
+    def test_past_deadline_expires_on_next_tick(self) -> None:
+        wheel: TimingWheel[str] = TimingWheel(timedelta(seconds=1), 60, START)
+        wheel.advance(START + timedelta(seconds=5))
+        wheel.insert(START, "late")
+        assert [item for _, item in wheel.advance(START + timedelta(seconds=6))] == ["late"]
+
+    def test_long_jump_expires_everything(self) -> None:
+        wheel: TimingWheel[int] = TimingWheel(timedelta(seconds=1), 10, START)
+        for second in range(0, 100, 7):
+            wheel.insert(START + timedelta(seconds=second), second)
+        assert [item for _, item in wheel.advance(START + timedelta(days=1))] == list(
+            range(0, 100, 7)
+        )
+
+
+def make_service(session: AsyncSession, dispatcher: ReminderDispatcher | None) -> ScheduleService:
+    return ScheduleService(
+        user_repo=UserRepository(session),
+        schedule_repo=ScheduleRepository(session),
+        upcoming_takings_repo=UpcomingTakingsRepository(session),
+        reminder_dispatcher=dispatcher,
+    )
+
+
+def create_request(medicine_name: str, frequency: int) -> SScheduleCreateRequest:
+    return SScheduleCreateRequest(
+        name="Reminders User",
+        medicine_policy=MEDICINE_POLICY,
+        medicine_name=medicine_name,
+        frequency=frequency,
+        start_date=START,
+        duration=timedelta(days=1),
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestReminderDispatcher:
+    async def test_loaded_and_created_schedules_fire(self) -> None:
+        sink = QueueReminderSink()
+        dispatcher = ReminderDispatcher(sink, timedelta(seconds=1), 3600)
+
+        async with AsyncSessionMaker() as session:
+            service = make_service(session, dispatcher)
+            # Not loaded yet, so the schedule is armed by the load below
+            loaded_id = await service.create_schedule(create_request("Loaded Medicine", 60))
+            await dispatcher.load(START - timedelta(hours=1))
+            created_id = await service.create_schedule(create_request("Created Medicine", 30))
+
+        own = {loaded_id, created_id}
+
+        def own_takings(due: list[DueTaking]) -> list[tuple[str, datetime]]:
+            return sorted((t.medicine_name, t.taking_time) for t in due if t.schedule_id in own)
+
+        assert own_takings(await dispatcher.dispatch(START - timedelta(seconds=1))) == []
+        assert own_takings(await dispatcher.dispatch(START)) == [
+            ("Created Medicine", START),
+            ("Loaded Medicine", START),
+        ]
+        assert own_takings(await dispatcher.dispatch(START + timedelta(minutes=30))) == [
+            ("Created Medicine", START + timedelta(minutes=30)),
+        ]
+
+        emitted = []
+        while not sink.queue.empty():
+            emitted.append(sink.queue.get_nowait())
+        assert len(own_takings(emitted)) == 3
+
+        # Jumping over the night gap, every remaining taking fires once
+        async with AsyncSessionMaker() as session:
+            schedules = [
+                await ScheduleRepository(session).get_by_id(schedule_id) for schedule_id in own
+            ]
+        expected = sorted(
+            (schedule.medicine_name, taking_time)
+            for schedule in schedules
+            for taking_time in find_schedule_takings(
+                schedule, START + timedelta(minutes=31), START + timedelta(days=2), settings
+            )
+        )
+        due = []
+        for hours in range(1, 49):
+            due += await dispatcher.dispatch(START + timedelta(hours=hours))
+        assert own_takings(due) == expected
+        assert loaded_id not in dispatcher
+        assert created_id not in dispatcher
+
+    async def test_outbox_sink(self) -> None:
+        async with AsyncSessionMaker() as session:
+            service = make_service(session, None)
+            schedule_id = await service.create_schedule(create_request("Outbox Medicine", 15))
+            schedule = await ScheduleRepository(session).get_by_id(schedule_id)
+
+        taking = DueTaking(schedule_id, schedule.user_id, schedule.medicine_name, START)
+        sink = OutboxReminderSink()
+        await sink.emit([taking])
+        await sink.emit([taking])
+
+        async with AsyncSessionMaker() as session:
+            rows = (
+                (
+                    await session.execute(
+                        select(ReminderOutbox).where(ReminderOutbox.schedule_id == schedule_id)
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        assert [(row.medicine_name, row.taking_time) for row in rows] == [
+            ("Outbox Medicine", START)
+        ]
@@ -1,5 +1,5 @@
 from collections.abc import AsyncGenerator
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
 from typing import Any
 import uuid
 
@@ -47,6 +47,15 @@ class TestScheduleAPI:
 
         assert len(schedules_ids) >= 1
         assert schedule_id in schedules_ids
+        assert schedules_ids == sorted(schedules_ids, key=uuid.UUID)
+
+        # Step 2.1: Page through the schedules ids
+        pages = []
+        params: dict[str, Any] = {"limit": 1}
+        while page := await self._get_schedules_ids(async_client, get_test_user, **params):
+            pages.extend(page)
+            params["after_id"] = page[-1]
+        assert pages == schedules_ids
 
         # Step 3: Get the schedule
         schedule: dict[str, Any] = await self._get_schedule(
@@ -75,6 +84,21 @@ class TestScheduleAPI:
         # Probably beacuse of rounding the start_date (but this case is handled by the tests/test_schedule_utils.py::test_schedule_start_in_interval)
         # assert len(next_takings) >= 1
 
+        # Step 5: Get the first next taking only
+        first_takings = await self._get_next_takings(async_client, get_test_user, limit=1)
+        assert len(first_takings) <= 1
+
+        # Step 6: Get the calendar for the whole schedule
+        calendar = await self._get_calendar(
+            async_client,
+            get_test_user,
+            get_test_medicine.start_date.date(),
+            get_test_medicine.end_date.date(),
+        )
+        assert schedule_id in {taking["schedule_id"] for taking in calendar}
+        taking_times = [datetime.fromisoformat(taking["taking_time"]) for taking in calendar]
+        assert taking_times == sorted(taking_times)
+
     @staticmethod
     async def _create_schedule(
         client: AsyncClient, test_user: UserTest, test_medicine: MedicineTest, use_end_time: bool
@@ -97,8 +121,12 @@ class TestScheduleAPI:
         return response.json()["data"]["schedule_id"]
 
     @staticmethod
-    async def _get_schedules_ids(client: AsyncClient, test_user: UserTest) -> list[str]:
-        response = await client.get(f"/api/v1/schedules?user_id={test_user.medicine_policy}")
+    async def _get_schedules_ids(
+        client: AsyncClient, test_user: UserTest, **params: Any
+    ) -> list[str]:
+        response = await client.get(
+            "/api/v1/schedules", params={"user_id": test_user.medicine_policy, **params}
+        )
         assert response.status_code == 200
         return response.json()["data"]
 
@@ -113,11 +141,25 @@ class TestScheduleAPI:
         return response.json()["data"]
 
     @staticmethod
-    async def _get_next_takings(client: AsyncClient, test_user: UserTest) -> list[dict[str, Any]]:
+    async def _get_next_takings(
+        client: AsyncClient, test_user: UserTest, limit: int | None = None
+    ) -> list[dict[str, Any]]:
         interval = timedelta(hours=2)
         interval = TIMEDELTA_ADAPTER.dump_python(interval, mode="json")
+        url = f"/api/v1/next_takings?user_id={test_user.medicine_policy}&next_takings={interval}"
+        if limit is not None:
+            url += f"&limit={limit}"
+        response = await client.get(url)
+        assert response.status_code == 200
+        return response.json()["data"]
+
+    @staticmethod
+    async def _get_calendar(
+        client: AsyncClient, test_user: UserTest, start_date: date, end_date: date
+    ) -> list[dict[str, Any]]:
         response = await client.get(
-            f"/api/v1/next_takings?user_id={test_user.medicine_policy}&next_takings={interval}"
+            f"/api/v1/calendar?user_id={test_user.medicine_policy}"
+            f"&start_date={start_date.isoformat()}&end_date={end_date.isoformat()}"
         )
         assert response.status_code == 200
         return response.json()["data"]
@@ -0,0 +1,152 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+import json
+from uuid import UUID
+
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import select
+
+from src.api.v1.schedule.cache import ScheduleCache
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.core.cache import MemoryCacheBackend
+from src.core.config import settings
+from src.database.connection import AsyncSessionMaker
+from src.database.models import Schedules, SchedulesArchive
+from src.repositories import (
+    ScheduleArchiveRepository,
+    ScheduleReadRepository,
+    ScheduleRepository,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+from src.repositories.schedule_archive_repo import SCHEDULES_ARCHIVED_CHANNEL
+from src.workers import ScheduleArchiver
+from src.workers.schedule_feed import connect_listener
+
+MEDICINE_POLICY = 64733
+# Far enough back not to archive schedules of the other tests
+ARCHIVE_AFTER = timedelta(days=3650)
+
+
+def make_service(session: object, schedule_cache: ScheduleCache | None = None) -> ScheduleService:
+    return ScheduleService(
+        user_repo=UserRepository(session),
+        schedule_repo=ScheduleRepository(session),
+        upcoming_takings_repo=UpcomingTakingsRepository(session),
+        schedule_read_repo=ScheduleReadRepository(session),
+        schedule_cache=schedule_cache,
+        schedule_archive_repo=ScheduleArchiveRepository(session),
+    )
+
+
+async def create_schedule(start_date: datetime, end_date: datetime) -> UUID:
+    async with AsyncSessionMaker() as session:
+        return await make_service(session).create_schedule(
+            SScheduleCreateRequest(
+                name="Archive User",
+                medicine_policy=MEDICINE_POLICY,
+                medicine_name=f"Archive Medicine {end_date.year}",
+                frequency=60,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_archive_ended_schedules(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SCHEDULE_ARCHIVE_AFTER", ARCHIVE_AFTER)
+    monkeypatch.setattr(settings, "SCHEDULE_ARCHIVE_BATCH_SIZE", 1)
+    now = datetime.now(UTC)
+    ended_at = now - ARCHIVE_AFTER - timedelta(days=10)
+    ended_ids = {
+        await create_schedule(ended_at - timedelta(days=days), ended_at - timedelta(days=days - 1))
+        for days in (2, 3)
+    }
+    recent_id = await create_schedule(now - timedelta(days=1), now + timedelta(days=1))
+
+    cache = ScheduleCache(MemoryCacheBackend(max_entries=100, ttl=timedelta(minutes=1)))
+    async with AsyncSessionMaker() as session:
+        schedule_ids = await make_service(session, cache).get_schedules_ids_by_policy(
+            MEDICINE_POLICY
+        )
+        assert set(schedule_ids) == {recent_id, *ended_ids}
+
+    notifications: asyncio.Queue[str] = asyncio.Queue()
+    listener = await connect_listener()
+    await listener.add_listener(
+        SCHEDULES_ARCHIVED_CHANNEL, lambda *args: notifications.put_nowait(args[-1])
+    )
+    try:
+        assert await ScheduleArchiver(schedule_cache=cache).archive() == 2
+        # One notification per batch of the user
+        for _ in range(2):
+            payload = await asyncio.wait_for(notifications.get(), 5)
+            assert json.loads(payload) == {"medicine_policy": MEDICINE_POLICY}
+    finally:
+        await listener.close()
+
+    async with AsyncSessionMaker() as session:
+        assert not (
+            await session.scalars(select(Schedules).where(Schedules.id.in_(ended_ids)))
+        ).all()
+        archived = (
+            await session.scalars(
+                select(SchedulesArchive).where(SchedulesArchive.id.in_(ended_ids))
+            )
+        ).all()
+        assert {schedule.id for schedule in archived} == ended_ids
+
+        service = make_service(session)
+        assert await service.get_schedules_ids_by_policy(MEDICINE_POLICY) == [recent_id]
+        all_ids = sorted({recent_id, *ended_ids})
+        assert (
+            await service.get_schedules_ids_by_policy(MEDICINE_POLICY, include_archived=True)
+            == all_ids
+        )
+        assert (
+            await service.get_schedules_ids_by_policy(
+                MEDICINE_POLICY, all_ids[0], 1, include_archived=True
+            )
+            == all_ids[1:2]
+        )
+        # The cached schedules were dropped with the archived batches
+        assert (
+            await make_service(session, cache).get_schedules_ids_by_policy(
+                MEDICINE_POLICY, include_archived=True
+            )
+            == all_ids
+        )
+
+        ended_id = min(ended_ids)
+        with pytest.raises(HTTPException):
+            await service.get_schedule_by_id(MEDICINE_POLICY, ended_id)
+        schedule = await service.get_schedule_by_id(
+            MEDICINE_POLICY, ended_id, include_archived=True
+        )
+        assert schedule.id == ended_id
+
+        # Periods reaching back past SCHEDULE_ARCHIVE_AFTER read the archive
+        active = await service.get_active_schedules_by_policy(
+            MEDICINE_POLICY, ended_at - timedelta(days=5), now
+        )
+        assert {schedule.id for schedule in active} == {recent_id, *ended_ids}
+        active = await service.get_active_schedules_by_policy(
+            MEDICINE_POLICY, now - timedelta(hours=1), now
+        )
+        assert [schedule.id for schedule in active] == [recent_id]
+
+    assert await ScheduleArchiver().archive() == 0
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_archive_without_repository() -> None:
+    async with AsyncSessionMaker() as session:
+        service = ScheduleService(
+            user_repo=UserRepository(session),
+            schedule_repo=ScheduleRepository(session),
+            upcoming_takings_repo=UpcomingTakingsRepository(session),
+        )
+        assert await service.archive_ended_schedules() == 0
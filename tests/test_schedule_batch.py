@@ -0,0 +1,138 @@
+from datetime import UTC, datetime, time, timedelta
+import random
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.api.v1.schedule.batch import (
+    NO_END_MINUTE,
+    ScheduleColumns,
+    build_schedule_columns,
+    datetime_to_minute,
+    find_batch_takings,
+    minute_to_datetime,
+)
+from src.api.v1.schedule.utils import find_next_takings
+from src.core.config import Settings
+from src.database.models.schedules import Schedules
+
+
+def make_config(morning: time = time(8, 0), evening: time = time(22, 0)) -> Settings:
+    return Settings(
+        MORNING_TIME=morning,
+        EVENING_TIME=evening,
+        DB_USER="",
+        DB_PASS="",
+        DB_HOST="",
+        DB_PORT="",
+        DB_NAME="",
+    )
+
+
+class TestFindBatchTakings:
+    def test_takings_grouped_by_user(self) -> None:
+        start = datetime_to_minute(datetime(2025, 1, 1, 10, 0, tzinfo=UTC))
+        columns = ScheduleColumns(
+            start_minutes=np.array([start, start, start + 10]),
+            frequencies=np.array([15, 30, 60]),
+            end_minutes=np.array([start + 60, NO_END_MINUTE, NO_END_MINUTE]),
+            user_indices=np.array([0, 0, 1]),
+        )
+
+        takings = find_batch_takings(
+            columns, timedelta(hours=1), make_config(), datetime(2025, 1, 1, 10, 0, tzinfo=UTC)
+        )
+
+        assert set(takings) == {0, 1}
+        assert [minute_to_datetime(m).time() for m in takings[0].taking_minutes] == [
+            time(10, 0),
+            time(10, 0),
+            time(10, 15),
+            time(10, 30),
+            time(10, 30),
+            time(10, 45),
+            time(11, 0),
+            time(11, 0),
+        ]
+        assert takings[0].schedule_indices.tolist() == [0, 1, 0, 0, 1, 0, 0, 1]
+        assert takings[1].schedule_indices.tolist() == [2]
+        assert minute_to_datetime(takings[1].taking_minutes[0]) == datetime(
+            2025, 1, 1, 10, 10, tzinfo=UTC
+        )
+
+    def test_night_takings_are_skipped(self) -> None:
+        start = datetime_to_minute(datetime(2025, 1, 1, 21, 0, tzinfo=UTC))
+        columns = ScheduleColumns(
+            start_minutes=np.array([start]),
+            frequencies=np.array([15]),
+            end_minutes=np.array([NO_END_MINUTE]),
+            user_indices=np.array([0]),
+        )
+
+        takings = find_batch_takings(
+            columns, timedelta(days=2), make_config(), datetime(2025, 1, 1, 21, 30, tzinfo=UTC)
+        )
+
+        times = [minute_to_datetime(m) for m in takings[0].taking_minutes]
+        assert all(time(8, 0) <= t.time() <= time(22, 0) for t in times)
+        assert times[3] == datetime(2025, 1, 2, 8, 0, tzinfo=UTC)
+
+    def test_empty_columns(self) -> None:
+        empty = np.array([], dtype=np.int64)
+        columns = ScheduleColumns(empty, empty, empty, empty)
+        assert find_batch_takings(columns, timedelta(hours=1), make_config()) == {}
+
+    @pytest.mark.parametrize(
+        ("morning", "evening"),
+        [(time(8, 0), time(22, 0)), (time(22, 0), time(6, 0)), (time(9, 0), time(9, 7, 30))],
+    )
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_find_next_takings(self, morning: time, evening: time, seed: int) -> None:
+        rng = random.Random(seed)
+        config = make_config(morning, evening)
+        base_time = datetime(2025, 1, 1, tzinfo=UTC)
+        user_ids = [uuid4() for _ in range(20)]
+        schedules = []
+        for _ in range(200):
+            start_date = base_time + timedelta(minutes=rng.randint(-2 * 1440, 2 * 1440))
+            end_date = None
+            if rng.random() < 0.5:
+                end_date = start_date + timedelta(minutes=rng.randint(-30, 5 * 1440))
+            schedules.append(
+                Schedules(
+                    id=uuid4(),
+                    user_id=rng.choice(user_ids),
+                    medicine_name="Batch Test Medicine",
+                    frequency=rng.choice([7, 15, 30, 45, 60, 240, 1440, 2000]),
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+            )
+        columns, batch_user_ids = build_schedule_columns(schedules)
+
+        for _ in range(5):
+            current_time = base_time + timedelta(seconds=rng.randint(-86400, 3 * 86400))
+            interval = timedelta(minutes=rng.choice([30, 60, 600, 1440, 3 * 1440]))
+
+            takings = find_batch_takings(columns, interval, config, current_time)
+
+            for user_index, user_id in enumerate(batch_user_ids):
+                expected = find_next_takings(
+                    [sch for sch in schedules if sch.user_id == user_id],
+                    interval,
+                    config,
+                    current_time,
+                )
+                actual = takings.get(user_index)
+                actual_takings = (
+                    []
+                    if actual is None
+                    else [
+                        (schedules[i].id, minute_to_datetime(m))
+                        for i, m in zip(actual.schedule_indices, actual.taking_minutes, strict=True)
+                    ]
+                )
+                assert actual_takings == [
+                    (t["schedule"].id, t["next_taking_time"]) for t in expected
+                ]
@@ -0,0 +1,138 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+import json
+
+from httpx import ASGITransport, AsyncClient
+import pytest
+
+from src.api.v1.schedule.bulk import iter_lines
+from src.core.config import settings
+from src.main import app
+
+MEDICINE_POLICY = 86420
+
+
+async def iter_chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestScheduleBulk:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 1024])
+    async def test_iter_lines(self, chunk_size: int) -> None:
+        data = b'{"a": 1}\n\n' + b"x" * 20 + b'\n{"b": 2}\n' + b"y" * 20 + b"\nlast"
+
+        lines = [line async for line in iter_lines(iter_chunks(data, chunk_size), 10)]
+
+        assert lines == [b'{"a": 1}', b"", None, b'{"b": 2}', None, b"last"]
+
+    async def test_bulk_create(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 2)
+        start_date = datetime.now(UTC).replace(microsecond=0)
+
+        def schedule_line(medicine_policy: int, medicine_name: str, **fields: object) -> str:
+            return json.dumps(
+                {
+                    "name": "Bulk User",
+                    "medicine_policy": medicine_policy,
+                    "medicine_name": medicine_name,
+                    "frequency": 60,
+                    "start_date": start_date.isoformat(),
+                    **fields,
+                }
+            )
+
+        lines = [
+            schedule_line(MEDICINE_POLICY, "Bulk Medicine 1", duration="P1D"),
+            "{not json",
+            schedule_line(MEDICINE_POLICY + 1, "Bulk Medicine 2", duration="P2D"),
+            "",
+            schedule_line(MEDICINE_POLICY, "Bulk Medicine 3"),
+            schedule_line(MEDICINE_POLICY, "Bulk Medicine 4", frequency=0, duration="P1D"),
+            schedule_line(MEDICINE_POLICY + 1, "Bulk Medicine 5", duration="P3D"),
+        ]
+        body = "\n".join(lines).encode()
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/schedules:bulk",
+                content=iter_chunks(body, 50),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == 200
+            assert response.headers["Content-Type"] == "application/x-ndjson"
+            results = [json.loads(line) for line in response.text.splitlines()]
+
+            assert [result["line"] for result in results] == [1, 2, 3, 5, 6, 7]
+            assert "schedule_id" in results[0]
+            assert "Invalid JSON" in results[1]["error"]
+            assert "schedule_id" in results[2]
+            assert results[3]["error"] == "Either end_date or duration must be provided"
+            assert results[4]["error"].startswith("frequency:")
+            assert "schedule_id" in results[5]
+
+            for medicine_policy, result_indices in (
+                (MEDICINE_POLICY, [0]),
+                (MEDICINE_POLICY + 1, [2, 5]),
+            ):
+                response = await client.get(
+                    "/api/v1/schedules", params={"user_id": medicine_policy}
+                )
+                assert sorted(response.json()["data"]) == sorted(
+                    results[index]["schedule_id"] for index in result_indices
+                )
+
+            response = await client.get(
+                "/api/v1/schedule",
+                params={"user_id": MEDICINE_POLICY + 1, "schedule_id": results[5]["schedule_id"]},
+            )
+            schedule = response.json()["data"]
+            assert schedule["medicine_name"] == "Bulk Medicine 5"
+            assert datetime.fromisoformat(schedule["end_date"]) == start_date + timedelta(days=3)
+
+    async def test_bulk_create_out_of_range_and_database_errors(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "BULK_BATCH_SIZE", 5)
+        medicine_policy = MEDICINE_POLICY + 2
+
+        def schedule_line(medicine_name: str, **fields: object) -> str:
+            return json.dumps(
+                {
+                    "medicine_policy": medicine_policy,
+                    "medicine_name": medicine_name,
+                    "frequency": 60,
+                    "duration": "P1D",
+                    **fields,
+                }
+            )
+
+        lines = [
+            schedule_line("Bulk Medicine 1"),
+            schedule_line("Bulk Medicine 2", frequency=10000000005),
+            schedule_line("Bulk Medicine 3", medicine_policy=10000000005),
+            # Postgres text can not hold NUL, the database rejects the whole batch
+            schedule_line("Bulk\u0000Medicine 4"),
+            schedule_line("Bulk Medicine 5"),
+        ]
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/v1/schedules:bulk",
+                content="\n".join(lines).encode(),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            assert response.status_code == 200
+            results = [json.loads(line) for line in response.text.splitlines()]
+
+            assert [result["line"] for result in results] == [1, 2, 3, 4, 5]
+            assert results[1]["error"].startswith("frequency:")
+            assert results[2]["error"].startswith("medicine_policy:")
+            assert results[3]["error"] == "Schedule could not be saved"
+
+            response = await client.get("/api/v1/schedules", params={"user_id": medicine_policy})
+            assert sorted(response.json()["data"]) == sorted(
+                results[index]["schedule_id"] for index in (0, 4)
+            )
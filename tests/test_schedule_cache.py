@@ -0,0 +1,399 @@
+import asyncio
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+import json
+import time
+from uuid import uuid4
+
+from fastapi import HTTPException
+import pytest
+import pytest_asyncio
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.api.v1.schedule.cache import (
+    ScheduleCache,
+    decode_schedule_results,
+    encode_schedule_results,
+    widen_to_quarter_hours,
+)
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.core.cache import MemoryCacheBackend, RedisCacheBackend
+from src.database.connection import AsyncSessionMaker, engine
+from src.repositories import (
+    ScheduleReadRepository,
+    ScheduleRepository,
+    ScheduleRow,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+from src.repositories.schedule_archive_repo import SCHEDULES_ARCHIVED_CHANNEL
+from src.workers import ScheduleCacheInvalidator
+from src.workers.schedule_feed import connect_listener
+
+MEDICINE_POLICY = 64391
+TIMEOUT = 5
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RedisStandIn:
+    """
+    Local server answering HGET, HSET, EXPIRE with NX, DEL and MULTI/EXEC of the Redis protocol.
+    Drops the connection instead of answering the next `disconnects` commands.
+    """
+
+    def __init__(self) -> None:
+        self.hashes: dict[bytes, tuple[dict[bytes, bytes], float | None]] = {}
+        self.commands: list[list[bytes]] = []
+        self.disconnects = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queued: list[list[bytes]] | None = None
+        while line := await reader.readline():
+            args = []
+            for _ in range(int(line[1:])):
+                length = int((await reader.readline())[1:])
+                args.append((await reader.readexactly(length + 2))[:-2])
+            if args[0] == b"CLIENT":
+                writer.write(b"+OK\r\n")
+                continue
+            if self.disconnects:
+                self.disconnects -= 1
+                break
+
+            self.commands.append(args)
+            if args[0] == b"MULTI":
+                queued = []
+                writer.write(b"+OK\r\n")
+            elif args[0] == b"EXEC":
+                replies = [self.reply(*command) for command in queued]
+                writer.write(b"*%d\r\n%b" % (len(replies), b"".join(replies)))
+                queued = None
+            elif queued is not None:
+                queued.append(args)
+                writer.write(b"+QUEUED\r\n")
+            else:
+                writer.write(self.reply(*args))
+            await writer.drain()
+        writer.close()
+
+    def reply(self, command: bytes, key: bytes, *args: bytes) -> bytes:
+        fields, expires_at = self.hashes.get(key, ({}, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.hashes[key]
+            fields, expires_at = {}, None
+
+        if command == b"HSET":
+            fields[args[0]] = args[1]
+            self.hashes[key] = (fields, expires_at)
+            return b":1\r\n"
+        if command == b"EXPIRE":
+            if key not in self.hashes or (b"NX" in args and expires_at is not None):
+                return b":0\r\n"
+            self.hashes[key] = (fields, time.monotonic() + int(args[0]))
+            return b":1\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % (self.hashes.pop(key, None) is not None)
+        value = fields.get(args[0])
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%b\r\n" % (len(value), value)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def redis_stand_in() -> AsyncGenerator[tuple[RedisStandIn, int], None]:
+    stand_in = RedisStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    yield stand_in, server.sockets[0].getsockname()[1]
+    server.close()
+
+
+def make_rows() -> list[ScheduleRow]:
+    start_date = datetime(2025, 3, 1, 10, 15, tzinfo=UTC)
+    return [
+        ScheduleRow(uuid4(), uuid4(), "Cached Medicine", 60, start_date, None),
+        ScheduleRow(uuid4(), uuid4(), "Кэш", 15, start_date, start_date + timedelta(days=2)),
+    ]
+
+
+def make_service(session: object, cache: ScheduleCache | None) -> ScheduleService:
+    return ScheduleService(
+        user_repo=UserRepository(session),
+        schedule_repo=ScheduleRepository(session),
+        upcoming_takings_repo=UpcomingTakingsRepository(session),
+        schedule_read_repo=ScheduleReadRepository(session),
+        schedule_cache=cache,
+    )
+
+
+async def create_schedule(
+    cache: ScheduleCache | None, medicine_name: str, start_date: datetime | None = None
+) -> None:
+    async with AsyncSessionMaker() as session:
+        await make_service(session, cache).create_schedule(
+            SScheduleCreateRequest(
+                name="Cached Schedules User",
+                medicine_policy=MEDICINE_POLICY,
+                medicine_name=medicine_name,
+                frequency=60,
+                start_date=start_date,
+                duration=timedelta(days=1),
+            )
+        )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_memory_backend_expiry_and_eviction() -> None:
+    clock = Clock()
+    backend = MemoryCacheBackend(max_entries=2, ttl=timedelta(seconds=10), clock=clock)
+
+    await backend.set("a", "x", 1)
+    await backend.set("b", "x", 2)
+    assert await backend.get("a", "x") == 1
+    # The least recently used key makes room
+    await backend.set("c", "x", 3)
+    assert await backend.get("b", "x") is None
+    assert await backend.get("a", "x") == 1
+
+    # Fields of a key expire with the first one
+    clock.now = 5
+    await backend.set("a", "y", 4)
+    assert await backend.get("a", "y") == 4
+    clock.now = 10
+    assert await backend.get("a", "y") is None
+    assert await backend.get("c", "x") is None
+
+    await backend.set("a", "x", 1)
+    await backend.set("a", "y", 2)
+    await backend.delete("a")
+    assert await backend.get("a", "x") is None
+    assert await backend.get("a", "y") is None
+
+
+def test_schedule_results_encoding() -> None:
+    rows = make_rows()
+    assert decode_schedule_results(encode_schedule_results(rows)) == rows
+    ids = [row.id for row in rows]
+    assert decode_schedule_results(encode_schedule_results(ids)) == ids
+    assert decode_schedule_results(encode_schedule_results([])) == []
+
+
+def test_widen_to_quarter_hours() -> None:
+    since = datetime(2025, 3, 1, 10, 7, 30, tzinfo=UTC)
+    assert widen_to_quarter_hours(since, since + timedelta(minutes=10)) == (
+        datetime(2025, 3, 1, 10, 0, tzinfo=UTC),
+        datetime(2025, 3, 1, 10, 30, tzinfo=UTC),
+    )
+    since = datetime(2025, 3, 1, 10, 15, tzinfo=UTC)
+    assert widen_to_quarter_hours(since, since + timedelta(days=1)) == (
+        since,
+        since + timedelta(days=1),
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redis_backend(redis_stand_in: tuple[RedisStandIn, int]) -> None:
+    stand_in, port = redis_stand_in
+    cache = ScheduleCache(
+        RedisCacheBackend(
+            f"redis://127.0.0.1:{port}/0",
+            timedelta(seconds=60),
+            encode_schedule_results,
+            decode_schedule_results,
+        )
+    )
+    rows = make_rows()
+    key = ScheduleCache.get_key(MEDICINE_POLICY).encode()
+
+    assert await cache.get(MEDICINE_POLICY, "rows") is None
+    assert await cache.set(MEDICINE_POLICY, "rows", rows) == rows
+    assert await cache.set(MEDICINE_POLICY, "ids", [row.id for row in rows]) == [
+        row.id for row in rows
+    ]
+    assert await cache.get(MEDICINE_POLICY, "rows") == rows
+    assert await cache.get(MEDICINE_POLICY, "ids") == [row.id for row in rows]
+    await cache.invalidate(MEDICINE_POLICY)
+    assert await cache.get(MEDICINE_POLICY, "rows") is None
+    assert [command[0] for command in stand_in.commands] == [
+        b"HGET",
+        b"MULTI",
+        b"HSET",
+        b"EXPIRE",
+        b"EXEC",
+        b"MULTI",
+        b"HSET",
+        b"EXPIRE",
+        b"EXEC",
+        b"HGET",
+        b"HGET",
+        b"DEL",
+        b"HGET",
+    ]
+    assert stand_in.commands[3] == [b"EXPIRE", key, b"60", b"NX"]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # A dropped connection is retried
+    await cache.set(MEDICINE_POLICY, "rows", rows)
+    stand_in.disconnects = 1
+    await cache.invalidate(MEDICINE_POLICY)
+    assert await cache.get(MEDICINE_POLICY, "rows") is None
+    await cache.backend.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_redis_backend_unavailable() -> None:
+    # Nothing listens on the port of a closed server
+    server = await asyncio.start_server(lambda *_: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+    backend = RedisCacheBackend(
+        f"redis://127.0.0.1:{port}",
+        timedelta(seconds=60),
+        encode_schedule_results,
+        decode_schedule_results,
+        retries=1,
+    )
+    await backend.set("key", "rows", make_rows())
+    assert await backend.get("key", "rows") is None
+    # A lost invalidation would serve stale schedules
+    with pytest.raises(RedisConnectionError):
+        await backend.delete("key")
+
+    # The schedule is committed before the invalidation, so the write still succeeds
+    async with AsyncSessionMaker() as session:
+        schedule_id = await make_service(session, ScheduleCache(backend)).create_schedule(
+            SScheduleCreateRequest(
+                name="Cached Schedules Without Redis User",
+                medicine_policy=MEDICINE_POLICY + 2,
+                medicine_name="Schedule Cached Without Redis",
+                frequency=60,
+                duration=timedelta(days=1),
+            )
+        )
+    async with AsyncSessionMaker() as session:
+        service = make_service(session, None)
+        assert await service.get_schedules_ids_by_policy(MEDICINE_POLICY + 2) == [schedule_id]
+    await backend.close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_service_cache() -> None:
+    cache = ScheduleCache(MemoryCacheBackend(max_entries=100, ttl=timedelta(minutes=1)))
+
+    now = datetime.now(UTC)
+
+    async def get_schedule_names() -> list[str]:
+        async with AsyncSessionMaker() as session:
+            schedules = await make_service(session, cache).get_active_schedules_by_policy(
+                MEDICINE_POLICY, now, now + timedelta(days=10)
+            )
+        return sorted(schedule.medicine_name for schedule in schedules)
+
+    # An unknown user is not cached
+    async with AsyncSessionMaker() as session:
+        with pytest.raises(HTTPException):
+            await make_service(session, cache).get_schedules_ids_by_policy(MEDICINE_POLICY)
+    assert await cache.get(MEDICINE_POLICY, "ids:None:None") is None
+    cache.misses = 0
+
+    await create_schedule(cache, "Cached Schedule 1")
+    assert await get_schedule_names() == ["Cached Schedule 1"]
+
+    # A hit does not check out a connection
+    checkouts = engine.pool.wait_time.count
+    assert await get_schedule_names() == ["Cached Schedule 1"]
+    assert engine.pool.wait_time.count == checkouts
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await create_schedule(cache, "Cached Schedule 2", datetime.now(UTC) + timedelta(days=3))
+    assert await get_schedule_names() == ["Cached Schedule 1", "Cached Schedule 2"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    async with AsyncSessionMaker() as session:
+        service = make_service(session, cache)
+        schedule_ids = await service.get_schedules_ids_by_policy(MEDICINE_POLICY)
+        assert schedule_ids == sorted(schedule_ids)
+        unknown_id = uuid4()
+        for _ in range(2):
+            assert (
+                await service.get_schedules_ids_by_policy(MEDICINE_POLICY, schedule_ids[0], 1)
+                == schedule_ids[1:2]
+            )
+            schedule = await service.get_schedule_by_id(MEDICINE_POLICY, schedule_ids[0])
+            assert schedule.id == schedule_ids[0]
+            with pytest.raises(HTTPException):
+                await service.get_schedule_by_id(MEDICINE_POLICY, unknown_id)
+
+        since = widen_to_quarter_hours(now, now)[0] + timedelta(days=3, hours=2)
+        for period in (
+            (since, since + timedelta(hours=1)),
+            (since + timedelta(minutes=1), since + timedelta(minutes=59)),
+        ):
+            active = await service.get_active_schedules_by_policy(MEDICINE_POLICY, *period)
+            assert [schedule.medicine_name for schedule in active] == ["Cached Schedule 2"]
+        assert (
+            await service.get_active_schedules_by_policy(
+                MEDICINE_POLICY, now + timedelta(days=5), now + timedelta(days=6)
+            )
+            == []
+        )
+    # Every query missed once, the repeated ones and the period within the same quarter
+    # hours hit
+    assert (cache.hits, cache.misses) == (5, 8)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_invalidator() -> None:
+    cache = ScheduleCache(MemoryCacheBackend(max_entries=100, ttl=timedelta(minutes=1)))
+    invalidator = ScheduleCacheInvalidator(cache)
+    assert ScheduleCacheInvalidator.is_needed(cache)
+    assert not ScheduleCacheInvalidator.is_needed(None)
+
+    await create_schedule(None, "Invalidated Schedule 1")
+    await cache.set(MEDICINE_POLICY + 1, "ids:None:None", [])
+
+    connected = asyncio.Event()
+    task = asyncio.create_task(invalidator.listen(connected))
+    try:
+        await asyncio.wait_for(connected.wait(), TIMEOUT)
+        # Notifications may have been missed before the connection
+        assert await cache.get(MEDICINE_POLICY + 1, "ids:None:None") is None
+
+        async with AsyncSessionMaker() as session:
+            await make_service(session, cache).get_schedules_ids_by_policy(MEDICINE_POLICY)
+        assert await cache.get(MEDICINE_POLICY, "ids:None:None") is not None
+
+        # Schedules created by a process without the cache
+        await create_schedule(None, "Invalidated Schedule 2")
+        async with asyncio.timeout(TIMEOUT):
+            while await cache.get(MEDICINE_POLICY, "ids:None:None") is not None:
+                await asyncio.sleep(0.01)
+
+        # Schedules archived by another process
+        await cache.set(MEDICINE_POLICY, "ids:None:None", [])
+        connection = await connect_listener()
+        try:
+            await connection.execute(
+                "SELECT pg_notify($1, $2)",
+                SCHEDULES_ARCHIVED_CHANNEL,
+                json.dumps({"medicine_policy": MEDICINE_POLICY}),
+            )
+        finally:
+            await connection.close()
+        async with asyncio.timeout(TIMEOUT):
+            while await cache.get(MEDICINE_POLICY, "ids:None:None") is not None:
+                await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
@@ -0,0 +1,148 @@
+from datetime import UTC, date, datetime, time, timedelta
+import random
+from uuid import uuid4
+
+import pytest
+
+from src.api.v1.schedule.calendar import (
+    find_calendar_takings,
+    get_allowed_slots,
+    is_on_slot_grid,
+    iter_slots,
+)
+from src.api.v1.schedule.utils import is_allowed_time, time_to_microseconds
+from src.core.config import Settings
+from src.database.models.schedules import Schedules
+
+
+def make_config(morning: time = time(8, 0), evening: time = time(22, 0)) -> Settings:
+    return Settings(
+        MORNING_TIME=morning,
+        EVENING_TIME=evening,
+        DB_USER="",
+        DB_PASS="",
+        DB_HOST="",
+        DB_PORT="",
+        DB_NAME="",
+    )
+
+
+def make_schedule(
+    frequency: int, start_date: datetime, end_date: datetime | None = None
+) -> Schedules:
+    return Schedules(
+        id=uuid4(),
+        user_id=uuid4(),
+        medicine_name="Calendar Test Medicine",
+        frequency=frequency,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+def reference_calendar(
+    schedules: list[Schedules], start_date: date, end_date: date, config: Settings
+) -> list[tuple[datetime, Schedules]]:
+    """Step through every occurrence of every schedule"""
+    since = datetime.combine(start_date, time(), tzinfo=UTC)
+    until = datetime.combine(end_date + timedelta(days=1), time(), tzinfo=UTC)
+    morning = time_to_microseconds(config.MORNING_TIME)
+    evening = time_to_microseconds(config.EVENING_TIME)
+
+    takings = []
+    for schedule in schedules:
+        if schedule.end_date and schedule.end_date < since:
+            continue
+        start = schedule.start_date
+        if since <= start < until and config.MORNING_TIME <= start.time() <= config.EVENING_TIME:
+            takings.append((start, schedule))
+
+        last = min(until, schedule.end_date) if schedule.end_date else until
+        index = 1
+        while (taking_time := start + index * timedelta(minutes=schedule.frequency)) <= last:
+            time_of_day = time_to_microseconds(taking_time.time())
+            if since <= taking_time < until and is_allowed_time(time_of_day, morning, evening):
+                takings.append((taking_time, schedule))
+            index += 1
+    return sorted(takings, key=lambda taking: (taking[0], taking[1].id))
+
+
+class TestCalendar:
+    def test_allowed_slots(self) -> None:
+        assert list(iter_slots(get_allowed_slots(time(8, 0), time(9, 0)))) == [32, 33, 34, 35, 36]
+        assert list(iter_slots(get_allowed_slots(time(22, 0), time(1, 0)))) == [
+            0,
+            1,
+            2,
+            3,
+            *range(89, 96),
+        ]
+
+    def test_week_of_takings(self) -> None:
+        schedule = make_schedule(
+            frequency=180,
+            start_date=datetime(2025, 1, 1, 9, 0, tzinfo=UTC),
+            end_date=datetime(2025, 1, 4, 12, 0, tzinfo=UTC),
+        )
+        assert is_on_slot_grid(schedule)
+
+        takings = find_calendar_takings(
+            [schedule], date(2024, 12, 30), date(2025, 1, 5), make_config()
+        )
+
+        times = [taking["taking_time"] for taking in takings]
+        assert times[:6] == [
+            datetime(2025, 1, 1, 9, 0, tzinfo=UTC),
+            datetime(2025, 1, 1, 12, 0, tzinfo=UTC),
+            datetime(2025, 1, 1, 15, 0, tzinfo=UTC),
+            datetime(2025, 1, 1, 18, 0, tzinfo=UTC),
+            datetime(2025, 1, 1, 21, 0, tzinfo=UTC),
+            datetime(2025, 1, 2, 9, 0, tzinfo=UTC),
+        ]
+        assert times[-1] == datetime(2025, 1, 4, 12, 0, tzinfo=UTC)
+        assert all(taking["schedule"] is schedule for taking in takings)
+
+    def test_off_grid_schedule(self) -> None:
+        schedule = make_schedule(frequency=50, start_date=datetime(2025, 1, 1, 10, 7, tzinfo=UTC))
+        assert not is_on_slot_grid(schedule)
+
+        config = make_config()
+        assert [
+            (taking["taking_time"], taking["schedule"])
+            for taking in find_calendar_takings(
+                [schedule], date(2025, 1, 1), date(2025, 1, 3), config
+            )
+        ] == reference_calendar([schedule], date(2025, 1, 1), date(2025, 1, 3), config)
+
+    @pytest.mark.parametrize(
+        ("morning", "evening"),
+        [(time(8, 0), time(22, 0)), (time(22, 0), time(6, 0)), (time(9, 10), time(9, 50))],
+    )
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_reference(self, morning: time, evening: time, seed: int) -> None:
+        rng = random.Random(seed)
+        config = make_config(morning, evening)
+        base_time = datetime(2025, 1, 1, tzinfo=UTC)
+        schedules = []
+        for _ in range(50):
+            start_date = base_time + timedelta(minutes=15 * rng.randint(-4 * 96, 20 * 96))
+            end_date = None
+            if rng.random() < 0.6:
+                end_date = start_date + timedelta(minutes=rng.randint(-30, 15 * 1440))
+            schedules.append(
+                make_schedule(
+                    frequency=rng.choice([15, 30, 45, 60, 75, 240, 330, 1440, 1455, 3000]),
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+            )
+
+        for _ in range(3):
+            start_date = base_time.date() + timedelta(days=rng.randint(-5, 15))
+            end_date = start_date + timedelta(days=rng.choice([0, 6, 30]))
+
+            takings = find_calendar_takings(schedules, start_date, end_date, config)
+
+            assert [(t["taking_time"], t["schedule"]) for t in takings] == reference_calendar(
+                schedules, start_date, end_date, config
+            )
@@ -0,0 +1,89 @@
+from datetime import UTC, datetime, timedelta
+import json
+
+from httpx import ASGITransport, AsyncClient
+import pytest
+
+from src.api.v1.schedule.schemas import SScheduleCreate, SUserCreate
+from src.core.config import settings
+from src.database.connection import AsyncSessionMaker
+from src.main import app
+from src.repositories import LoadStrategy, Relation, ScheduleRepository, UserRepository
+
+MEDICINE_POLICY = 64593
+SCHEDULES = 5
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestScheduleExport:
+    @pytest.fixture(scope="class")
+    async def schedule_ids(self) -> set:
+        now = datetime.now(UTC).replace(microsecond=0)
+        async with AsyncSessionMaker() as session:
+            user = await UserRepository(session).create(
+                SUserCreate(name="Export User", medicine_policy=MEDICINE_POLICY)
+            )
+            return {
+                (
+                    await ScheduleRepository(session).create(
+                        SScheduleCreate(
+                            medicine_name=f"Export Medicine {index}",
+                            frequency=15,
+                            start_date=now,
+                            end_date=now + timedelta(days=index + 1),
+                            user_id=user.id,
+                        )
+                    )
+                ).id
+                for index in range(SCHEDULES)
+            }
+
+    async def test_stream_all(self, schedule_ids: set) -> None:
+        async with AsyncSessionMaker() as session:
+            user = await UserRepository(session).get_by_medical_policy(MEDICINE_POLICY)
+            streamed = [
+                schedule
+                async for schedule in ScheduleRepository(session).stream_all(
+                    batch_size=2, user_id=user.id
+                )
+            ]
+            assert {schedule.id for schedule in streamed} == schedule_ids
+
+            users = [
+                user
+                async for user in UserRepository(session).stream_all_with_relations(
+                    [Relation("schedules", LoadStrategy.SELECTIN)],
+                    batch_size=2,
+                    medicine_policy=MEDICINE_POLICY,
+                )
+            ]
+            assert {schedule.id for schedule in users[0].schedules} == schedule_ids
+
+            with pytest.raises(ValueError, match="selectin"):
+                UserRepository(session).stream_all_with_relations(["schedules"])
+
+    async def test_export(self, schedule_ids: set, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/api/v1/schedules:export", params={"user_id": MEDICINE_POLICY}
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert {line["schedule_id"] for line in lines} == {str(id) for id in schedule_ids}
+            assert {line["user_id"] for line in lines} == {MEDICINE_POLICY}
+
+            response = await client.get("/api/v1/schedules:export")
+            exported = {
+                line["schedule_id"]
+                for line in map(json.loads, response.text.splitlines())
+                if line["user_id"] == MEDICINE_POLICY
+            }
+            assert exported == {str(id) for id in schedule_ids}
+
+            response = await client.get(
+                "/api/v1/schedules:export", params={"user_id": MEDICINE_POLICY + 1}
+            )
+            assert response.status_code == 404
@@ -0,0 +1,171 @@
+import asyncio
+from collections.abc import AsyncGenerator, Generator
+from datetime import UTC, datetime, timedelta
+import json
+import time
+from uuid import UUID, uuid4
+
+import grpc
+import pytest
+import pytest_asyncio
+
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.database.connection import AsyncSessionMaker
+from src.grpc_server.schedule_pb2 import WatchSchedulesRequest
+from src.grpc_server.schedule_pb2_grpc import ScheduleServiceStub
+from src.grpc_server.server import GRPCServer
+from src.grpc_server.servicers.utils import convert_to_timestamp
+from src.repositories import (
+    ScheduleChange,
+    ScheduleReadRepository,
+    ScheduleRepository,
+    ScheduleRow,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+from src.workers.schedule_feed import (
+    SCHEDULE_CREATED_CHANNEL,
+    ScheduleFeedInterruptedError,
+    ScheduleSubscription,
+    connect_listener,
+    schedule_feed,
+)
+
+MEDICINE_POLICY = 64517
+GRPC_PORT = 50057
+TIMEOUT = 5
+
+
+def make_change() -> ScheduleChange:
+    now = datetime.now(UTC)
+    return ScheduleChange(ScheduleRow(uuid4(), uuid4(), "Feed Medicine", 15, now, None), now)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_subscription_overflow() -> None:
+    subscription = ScheduleSubscription(max_pending=2)
+    changes = [make_change() for _ in range(3)]
+    for change in changes:
+        subscription.push(change)
+
+    assert subscription.is_interrupted
+    assert [await anext(subscription), await anext(subscription)] == changes[:2]
+    with pytest.raises(ScheduleFeedInterruptedError):
+        await anext(subscription)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def stub() -> AsyncGenerator[ScheduleServiceStub, None]:
+    server = GRPCServer(GRPC_PORT)
+    await server.start()
+    async with grpc.aio.insecure_channel(f"localhost:{GRPC_PORT}") as channel:
+        yield ScheduleServiceStub(channel)
+    await server.stop()
+    await schedule_feed.stop()
+
+
+def make_request(medicine_policy: int, medicine_name: str) -> SScheduleCreateRequest:
+    return SScheduleCreateRequest(
+        name="Feed User",
+        medicine_policy=medicine_policy,
+        medicine_name=medicine_name,
+        frequency=60,
+        duration=timedelta(days=1),
+    )
+
+
+async def create_schedules(*requests: SScheduleCreateRequest) -> list[UUID]:
+    async with AsyncSessionMaker() as session:
+        return await ScheduleService(
+            user_repo=UserRepository(session),
+            schedule_repo=ScheduleRepository(session),
+            upcoming_takings_repo=UpcomingTakingsRepository(session),
+        ).create_schedules(list(requests))
+
+
+async def create_schedule(medicine_policy: int, medicine_name: str) -> UUID:
+    [schedule_id] = await create_schedules(make_request(medicine_policy, medicine_name))
+    return schedule_id
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_notify_per_statement() -> None:
+    notifications: asyncio.Queue[dict] = asyncio.Queue()
+    connection = await connect_listener()
+    await connection.add_listener(
+        SCHEDULE_CREATED_CHANNEL, lambda *args: notifications.put_nowait(json.loads(args[-1]))
+    )
+    try:
+        schedule_ids = await create_schedules(
+            *(make_request(MEDICINE_POLICY + 3, f"Feed Bulk Medicine {i}") for i in range(150)),
+            make_request(MEDICINE_POLICY + 4, "Feed Bulk Medicine Of Another User"),
+        )
+        received = [await asyncio.wait_for(notifications.get(), TIMEOUT) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        assert notifications.empty()
+    finally:
+        await connection.close()
+
+    # A statement notifies once per user and 100 ids
+    assert sorted(
+        (notification["medicine_policy"], len(notification["ids"])) for notification in received
+    ) == [(MEDICINE_POLICY + 3, 50), (MEDICINE_POLICY + 3, 100), (MEDICINE_POLICY + 4, 1)]
+    assert {UUID(id) for notification in received for id in notification["ids"]} == set(
+        schedule_ids
+    )
+
+
+@pytest.fixture
+def local_timezone(monkeypatch: pytest.MonkeyPatch) -> Generator[None, None, None]:
+    """Run on a host whose local time is not UTC"""
+    monkeypatch.setenv("TZ", "Asia/Vladivostok")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.usefixtures("local_timezone")
+async def test_get_created_since() -> None:
+    since = datetime.now(UTC) - timedelta(seconds=1)
+    schedule_id = await create_schedule(MEDICINE_POLICY + 1, "Feed Catch-up Medicine")
+
+    async with AsyncSessionMaker() as session:
+        for repository in (ScheduleRepository(session), ScheduleReadRepository(session)):
+            changes = await repository.get_created_since(MEDICINE_POLICY + 1, since)
+            assert [change.schedule.id for change in changes] == [schedule_id]
+            assert await repository.get_created_since(MEDICINE_POLICY + 1, datetime.now(UTC)) == []
+            assert await repository.get_created_since(MEDICINE_POLICY + 2, since) == []
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_watch_schedules(stub: ScheduleServiceStub) -> None:
+    since = datetime.now(UTC) - timedelta(seconds=1)
+    caught_up_id = await create_schedule(MEDICINE_POLICY, "Feed Medicine 1")
+
+    stream = stub.WatchSchedules(
+        WatchSchedulesRequest(user_id=MEDICINE_POLICY, since=convert_to_timestamp(since))
+    )
+    events = aiter(stream)
+    event = await asyncio.wait_for(anext(events), TIMEOUT)
+    assert event.schedule_id == str(caught_up_id)
+    assert event.schedule.medicine_name == "Feed Medicine 1"
+
+    # Schedules of other users are not sent
+    await create_schedule(MEDICINE_POLICY + 1, "Feed Medicine Of Another User")
+    pushed_id = await create_schedule(MEDICINE_POLICY, "Feed Medicine 2")
+    event = await asyncio.wait_for(anext(events), TIMEOUT)
+    assert event.schedule_id == str(pushed_id)
+    assert event.schedule.frequency == 60
+    assert event.created_at.ToDatetime() >= since.replace(tzinfo=None)
+
+    # Schedules inserted by one statement come from one notification
+    bulk_ids = await create_schedules(
+        make_request(MEDICINE_POLICY, "Feed Medicine 3"),
+        make_request(MEDICINE_POLICY, "Feed Medicine 4"),
+    )
+    bulk_events = [await asyncio.wait_for(anext(events), TIMEOUT) for _ in bulk_ids]
+    assert {event.schedule_id for event in bulk_events} == {str(id) for id in bulk_ids}
+    stream.cancel()
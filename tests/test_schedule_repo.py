@@ -0,0 +1,245 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.api.v1.schedule.schemas import SScheduleCreate, SUserCreate
+from src.database.connection import AsyncSessionMaker
+from src.repositories import (
+    ScheduleReadRepository,
+    ScheduleRepository,
+    ScheduleRow,
+    UserNotFoundError,
+    UserRepository,
+)
+
+MEDICINE_POLICY = 76543
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestScheduleRepository:
+    async def test_get_active_by_medicine_policy(self) -> None:
+        now = datetime.now(UTC)
+        async with AsyncSessionMaker() as session:
+            user = await UserRepository(session).create(
+                SUserCreate(name="Active Window User", medicine_policy=MEDICINE_POLICY)
+            )
+            schedule_repo = ScheduleRepository(session)
+            schedules = {}
+            for name, start_date, end_date in [
+                ("ended", now - timedelta(days=10), now - timedelta(days=5)),
+                ("active", now - timedelta(days=1), now + timedelta(days=1)),
+                ("open-ended", now - timedelta(days=100), None),
+                ("ends-in-window", now - timedelta(days=1), now + timedelta(minutes=30)),
+                ("starts-in-window", now + timedelta(minutes=30), now + timedelta(days=1)),
+                ("future", now + timedelta(days=5), now + timedelta(days=10)),
+            ]:
+                schedule = await schedule_repo.create(
+                    SScheduleCreate(
+                        medicine_name=name,
+                        frequency=15,
+                        start_date=start_date,
+                        end_date=end_date or now,
+                        user_id=user.id,
+                    )
+                )
+                if end_date is None:
+                    schedule = await schedule_repo.update(schedule.id, {"end_date": None})
+                schedules[name] = schedule
+
+            active = await schedule_repo.get_active_by_medicine_policy(
+                MEDICINE_POLICY, now, now + timedelta(hours=1)
+            )
+
+            assert [schedule.id for schedule in active] == sorted(
+                schedules[name].id
+                for name in ("active", "open-ended", "ends-in-window", "starts-in-window")
+            )
+            assert await schedule_repo.get_active_by_medicine_policy(
+                MEDICINE_POLICY, now + timedelta(days=20), now + timedelta(days=21)
+            ) == [schedules["open-ended"]]
+            assert (
+                await schedule_repo.get_active_by_medicine_policy(
+                    MEDICINE_POLICY + 1, now, now + timedelta(hours=1)
+                )
+                is None
+            )
+
+    async def test_get_by_medicine_policy_and_id(self) -> None:
+        now = datetime.now(UTC)
+        async with AsyncSessionMaker() as session:
+            user_repo = UserRepository(session)
+            schedule_repo = ScheduleRepository(session)
+            user = await user_repo.create(
+                SUserCreate(name="Lookup User", medicine_policy=MEDICINE_POLICY + 2)
+            )
+            other_user = await user_repo.create(
+                SUserCreate(name="Other Lookup User", medicine_policy=MEDICINE_POLICY + 3)
+            )
+            schedule, other_schedule = [
+                await schedule_repo.create(
+                    SScheduleCreate(
+                        medicine_name="Lookup Medicine",
+                        frequency=60,
+                        start_date=now,
+                        end_date=now + timedelta(days=1),
+                        user_id=owner.id,
+                    )
+                )
+                for owner in (user, other_user)
+            ]
+
+            assert (
+                await schedule_repo.get_by_medicine_policy_and_id(MEDICINE_POLICY + 2, schedule.id)
+                == schedule
+            )
+            assert (
+                await schedule_repo.get_by_medicine_policy_and_id(
+                    MEDICINE_POLICY + 2, other_schedule.id
+                )
+                is None
+            )
+            with pytest.raises(UserNotFoundError):
+                await schedule_repo.get_by_medicine_policy_and_id(MEDICINE_POLICY + 4, schedule.id)
+
+    async def test_get_ids_by_medicine_policy(self) -> None:
+        now = datetime.now(UTC)
+        async with AsyncSessionMaker() as session:
+            user_repo = UserRepository(session)
+            schedule_repo = ScheduleRepository(session)
+            user = await user_repo.create(
+                SUserCreate(name="Ids User", medicine_policy=MEDICINE_POLICY + 5)
+            )
+            await user_repo.create(
+                SUserCreate(name="No Schedules User", medicine_policy=MEDICINE_POLICY + 6)
+            )
+            schedule_ids = sorted(
+                [
+                    (
+                        await schedule_repo.create(
+                            SScheduleCreate(
+                                medicine_name=f"Ids Medicine {index}",
+                                frequency=60,
+                                start_date=now,
+                                end_date=now + timedelta(days=1),
+                                user_id=user.id,
+                            )
+                        )
+                    ).id
+                    for index in range(5)
+                ]
+            )
+
+            assert await schedule_repo.get_ids_by_medicine_policy(MEDICINE_POLICY + 5) == (
+                schedule_ids
+            )
+            pages = []
+            after_id = None
+            while page := await schedule_repo.get_ids_by_medicine_policy(
+                MEDICINE_POLICY + 5, after_id, limit=2
+            ):
+                pages.append(page)
+                after_id = page[-1]
+            assert pages == [schedule_ids[:2], schedule_ids[2:4], schedule_ids[4:]]
+
+            assert await schedule_repo.get_ids_by_medicine_policy(MEDICINE_POLICY + 6) == []
+            assert await schedule_repo.get_ids_by_medicine_policy(MEDICINE_POLICY + 7) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestScheduleReadRepository:
+    async def test_matches_orm_repository(self) -> None:
+        now = datetime.now(UTC)
+        async with AsyncSessionMaker() as session:
+            user = await UserRepository(session).create(
+                SUserCreate(name="Read Path User", medicine_policy=MEDICINE_POLICY + 20)
+            )
+            await UserRepository(session).create(
+                SUserCreate(name="Read Path User", medicine_policy=MEDICINE_POLICY + 21)
+            )
+            schedule_repo = ScheduleRepository(session)
+            schedules = await schedule_repo.create_many(
+                [
+                    SScheduleCreate(
+                        medicine_name=f"Read Path Medicine {days}",
+                        frequency=15 * (days + 3),
+                        start_date=now + timedelta(days=days),
+                        end_date=now + timedelta(days=days + 1),
+                        user_id=user.id,
+                    )
+                    for days in range(-2, 3)
+                ]
+            )
+            await session.commit()
+
+        def as_rows(schedules: list | None) -> list[ScheduleRow] | None:
+            if schedules is None:
+                return None
+            return [
+                ScheduleRow(
+                    schedule.id,
+                    schedule.user_id,
+                    schedule.medicine_name,
+                    schedule.frequency,
+                    schedule.start_date,
+                    schedule.end_date,
+                )
+                for schedule in schedules
+            ]
+
+        async with AsyncSessionMaker() as session:
+            schedule_repo = ScheduleRepository(session)
+            read_repo = ScheduleReadRepository(session)
+            for medicine_policy in range(MEDICINE_POLICY + 20, MEDICINE_POLICY + 23):
+                for since, until in [
+                    (now, now + timedelta(hours=1)),
+                    (now - timedelta(days=5), now + timedelta(days=5)),
+                ]:
+                    rows = await read_repo.get_active_by_medicine_policy(
+                        medicine_policy, since, until
+                    )
+                    assert rows == as_rows(
+                        await schedule_repo.get_active_by_medicine_policy(
+                            medicine_policy, since, until
+                        )
+                    )
+                if medicine_policy == MEDICINE_POLICY + 22:
+                    continue
+                for schedule_id in (schedules[0].id, schedules[-1].id):
+                    schedule = await schedule_repo.get_by_medicine_policy_and_id(
+                        medicine_policy, schedule_id
+                    )
+                    assert await read_repo.get_by_medicine_policy_and_id(
+                        medicine_policy, schedule_id
+                    ) == (None if schedule is None else ScheduleRow.from_schedule(schedule))
+
+            rows = await read_repo.get_by_medicine_policy(MEDICINE_POLICY + 20)
+            assert rows == sorted(as_rows(schedules))
+            assert all(row.start_date.tzinfo is not None for row in rows)
+            assert await read_repo.get_by_medicine_policy(MEDICINE_POLICY + 21) == []
+            assert await read_repo.get_by_medicine_policy(MEDICINE_POLICY + 22) is None
+            with pytest.raises(UserNotFoundError):
+                await read_repo.get_by_medicine_policy_and_id(MEDICINE_POLICY + 22, schedules[0].id)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestUserRepository:
+    async def test_get_or_create_id_concurrently(self) -> None:
+        async def get_or_create_id(name: str) -> object:
+            async with AsyncSessionMaker() as session:
+                user_id = await UserRepository(session).get_or_create_id(
+                    SUserCreate(name=name, medicine_policy=MEDICINE_POLICY + 10)
+                )
+                await session.commit()
+                return user_id
+
+        first_id, second_id = await asyncio.gather(
+            get_or_create_id("First Upsert User"), get_or_create_id("Second Upsert User")
+        )
+
+        assert first_id == second_id
+        async with AsyncSessionMaker() as session:
+            user = await UserRepository(session).get_by_medical_policy(MEDICINE_POLICY + 10)
+        assert user.id == first_id
+        assert user.name in ("First Upsert User", "Second Upsert User")
+        assert await get_or_create_id("Third Upsert User") == first_id
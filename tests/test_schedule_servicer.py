@@ -1,11 +1,12 @@
 import uuid
-from datetime import timedelta
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
 import grpc
 from src.grpc_server.schedule_pb2 import (
     CreateScheduleRequest,
+    GetCalendarRequest,
     GetNextTakingsRequest,
     GetScheduleRequest,
     GetSchedulesIdsRequest,
@@ -50,6 +51,19 @@ class TestScheduleServicer:
         assert len(schedules.schedule_ids) >= 1
         assert schedule_id in schedules.schedule_ids
 
+        first_page = await self._send_request(
+            self.stub.GetSchedulesIds,
+            GetSchedulesIdsRequest(user_id=get_test_user.medicine_policy, limit=1),
+        )
+        assert first_page.schedule_ids == schedules.schedule_ids[:1]
+        rest = await self._send_request(
+            self.stub.GetSchedulesIds,
+            GetSchedulesIdsRequest(
+                user_id=get_test_user.medicine_policy, after_id=first_page.schedule_ids[0]
+            ),
+        )
+        assert rest.schedule_ids == schedules.schedule_ids[1:]
+
         # Step 3: Get the schedule
         response = await self._get_schedule(self.stub, schedule_id, get_test_user)
 
@@ -67,6 +81,37 @@ class TestScheduleServicer:
         # Probably beacuse of rounding the start_date (but this case is handled by the tests/test_schedule_utils.py::test_schedule_start_in_interval)
         # assert len(next_takings) >= 1
 
+        # Step 5: Get the calendar for the whole schedule
+        calendar = await self._get_calendar(self.stub, get_test_user, get_test_medicine)
+        assert schedule_id in {taking.schedule_id for taking in calendar.takings}
+
+    @pytest.mark.parametrize(
+        ("after_schedule_id", "with_after_time", "details"),
+        [
+            (None, True, "after_time and after_schedule_id must be provided together"),
+            (
+                str(uuid.uuid4()),
+                False,
+                "after_time and after_schedule_id must be provided together",
+            ),
+            ("not-a-uuid", True, "after_schedule_id must be a valid UUID"),
+        ],
+    )
+    async def test_get_next_takings_invalid_cursor(
+        self, get_test_user, after_schedule_id, with_after_time, details
+    ):
+        request = GetNextTakingsRequest(
+            user_id=get_test_user.medicine_policy, after_schedule_id=after_schedule_id
+        )
+        if with_after_time:
+            request.after_time.FromDatetime(datetime.now(UTC))
+
+        with pytest.raises(grpc.RpcError) as exc_info:
+            await self.stub.GetNextTakings(request)
+
+        assert exc_info.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+        assert exc_info.value.details() == details
+
     @staticmethod
     async def _send_request(method: grpc.aio._channel.UnaryUnaryMultiCallable, request):
         try:
@@ -111,3 +156,9 @@ class TestScheduleServicer:
         request = GetNextTakingsRequest(user_id=test_user.medicine_policy)
         request.next_takings_interval.FromTimedelta(timedelta(hours=2))
         return await self._send_request(stub.GetNextTakings, request)
+
+    async def _get_calendar(self, stub, test_user: UserTest, test_medicine: MedicineTest):
+        request = GetCalendarRequest(user_id=test_user.medicine_policy)
+        request.start_date.FromDatetime(test_medicine.start_date)
+        request.end_date.FromDatetime(test_medicine.end_date)
+        return await self._send_request(stub.GetCalendar, request)
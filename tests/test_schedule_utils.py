@@ -1,10 +1,20 @@
-from datetime import UTC, datetime, time, timedelta, tzinfo
-from typing import Callable
+from datetime import UTC, date, datetime, time, timedelta, timezone, tzinfo
+from itertools import islice
+import random
+from typing import Any, Callable
 from uuid import uuid4
+from zoneinfo import ZoneInfo
 
 import pytest
 
-from src.api.v1.schedule.utils import find_next_takings
+from src.api.v1.schedule.utils import (
+    TakingsCursor,
+    find_next_takings,
+    get_taking_pattern,
+    iter_next_takings,
+    iter_pattern_times,
+    time_to_microseconds,
+)
 from src.core.config import Settings
 from src.database.models.schedules import Schedules
 
@@ -376,3 +386,325 @@ class TestFindNextTakings:
         assert takings[0]["next_taking_time"] == datetime(2025, 1, 1, 8, 0, tzinfo=UTC)
         assert takings[1]["next_taking_time"] == datetime(2025, 1, 1, 8, 15, tzinfo=UTC)
         assert takings[2]["next_taking_time"] == datetime(2025, 1, 1, 8, 30, tzinfo=UTC)
+
+
+class TestIterNextTakings:
+    def test_first_n_takings(
+        self, schedule_factory: Callable[..., Schedules], test_config: Settings
+    ) -> None:
+        schedule = schedule_factory(
+            medicine_name="Test First N Takings",
+            frequency=15,
+            start_date=datetime(2025, 1, 1, 10, 0, tzinfo=UTC),
+            end_date=None,
+        )
+
+        current_time = datetime(2025, 1, 1, 10, 0, tzinfo=UTC)
+        takings = list(
+            islice(iter_next_takings([schedule], timedelta(days=30), test_config, current_time), 3)
+        )
+
+        assert [t["next_taking_time"] for t in takings] == [
+            datetime(2025, 1, 1, 10, 0, tzinfo=UTC),
+            datetime(2025, 1, 1, 10, 15, tzinfo=UTC),
+            datetime(2025, 1, 1, 10, 30, tzinfo=UTC),
+        ]
+
+    def test_matches_find_next_takings(
+        self, schedule_factory: Callable[..., Schedules], test_config: Settings
+    ) -> None:
+        schedules = [
+            schedule_factory(frequency=15),
+            schedule_factory(frequency=30),
+            schedule_factory(frequency=45, start_date=datetime(2025, 1, 1, 9, 0, tzinfo=UTC)),
+        ]
+
+        current_time = datetime(2025, 1, 1, 9, 50, tzinfo=UTC)
+        interval = timedelta(hours=5)
+        takings = list(iter_next_takings(schedules, interval, test_config, current_time))
+
+        assert takings == find_next_takings(schedules, interval, test_config, current_time)
+
+    def test_resume_from_cursor(
+        self, schedule_factory: Callable[..., Schedules], test_config: Settings
+    ) -> None:
+        # Same start and frequency, so every taking time is shared by both schedules
+        schedules = [
+            schedule_factory(frequency=30),
+            schedule_factory(frequency=30),
+            schedule_factory(frequency=60),
+        ]
+
+        current_time = datetime(2025, 1, 1, 10, 0, tzinfo=UTC)
+        interval = timedelta(hours=3)
+        expected = find_next_takings(schedules, interval, test_config, current_time)
+
+        pages: list[dict] = []
+        after = None
+        while True:
+            page = list(
+                islice(iter_next_takings(schedules, interval, test_config, current_time, after), 4)
+            )
+            if not page:
+                break
+            pages.extend(page)
+            after = TakingsCursor(page[-1]["next_taking_time"], page[-1]["schedule"].id)
+
+        assert [(t["schedule"].id, t["next_taking_time"]) for t in pages] == [
+            (t["schedule"].id, t["next_taking_time"]) for t in expected
+        ]
+
+
+MINUTE_MICROSECONDS = 60 * 1_000_000
+
+
+class TestTakingPattern:
+    def test_pattern_offsets(self, test_config: Settings) -> None:
+        pattern = get_taking_pattern(
+            15 * MINUTE_MICROSECONDS,
+            0,
+            time_to_microseconds(test_config.MORNING_TIME),
+            time_to_microseconds(test_config.EVENING_TIME),
+        )
+
+        assert pattern.period == 1440 * MINUTE_MICROSECONDS
+        assert len(pattern.offsets) == 57  # 8:00, 8:15, ..., 22:00
+        assert pattern.offsets[0] == 8 * 60 * MINUTE_MICROSECONDS
+        assert pattern.offsets[-1] == 22 * 60 * MINUTE_MICROSECONDS
+
+    def test_pattern_period_spans_several_days(self, test_config: Settings) -> None:
+        pattern = get_taking_pattern(
+            1000 * MINUTE_MICROSECONDS,
+            0,
+            time_to_microseconds(test_config.MORNING_TIME),
+            time_to_microseconds(test_config.EVENING_TIME),
+        )
+
+        # lcm(1000, 1440) minutes is 25 days with 36 takings, of which only the allowed remain
+        assert pattern.period == 36000 * MINUTE_MICROSECONDS
+        assert 0 < len(pattern.offsets) < 36
+
+    def test_iter_pattern_times_wraps_periods(self, test_config: Settings) -> None:
+        day = 1440 * MINUTE_MICROSECONDS
+        pattern = get_taking_pattern(
+            360 * MINUTE_MICROSECONDS,
+            0,
+            time_to_microseconds(test_config.MORNING_TIME),
+            time_to_microseconds(test_config.EVENING_TIME),
+        )
+
+        times = list(iter_pattern_times(pattern, day + 1, 3 * day))
+
+        # Every 6 hours from midnight: only 12:00 and 18:00 are in the allowed hours
+        assert [(t // day, t % day // (60 * MINUTE_MICROSECONDS)) for t in times] == [
+            (1, 12),
+            (1, 18),
+            (2, 12),
+            (2, 18),
+        ]
+
+    def test_patterns_are_cached(
+        self, schedule_factory: Callable[..., Schedules], test_config: Settings
+    ) -> None:
+        schedules = [schedule_factory(frequency=45) for _ in range(10)]
+        current_time = datetime(2025, 1, 1, 9, 0, tzinfo=UTC)
+
+        get_taking_pattern.cache_clear()
+        find_next_takings(schedules, timedelta(hours=3), test_config, current_time)
+
+        cache_info = get_taking_pattern.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 9
+
+
+def reference_find_next_takings(
+    schedules: list[Schedules],
+    next_taking_interval: timedelta,
+    config: Settings,
+    current_time: datetime,
+) -> list[dict[str, Any]]:
+    """Original step-by-frequency implementation, kept to check the arithmetic engine against"""
+    taking_end_time = current_time + next_taking_interval
+    evening_time_today = datetime.combine(taking_end_time.date(), config.EVENING_TIME, tzinfo=UTC)
+    taking_end_time = min(taking_end_time, evening_time_today)
+
+    next_takings = []
+    for schedule in schedules:
+        if schedule.end_date and schedule.end_date < current_time:
+            continue
+        if schedule.start_date > taking_end_time:
+            continue
+
+        if schedule.start_date >= current_time and schedule.start_date <= taking_end_time:
+            if config.MORNING_TIME <= schedule.start_date.time() <= config.EVENING_TIME:
+                next_takings.append({"schedule": schedule, "next_taking_time": schedule.start_date})
+            next_taking_time = schedule.start_date + timedelta(minutes=schedule.frequency)
+        else:
+            elapsed_time = (current_time - schedule.start_date).total_seconds() / 60
+            intervals_passed = int(elapsed_time / schedule.frequency)
+            last_taking_time = schedule.start_date + timedelta(
+                minutes=intervals_passed * schedule.frequency
+            )
+            if last_taking_time >= current_time:
+                last_taking_time -= timedelta(minutes=schedule.frequency)
+            next_taking_time = last_taking_time + timedelta(minutes=schedule.frequency)
+
+        while next_taking_time <= taking_end_time:
+            if schedule.end_date and next_taking_time > schedule.end_date:
+                break
+            next_taking_time_of_day = next_taking_time.time()
+            if config.EVENING_TIME > config.MORNING_TIME:
+                if not (config.MORNING_TIME <= next_taking_time_of_day <= config.EVENING_TIME):
+                    next_taking_time += timedelta(minutes=schedule.frequency)
+                    continue
+            elif not (
+                next_taking_time_of_day > config.MORNING_TIME
+                or next_taking_time_of_day < config.EVENING_TIME
+            ):
+                next_taking_time += timedelta(minutes=schedule.frequency)
+                continue
+            next_takings.append({"schedule": schedule, "next_taking_time": next_taking_time})
+            next_taking_time += timedelta(minutes=schedule.frequency)
+
+    return sorted(next_takings, key=lambda x: x["next_taking_time"])
+
+
+def make_config(morning: time, evening: time) -> Settings:
+    return Settings(
+        MORNING_TIME=morning,
+        EVENING_TIME=evening,
+        DB_USER="",
+        DB_PASS="",
+        DB_HOST="",
+        DB_PORT="",
+        DB_NAME="",
+    )
+
+
+def random_schedules(rng: random.Random, base_time: datetime, count: int) -> list[Schedules]:
+    schedules = []
+    for _ in range(count):
+        tz = rng.choice(
+            [
+                UTC,
+                UTC,
+                timezone(timedelta(hours=3)),
+                timezone(timedelta(hours=-5)),
+                ZoneInfo("America/New_York"),
+                ZoneInfo("Europe/Berlin"),
+            ]
+        )
+        start_date = (base_time + timedelta(minutes=rng.randint(-3 * 1440, 3 * 1440))).astimezone(
+            tz
+        )
+        if rng.random() < 0.2:
+            start_date = start_date.replace(second=rng.randint(0, 59))
+        end_date = None
+        if rng.random() < 0.6:
+            end_date = start_date + timedelta(minutes=rng.randint(-60, 10 * 1440))
+        schedules.append(
+            Schedules(
+                id=uuid4(),
+                user_id=uuid4(),
+                medicine_name="Equivalence Test Medicine",
+                frequency=rng.choice([7, 15, 30, 45, 50, 60, 90, 240, 600, 1440, 2000, 2880]),
+                start_date=start_date,
+                end_date=end_date,
+            )
+        )
+    return schedules
+
+
+def taking_key(taking: dict[str, Any]) -> tuple[str, datetime]:
+    return str(taking["schedule"].id), taking["next_taking_time"].replace(tzinfo=None)
+
+
+def assert_same_takings(actual: list[dict[str, Any]], expected: list[dict[str, Any]]) -> None:
+    assert [(t["schedule"].id, t["next_taking_time"]) for t in actual] == [
+        (t["schedule"].id, t["next_taking_time"]) for t in expected
+    ]
+
+
+class TestFindNextTakingsEquivalence:
+    @pytest.mark.parametrize(
+        ("morning", "evening"),
+        [
+            (time(8, 0), time(22, 0)),
+            (time(0, 0), time(23, 59, 59)),
+            (time(9, 30), time(9, 45)),
+            (time(22, 0), time(6, 0)),
+            (time(12, 0), time(12, 0)),
+        ],
+    )
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_schedules_match_reference(
+        self, morning: time, evening: time, seed: int
+    ) -> None:
+        rng = random.Random(seed)
+        config = make_config(morning, evening)
+        base_time = datetime(2025, 1, 1, tzinfo=UTC) + timedelta(minutes=rng.randint(0, 1440))
+        schedules = random_schedules(rng, base_time, 30)
+
+        for _ in range(10):
+            current_time = base_time + timedelta(seconds=rng.randint(-86400, 5 * 86400))
+            interval = timedelta(minutes=rng.choice([15, 60, 120, 600, 1440, 7 * 1440]))
+            assert_same_takings(
+                find_next_takings(schedules, interval, config, current_time),
+                reference_find_next_takings(schedules, interval, config, current_time),
+            )
+
+    @pytest.mark.parametrize(
+        ("morning", "evening"), [(time(8, 0), time(22, 0)), (time(0, 0), time(23, 59, 59))]
+    )
+    @pytest.mark.parametrize("seed", range(5))
+    # Daylight saving time changes of New York and Berlin
+    @pytest.mark.parametrize(
+        "base_date", [date(2025, 3, 9), date(2025, 3, 30), date(2025, 10, 26), date(2025, 11, 2)]
+    )
+    def test_random_schedules_across_dst_match_reference(
+        self, morning: time, evening: time, seed: int, base_date: date
+    ) -> None:
+        rng = random.Random(seed)
+        config = make_config(morning, evening)
+        base_time = datetime.combine(base_date, time(), tzinfo=UTC) + timedelta(
+            minutes=rng.randint(0, 1440)
+        )
+        schedules = random_schedules(rng, base_time, 30)
+
+        for _ in range(10):
+            current_time = base_time + timedelta(seconds=rng.randint(-86400, 5 * 86400))
+            interval = timedelta(minutes=rng.choice([15, 60, 120, 600, 1440, 7 * 1440]))
+            # Datetimes of one zone compare by wall time and of different zones by instant,
+            # so takings in the skipped or repeated hour have no consistent order
+            assert_same_takings(
+                sorted(
+                    find_next_takings(schedules, interval, config, current_time), key=taking_key
+                ),
+                sorted(
+                    reference_find_next_takings(schedules, interval, config, current_time),
+                    key=taking_key,
+                ),
+            )
+
+    @pytest.mark.parametrize("frequency", [15, 60, 1440])
+    def test_long_interval_matches_reference(self, test_config: Settings, frequency: int) -> None:
+        schedule = Schedules(
+            id=uuid4(),
+            user_id=uuid4(),
+            medicine_name="Test Long Interval",
+            frequency=frequency,
+            start_date=datetime(2025, 1, 1, 6, 45, tzinfo=UTC),
+            end_date=None,
+        )
+        current_time = datetime(2025, 1, 3, 23, 10, tzinfo=UTC)
+        interval = timedelta(days=30)
+
+        takings = find_next_takings([schedule], interval, test_config, current_time)
+
+        assert_same_takings(
+            takings, reference_find_next_takings([schedule], interval, test_config, current_time)
+        )
+        assert all(
+            test_config.MORNING_TIME <= t["next_taking_time"].time() <= test_config.EVENING_TIME
+            for t in takings
+        )
@@ -0,0 +1,114 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.schedule.schemas import SScheduleCreateRequest, SUserCreate
+from src.api.v1.schedule.service import ScheduleService
+from src.database.connection import AsyncSessionMaker
+from src.repositories import (
+    ScheduleRepository,
+    UnitOfWork,
+    UpcomingTakingsRepository,
+    UserRepository,
+)
+
+MEDICINE_POLICY = 64971
+
+
+@contextmanager
+def count_commits(session: AsyncSession) -> Iterator[list[None]]:
+    commits: list[None] = []
+
+    def on_commit(_session: object) -> None:
+        commits.append(None)
+
+    event.listen(session.sync_session, "after_commit", on_commit)
+    try:
+        yield commits
+    finally:
+        event.remove(session.sync_session, "after_commit", on_commit)
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_nested_units_commit_once() -> None:
+    async with AsyncSessionMaker() as session:
+        user_repo = UserRepository(session)
+        with count_commits(session) as commits:
+            async with UnitOfWork(session) as unit_of_work:
+                user = await user_repo.create(
+                    SUserCreate(name="Unit Of Work User", medicine_policy=MEDICINE_POLICY)
+                )
+                assert user.id is None
+                await unit_of_work.flush()
+                assert user.id is not None
+
+                async with user_repo.unit_of_work():
+                    await user_repo.update(user.id, {"name": "Renamed Unit Of Work User"})
+                assert not commits
+            assert len(commits) == 1
+
+    async with AsyncSessionMaker() as session:
+        user = await UserRepository(session).get_by_medical_policy(MEDICINE_POLICY)
+        assert user.name == "Renamed Unit Of Work User"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_rollback_on_error() -> None:
+    async with AsyncSessionMaker() as session:
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork(session):
+                await UserRepository(session).get_or_create_id(
+                    SUserCreate(name="Rolled Back User", medicine_policy=MEDICINE_POLICY + 1)
+                )
+                raise RuntimeError
+
+    async with AsyncSessionMaker() as session:
+        assert await UserRepository(session).get_by_medical_policy(MEDICINE_POLICY + 1) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_update_and_delete_commit_outside_unit() -> None:
+    async with AsyncSessionMaker() as session:
+        user_repo = UserRepository(session)
+        user = await user_repo.create(
+            SUserCreate(name="Committed User", medicine_policy=MEDICINE_POLICY + 2)
+        )
+        await user_repo.update(user.id, {"name": "Committed Renamed User"})
+
+    async with AsyncSessionMaker() as session:
+        user_repo = UserRepository(session)
+        user = await user_repo.get_by_medical_policy(MEDICINE_POLICY + 2)
+        assert user.name == "Committed Renamed User"
+        assert await user_repo.delete(user.id)
+
+    async with AsyncSessionMaker() as session:
+        assert await UserRepository(session).get_by_medical_policy(MEDICINE_POLICY + 2) is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_create_schedule_commits_once() -> None:
+    async with AsyncSessionMaker() as session:
+        service = ScheduleService(
+            user_repo=UserRepository(session),
+            schedule_repo=ScheduleRepository(session),
+            upcoming_takings_repo=UpcomingTakingsRepository(session),
+        )
+        with count_commits(session) as commits:
+            schedule_id = await service.create_schedule(
+                SScheduleCreateRequest(
+                    name="Single Commit User",
+                    medicine_policy=MEDICINE_POLICY + 3,
+                    medicine_name="Single Commit Medicine",
+                    frequency=60,
+                    duration=timedelta(days=1),
+                )
+            )
+        assert len(commits) == 1
+
+    async with AsyncSessionMaker() as session:
+        schedule = await ScheduleRepository(session).get_by_id(schedule_id)
+        assert schedule.takings_materialized_until is not None
@@ -0,0 +1,93 @@
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+
+from src.api.v1.schedule.schemas import SScheduleCreateRequest
+from src.api.v1.schedule.service import ScheduleService
+from src.api.v1.schedule.utils import find_schedule_takings
+from src.core.config import settings
+from src.database.connection import AsyncSessionMaker
+from src.database.models import Schedules
+from src.repositories import ScheduleRepository, UpcomingTakingsRepository, UserRepository
+
+MEDICINE_POLICY = 54321
+
+
+@pytest_asyncio.fixture
+async def service_and_repo() -> (
+    AsyncGenerator[tuple[ScheduleService, UpcomingTakingsRepository], None]
+):
+    async with AsyncSessionMaker() as session:
+        upcoming_takings_repo = UpcomingTakingsRepository(session)
+        service = ScheduleService(
+            user_repo=UserRepository(session),
+            schedule_repo=ScheduleRepository(session),
+            upcoming_takings_repo=upcoming_takings_repo,
+        )
+        yield service, upcoming_takings_repo
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestUpcomingTakings:
+    async def test_materialized_takings(
+        self, service_and_repo: tuple[ScheduleService, UpcomingTakingsRepository]
+    ) -> None:
+        service, repo = service_and_repo
+        for frequency in (15, 60):
+            await service.create_schedule(
+                SScheduleCreateRequest(
+                    name="Upcoming Takings User",
+                    medicine_policy=MEDICINE_POLICY,
+                    medicine_name=f"Upcoming Takings Medicine {frequency}",
+                    frequency=frequency,
+                    duration=timedelta(days=3),
+                )
+            )
+        now = datetime.now(UTC)
+        end = now + timedelta(days=1)
+        schedules = await service.get_active_schedules_by_policy(MEDICINE_POLICY, now, end)
+        expected = sorted(
+            (taking_time, schedule.id)
+            for schedule in schedules
+            for taking_time in find_schedule_takings(schedule, now, end, settings)
+        )
+
+        is_complete, takings = await repo.get_by_medicine_policy(MEDICINE_POLICY, now, end)
+        assert is_complete
+        assert [(taking_time, schedule.id) for taking_time, schedule in takings] == expected
+
+        # Beyond the horizon the takings are not materialized yet
+        is_complete, _ = await repo.get_by_medicine_policy(
+            MEDICINE_POLICY, now, now + settings.UPCOMING_TAKINGS_HORIZON * 2
+        )
+        assert not is_complete
+
+        assert await repo.get_by_medicine_policy(MEDICINE_POLICY + 1, now, end) is None
+
+    async def test_refresh_restores_takings(
+        self, service_and_repo: tuple[ScheduleService, UpcomingTakingsRepository]
+    ) -> None:
+        service, repo = service_and_repo
+        schedule_ids = await service.get_schedules_ids_by_policy(MEDICINE_POLICY)
+        now = datetime.now(UTC)
+        end = now + timedelta(days=1)
+        _, before = await repo.get_by_medicine_policy(MEDICINE_POLICY, now, end)
+
+        await repo._session.execute(
+            update(Schedules)
+            .where(Schedules.id.in_(schedule_ids))
+            .values(takings_materialized_until=None)
+        )
+        await repo.delete_before(now + settings.UPCOMING_TAKINGS_HORIZON * 2)
+        is_complete, _ = await repo.get_by_medicine_policy(MEDICINE_POLICY, now, end)
+        assert not is_complete
+
+        assert await service.refresh_upcoming_takings() >= len(schedule_ids)
+
+        is_complete, after = await repo.get_by_medicine_policy(MEDICINE_POLICY, now, end)
+        assert is_complete
+        assert [(t, s.id) for t, s in after] == [(t, s.id) for t, s in before]
+        assert all(isinstance(s, Schedules) for _, s in after)